@@ -9,18 +9,34 @@ from app.API.Src.Chat.controller.get_chat import GetChatController
 from app.API.Src.Chat.controller.delete_chat import DeleteChatController
 from app.API.Src.Chat.request.chat_request import ChatRequest
 from app.API.Src.core.ExternalApiHelper.model.ai_response import AiResponse
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, get_client_registry
 from app.API.Src.Chat.response.chat_list_response import ChatListResponse
 from app.API.Src.Chat.response.chat_response import ChatResponse
 
 router = APIRouter()
 
 @router.post("/chat", response_model=AiResponse, tags=["Chat"])
-async def chat(chat_request: ChatRequest, db: AsyncSession = Depends(get_db_session)):
-    return await CreateChatController.chat(chat_request, db)
+async def chat(chat_request: ChatRequest, db: AsyncSession = Depends(get_db_session), clients: ClientRegistry = Depends(get_client_registry)):
+    return await CreateChatController.chat(chat_request, db, clients)
+
+@router.post("/chat/stream", tags=["Chat"])
+async def chat_stream(chat_request: ChatRequest, db: AsyncSession = Depends(get_db_session), clients: ClientRegistry = Depends(get_client_registry)):
+    """
+    Same as /chat, but streams the answer as Server-Sent Events while it is generated.
+    """
+    return await CreateChatController.chat_stream(chat_request, db, clients)
+
+@router.get("/chat/response-cache", response_model=dict, tags=["Chat"])
+async def response_cache_stats(clients: ClientRegistry = Depends(get_client_registry)):
+    """
+    Hit/miss counters of the answer cache.
+    """
+    cache = clients.get_response_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
 
 @router.get("/chats", response_model=ChatListResponse, tags=["Chat"])
-async def get_chats(limit: int = Query(default=100, le=1000), offset: int = Query(default=0, ge=0), user_id: Optional[UUID] = Query(default=None, description="Filter chats by user ID"), db: AsyncSession = Depends(get_db_session)):
-    return await GetChatListController.get_chats(limit, offset, user_id, db)
+async def get_chats(limit: int = Query(default=100, le=1000), offset: int = Query(default=0, ge=0), user_id: Optional[UUID] = Query(default=None, description="Filter chats by user ID"), message_limit: Optional[int] = Query(default=None, ge=0, description="Only include the last N messages of each chat"), with_message_count: bool = Query(default=False, description="Include the number of messages of each chat"), cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"), total: str = Query(default="exact", pattern="^(exact|estimated|none)$", description="How to compute the total count"), db: AsyncSession = Depends(get_db_session)):
+    return await GetChatListController.get_chats(limit, offset, user_id, db, message_limit, with_message_count, cursor, total)
 
 @router.get("/chats/{chat_id}", response_model=ChatResponse, tags=["Chat"])
 async def get_chat(chat_id: UUID, db: AsyncSession = Depends(get_db_session)):
@@ -1,13 +1,17 @@
 from fastapi import HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.API.Src.core.database.Postgres.database import get_db_session
 from app.API.Src.core.ExternalApiHelper.model.ai_response import AiResponse
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, get_client_registry
 from app.API.Src.Chat.repository.chat_repository import ChatRepository
 from app.API.Src.Chat.repository.message_repository import MessageRepository
 from app.API.Src.Chat.request.chat_request import ChatRequest
 from app.API.Src.Tools.Technical_anwer.technical_answer_provider import TechnicalAnswerProvider
-from typing import List
+from typing import List, Any, AsyncIterator, Dict
+import json
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,21 +21,22 @@ class CreateChatController:
     @staticmethod
     async def chat(
         chat_request: ChatRequest,
-        db: AsyncSession = Depends(get_db_session)
+        db: AsyncSession = Depends(get_db_session),
+        clients: ClientRegistry = Depends(get_client_registry)
     ) -> AiResponse:
         try:
             chat_repository = ChatRepository(db)
             message_repository = MessageRepository(db)
             
             # Initialize technical answer provider
-            answer_provider = TechnicalAnswerProvider(db)
+            answer_provider = TechnicalAnswerProvider(db, clients)
             
             # Handle existing conversation or create new one
             chat_history = None
             
             if chat_request.chat_id:
-                # Load existing conversation
-                chat_history = await chat_repository.get_chat_with_messages(chat_request.chat_id)
+                # Only check the conversation exists; its history is loaded by the answer provider
+                chat_history = await chat_repository.get_conversation_by_id(chat_request.chat_id)
                 if not chat_history:
                     raise HTTPException(status_code=404, detail="Chat not found")
             else:
@@ -45,7 +50,8 @@ class CreateChatController:
                 chat_id=chat_request.chat_id,
                 ai_model=chat_request.model,
                 rag_count=5,
-                conversation_limit=10
+                conversation_limit=10,
+                filters=chat_request.filters
             )
             
             # Save user message
@@ -71,4 +77,104 @@ class CreateChatController:
             
         except Exception as e:
             logger.error(f"Error in chat endpoint: {str(e)}")
-            raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @staticmethod
+    async def chat_stream(
+        chat_request: ChatRequest,
+        db: AsyncSession = Depends(get_db_session),
+        clients: ClientRegistry = Depends(get_client_registry)
+    ) -> StreamingResponse:
+        """
+        Stream the answer as Server-Sent Events.
+        
+        Events, in order: "start" (chat_id), "context" (rag_info, context_tokens
+        and stage timings), one "token" per text chunk, then "done"
+        (finishReason and metadata) or "error".
+        Both messages are saved once the answer is complete.
+        """
+        try:
+            chat_repository = ChatRepository(db)
+            
+            if chat_request.chat_id:
+                chat_history = await chat_repository.get_conversation_by_id(chat_request.chat_id)
+                if not chat_history:
+                    raise HTTPException(status_code=404, detail="Chat not found")
+            else:
+                chat_history = await chat_repository.create_chat(chat_request.user_id)
+                logger.info(f"Created new conversation {chat_history.id}")
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error in chat stream endpoint: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+        
+        return StreamingResponse(
+            CreateChatController._stream_events(chat_request, chat_history.id, db, clients),
+            media_type="text/event-stream",
+            # Disable proxy buffering so each event reaches the client immediately
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    @staticmethod
+    async def _stream_events(
+        chat_request: ChatRequest,
+        chat_id: UUID,
+        db: AsyncSession,
+        clients: ClientRegistry
+    ) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        yield CreateChatController._sse("start", {"chat_id": str(chat_id)})
+        
+        try:
+            answer_provider = TechnicalAnswerProvider(db, clients)
+            metadata, chunks = await answer_provider.stream_answer_with_chat_context(
+                user_prompt=chat_request.prompt,
+                chat_id=chat_request.chat_id,
+                ai_model=chat_request.model,
+                rag_count=5,
+                conversation_limit=10,
+                filters=chat_request.filters
+            )
+            yield CreateChatController._sse("context", metadata)
+            
+            timings = metadata["timings_ms"]
+            completion_start = time.perf_counter()
+            answer_parts: List[str] = []
+            async for chunk in chunks:
+                if not answer_parts:
+                    timings["first_token"] = round((time.perf_counter() - completion_start) * 1000, 1)
+                answer_parts.append(chunk)
+                yield CreateChatController._sse("token", {"text": chunk})
+            timings["completion"] = round((time.perf_counter() - completion_start) * 1000, 1)
+            timings["total"] = round((time.perf_counter() - start) * 1000, 1)
+            logger.info(f"Chat stream timings (ms): {timings}")
+            
+            message_repository = MessageRepository(db)
+            await message_repository.save_message(
+                chat_id=chat_id,
+                user_id=chat_request.user_id,
+                message=chat_request.prompt,
+                author="user"
+            )
+            await message_repository.save_message(
+                chat_id=chat_id,
+                user_id=chat_request.user_id,
+                message="".join(answer_parts),
+                author="agent"
+            )
+            
+            yield CreateChatController._sse("done", {
+                "finishReason": "stop",
+                "metadata": {"chat_id": str(chat_id), **metadata}
+            })
+            
+        except Exception as e:
+            # Headers are already sent, so the failure is reported in-band
+            logger.error(f"Error in chat stream endpoint: {str(e)}")
+            yield CreateChatController._sse("error", {"detail": str(e)})
+    
+    @staticmethod
+    def _sse(event: str, data: Dict[str, Any]) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
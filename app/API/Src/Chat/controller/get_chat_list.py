@@ -16,48 +16,53 @@ class GetChatListController:
         limit: int = Query(default=100, le=1000),
         offset: int = Query(default=0, ge=0),
         user_id: Optional[UUID] = Query(default=None, description="Filter chats by user ID"),
-        db: AsyncSession = Depends(get_db_session)
+        db: AsyncSession = Depends(get_db_session),
+        message_limit: Optional[int] = Query(default=None, ge=0, description="Only include the last N messages of each chat"),
+        with_message_count: bool = Query(default=False, description="Include the number of messages of each chat"),
+        cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+        total: str = Query(default="exact", pattern="^(exact|estimated|none)$", description="How to compute the total count")
     ) -> ChatListResponse:
         try:
             repository = ChatRepository(db)
-            if user_id:
-                chats, total = await repository.get_conversations_by_user_paginated(user_id=user_id, limit=limit, offset=offset)
-            else:
-                chats, total = await repository.get_conversations_paginated(limit=limit, offset=offset)
+            chats, total_count, next_cursor = await repository.get_chats_with_messages_paginated(
+                limit=limit,
+                offset=offset,
+                user_id=user_id,
+                message_limit=message_limit,
+                with_message_count=with_message_count,
+                cursor=cursor,
+                total_mode=total
+            )
             
-            chat_responses = []
-            for chat in chats:
-                # Get messages for each chat
-                chat_with_messages = await repository.get_chat_with_messages(chat.id)
-                
-                messages = []
-                if chat_with_messages and chat_with_messages.messages:
-                    messages = [
+            chat_responses = [
+                ChatResponse(
+                    id=str(chat.id),
+                    user_id=str(chat.user_id),
+                    created_at=chat.created_at,
+                    updated_at=chat.updated_at,
+                    messages=[
                         MessageResponse(
                             id=str(msg.id),
                             message=msg.message,
                             author=msg.author,
                             created_at=msg.created_at
                         )
-                        for msg in chat_with_messages.messages
-                    ]
-                
-                chat_responses.append(
-                    ChatResponse(
-                        id=str(chat.id),
-                        user_id=str(chat.user_id),
-                        created_at=chat.created_at,
-                        updated_at=chat.updated_at,
-                        messages=messages
-                    )
+                        for msg in chat.messages
+                    ],
+                    message_count=chat.message_count
                 )
+                for chat in chats
+            ]
             
             return ChatListResponse(
                 chats=chat_responses,
-                total=total,
-                limit=limit
+                total=total_count,
+                limit=limit,
+                next_cursor=next_cursor
             )
             
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logger.error(f"Error in get_chats endpoint: {str(e)}")
-            raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,5 @@
+-- Migration to add the keyset pagination indexes to chat_history table
+-- Run this script to update your existing database schema
+
+CREATE INDEX IF NOT EXISTS ix_chat_history_created_at_id ON chat_history (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_chat_history_user_id_created_at_id ON chat_history (user_id, created_at, id);
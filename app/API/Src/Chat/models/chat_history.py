@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -13,8 +13,17 @@ class ChatHistory(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # Keyset pagination order
+    __table_args__ = (
+        Index("ix_chat_history_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_chat_history_created_at_id", "created_at", "id"),
+    )
+    
     # Relationship to messages
     messages = relationship("Message", back_populates="chat_history", cascade="all, delete-orphan", order_by="Message.created_at")
     
+    # Number of messages set by paginated list queries (not persisted)
+    message_count = None
+    
     def __repr__(self):
         return f"<ChatHistory(id={self.id}, user_id={self.user_id}, created_at={self.created_at})>"
\ No newline at end of file
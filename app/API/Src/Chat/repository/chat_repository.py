@@ -1,9 +1,12 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, raiseload, aliased
+from sqlalchemy.orm.attributes import set_committed_value
 from app.API.Src.Chat.models.chat_history import ChatHistory
+from app.API.Src.Chat.models.message import Message
+from app.API.Src.core.database.Postgres.pagination import paginate, next_page, count_total
 import logging
 
 logger = logging.getLogger(__name__)
@@ -86,6 +89,88 @@ class ChatRepository:
         )
         return result.scalars().all(), total
     
+    async def get_chats_with_messages_paginated(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        user_id: Optional[UUID] = None,
+        message_limit: Optional[int] = None,
+        with_message_count: bool = False,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> Tuple[List[ChatHistory], Optional[int], Optional[str]]:
+        """
+        Get a page of chats with messages loaded, using a constant number of queries.
+        
+        Args:
+            limit: Page size
+            offset: Legacy offset, ignored when a cursor is given
+            user_id: Only return chats of this user (optional)
+            message_limit: Load only the last N messages of each chat; None loads all, 0 loads none
+            with_message_count: Set `message_count` on every chat
+            cursor: next_cursor of the previous page
+            total_mode: "exact", "estimated" or "none"
+            
+        Returns:
+            Tuple of (chats, total or None, cursor of the next page or None)
+        """
+        filters = [ChatHistory.user_id == user_id] if user_id else []
+        total = await count_total(self.session, ChatHistory, filters, total_mode=total_mode)
+        page_query = paginate(select(ChatHistory).where(*filters), ChatHistory, limit, cursor=cursor, offset=offset)
+        
+        if message_limit is None:
+            # One extra SELECT ... WHERE chat_id IN (...) for the whole page
+            page_query = page_query.options(selectinload(ChatHistory.messages))
+        else:
+            # Set below from one windowed query; never lazy loaded per chat
+            page_query = page_query.options(raiseload(ChatHistory.messages))
+        
+        result = await self.session.execute(page_query)
+        chats, next_cursor = next_page(result.scalars().all(), limit)
+        chat_ids = [chat.id for chat in chats]
+        
+        if chats and message_limit is not None:
+            recent_messages = await self._get_last_messages(chat_ids, message_limit) if message_limit else {}
+            for chat in chats:
+                set_committed_value(chat, "messages", recent_messages.get(chat.id, []))
+        
+        if chats and with_message_count:
+            counts = await self._count_messages(chat_ids)
+            for chat in chats:
+                chat.message_count = counts.get(chat.id, 0)
+        
+        return chats, total, next_cursor
+    
+    async def _get_last_messages(self, chat_ids: List[UUID], message_limit: int) -> Dict[UUID, List[Message]]:
+        """Load the last N messages of every chat with one windowed query."""
+        ranked = select(
+            Message,
+            func.row_number().over(
+                partition_by=Message.chat_id,
+                order_by=Message.created_at.desc()
+            ).label("position")
+        ).where(Message.chat_id.in_(chat_ids)).subquery()
+        recent = aliased(Message, ranked)
+        
+        result = await self.session.execute(
+            select(recent)
+            .where(ranked.c.position <= message_limit)
+            .order_by(ranked.c.chat_id, ranked.c.created_at)
+        )
+        messages: Dict[UUID, List[Message]] = {}
+        for message in result.scalars().all():
+            messages.setdefault(message.chat_id, []).append(message)
+        return messages
+    
+    async def _count_messages(self, chat_ids: List[UUID]) -> Dict[UUID, int]:
+        """Count messages of every chat with one grouped query."""
+        result = await self.session.execute(
+            select(Message.chat_id, func.count(Message.id))
+            .where(Message.chat_id.in_(chat_ids))
+            .group_by(Message.chat_id)
+        )
+        return {chat_id: count for chat_id, count in result.all()}
+    
     async def get_by_id(self, chat_id: UUID) -> Optional[ChatHistory]:
         """Get chat by ID"""
         result = await self.session.execute(
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from typing import Optional
+from app.API.Src.RAG.model.search_filters import SearchFilters
 
 
 class ChatRequest(BaseModel):
@@ -8,4 +9,5 @@ class ChatRequest(BaseModel):
     prompt: str
     model: str
     chat_id: Optional[UUID] = None
-    system_prompt: Optional[str] = None
\ No newline at end of file
+    system_prompt: Optional[str] = None
+    filters: Optional[SearchFilters] = None  # Scope of the document retrieval
\ No newline at end of file
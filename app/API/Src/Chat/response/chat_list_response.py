@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import List
+from typing import List, Optional
 from .chat_response import ChatResponse
 
 
@@ -7,5 +7,6 @@ class ChatListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
     chats: List[ChatResponse]
-    total: int
-    limit: int
\ No newline at end of file
+    total: Optional[int] = None
+    limit: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -20,6 +20,7 @@ class ChatResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
     messages: List[MessageResponse] = []
+    message_count: Optional[int] = None
     
     # For backward compatibility - get last user message and last agent response
     @property
@@ -96,7 +96,7 @@ async def get_documents(
 ):
     try:
         repository = DocumentRepository(db)
-        documents, total = await repository.get_documents_paginated(limit=limit, offset=offset)
+        documents, total, next_cursor = await repository.get_documents_paginated(limit=limit, offset=offset)
         
         document_responses = [
             DocumentResponse.from_document(doc)
@@ -106,7 +106,8 @@ async def get_documents(
         return DocumentListResponse(
             documents=document_responses,
             total=total,
-            limit=limit
+            limit=limit,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
@@ -0,0 +1,133 @@
+from fastapi import HTTPException, Depends, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from pathlib import Path
+import aiofiles
+import asyncio
+import os
+import tarfile
+import uuid
+import zipfile
+from typing import Optional
+from uuid import UUID
+from app.API.Src.core.database.Postgres.database import get_db_session
+from app.API.Src.Document.ingestion.bulk_import import bulk_imports, collect_files, extract_archive, import_directory, is_archive
+from app.API.Src.Document.repository.ingestion_job_repository import IngestionJobRepository
+from app.API.Src.Document.response.bulk_import_response import BulkImportResponse
+from app.API.Src.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class BulkImportController:
+    @staticmethod
+    async def start_import(
+        file: Optional[UploadFile] = None,
+        directory: Optional[str] = None,
+        db: AsyncSession = Depends(get_db_session),
+        user_id: Optional[UUID] = None
+    ) -> BulkImportResponse:
+        """
+        Queue the .md files of an uploaded archive or of a server directory and import them in the background.
+        
+        An archive (.zip, .tar, .tar.gz) is extracted to Corpus/imports/<id>.
+        A directory must be inside settings.BULK_IMPORT_ROOT; its files are
+        read in place. Progress is reported by GET /documents/imports/{id}.
+        """
+        try:
+            if (file is None) == (directory is None):
+                raise HTTPException(status_code=400, detail="Give either an archive file or a directory")
+            
+            import_id = uuid.uuid4()
+            if file is not None:
+                if not is_archive(Path(file.filename)):
+                    raise HTTPException(status_code=400, detail="Only .zip, .tar, .tar.gz and .tgz archives are allowed")
+                source_directory = await BulkImportController._extract_upload(file, import_id)
+            else:
+                source_directory = BulkImportController._resolve_directory(directory)
+            
+            files = await asyncio.to_thread(collect_files, source_directory)
+            if not files:
+                raise HTTPException(status_code=400, detail="No .md files found")
+            
+            repository = IngestionJobRepository(db)
+            await repository.enqueue_import(import_id, files, user_id)
+            bulk_imports.start(import_id)
+            
+            return BulkImportResponse.from_summary(import_id, await repository.import_summary(import_id), running=True)
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error starting bulk import: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @staticmethod
+    async def get_import(
+        import_id: UUID,
+        db: AsyncSession = Depends(get_db_session)
+    ) -> BulkImportResponse:
+        try:
+            summary = await IngestionJobRepository(db).import_summary(import_id)
+            if not summary["files_total"]:
+                raise HTTPException(status_code=404, detail="Bulk import not found")
+            
+            return BulkImportResponse.from_summary(import_id, summary, bulk_imports.is_running(import_id))
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error in get_import endpoint: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @staticmethod
+    async def resume_import(
+        import_id: UUID,
+        db: AsyncSession = Depends(get_db_session)
+    ) -> BulkImportResponse:
+        """Run an import again for its files that are not done (interrupted or failed)."""
+        try:
+            summary = await IngestionJobRepository(db).import_summary(import_id)
+            if not summary["files_total"]:
+                raise HTTPException(status_code=404, detail="Bulk import not found")
+            if bulk_imports.is_running(import_id):
+                raise HTTPException(status_code=409, detail="Bulk import is already running")
+            
+            bulk_imports.start(import_id)
+            return BulkImportResponse.from_summary(import_id, summary, running=True)
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error in resume_import endpoint: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @staticmethod
+    def _resolve_directory(directory: str) -> Path:
+        root = Path(settings.BULK_IMPORT_ROOT).resolve()
+        path = (root / directory).resolve()
+        if path != root and root not in path.parents:
+            raise HTTPException(status_code=400, detail="Directory must be inside the bulk import root")
+        if not path.is_dir():
+            raise HTTPException(status_code=404, detail="Directory not found")
+        return path
+    
+    @staticmethod
+    async def _extract_upload(file: UploadFile, import_id: UUID) -> Path:
+        """Spool the archive next to its import directory, extract it there and remove it."""
+        directory = import_directory(import_id)
+        directory.mkdir(parents=True)
+        archive_path = directory.with_name(f"{import_id}_{Path(file.filename).name}")
+        try:
+            async with aiofiles.open(archive_path, 'wb') as f:
+                while True:
+                    block = await file.read(settings.UPLOAD_READ_SIZE)
+                    if not block:
+                        break
+                    await f.write(block)
+            await asyncio.to_thread(extract_archive, archive_path, directory)
+        except (zipfile.BadZipFile, tarfile.TarError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Could not extract the archive: {str(e)}")
+        finally:
+            if archive_path.exists():
+                os.remove(archive_path)
+        return directory
\ No newline at end of file
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.API.Src.core.database.Postgres.database import get_db_session
 from app.API.Src.Document.repository.document_repository import DocumentRepository
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, get_client_registry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,10 +12,11 @@ class DeleteDocumentController:
     @staticmethod
     async def delete_document(
         document_id: UUID,
-        db: AsyncSession = Depends(get_db_session)
+        db: AsyncSession = Depends(get_db_session),
+        clients: ClientRegistry = Depends(get_client_registry)
     ) -> dict:
         try:
-            repository = DocumentRepository(db)
+            repository = DocumentRepository(db, qdrant_repo=clients.get_qdrant_repository())
             success = await repository.delete_document(document_id)
             
             if not success:
@@ -1,5 +1,6 @@
 from fastapi import HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.API.Src.core.database.Postgres.database import get_db_session
 from app.API.Src.Document.repository.document_repository import DocumentRepository
 from app.API.Src.Document.response.document_response import DocumentResponse
@@ -13,11 +14,18 @@ class GetDocumentListController:
     async def get_documents(
         limit: int = Query(default=100, le=1000),
         offset: int = Query(default=0, ge=0),
-        db: AsyncSession = Depends(get_db_session)
+        db: AsyncSession = Depends(get_db_session),
+        cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+        total: str = Query(default="exact", pattern="^(exact|estimated|none)$", description="How to compute the total count")
     ) -> DocumentListResponse:
         try:
             repository = DocumentRepository(db)
-            documents, total = await repository.get_documents_paginated(limit=limit, offset=offset)
+            documents, total_count, next_cursor = await repository.get_documents_paginated(
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                total_mode=total
+            )
             
             document_responses = [
                 DocumentResponse.from_document(doc)
@@ -26,10 +34,13 @@ class GetDocumentListController:
             
             return DocumentListResponse(
                 documents=document_responses,
-                total=total,
-                limit=limit
+                total=total_count,
+                limit=limit,
+                next_cursor=next_cursor
             )
             
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logger.error(f"Error in get_documents endpoint: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,30 @@
+from fastapi import HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from app.API.Src.core.database.Postgres.database import get_db_session
+from app.API.Src.Document.repository.ingestion_job_repository import IngestionJobRepository
+from app.API.Src.Document.response.ingestion_job_response import IngestionJobResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+class GetIngestionJobController:
+    @staticmethod
+    async def get_ingestion_job(
+        job_id: UUID,
+        db: AsyncSession = Depends(get_db_session)
+    ) -> IngestionJobResponse:
+        try:
+            repository = IngestionJobRepository(db)
+            job = await repository.get_job(job_id)
+            
+            if not job:
+                raise HTTPException(status_code=404, detail="Ingestion job not found")
+            
+            return IngestionJobResponse.from_job(job)
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error in get_ingestion_job endpoint: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -2,14 +2,16 @@ from fastapi import HTTPException, Depends, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
 import aiofiles
+import codecs
+import os
 from datetime import datetime
-from typing import List
+from typing import Optional
+from uuid import UUID
 from app.API.Src.core.database.Postgres.database import get_db_session
-from app.API.Src.Document.repository.document_repository import DocumentRepository
+from app.API.Src.Document.repository.ingestion_job_repository import IngestionJobRepository
 from app.API.Src.Document.response.document_upload_response import DocumentUploadResponse
+from app.API.Src.Document.ingestion.worker_pool import ingestion_workers
 from app.API.Src.core.config import settings
-from app.API.Src.Document.documentSplitter.token_based_text_splitter import TextSplitter
-from app.API.Src.Document.models.document import Document
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,15 +20,21 @@ class UploadDocumentController:
     @staticmethod
     async def upload_document(
         file: UploadFile = File(...),
-        db: AsyncSession = Depends(get_db_session)
+        db: AsyncSession = Depends(get_db_session),
+        user_id: Optional[UUID] = None
     ) -> DocumentUploadResponse:
+        """
+        Store the file in Corpus and queue it for ingestion.
+        
+        The upload is copied to Corpus settings.UPLOAD_READ_SIZE bytes at a
+        time and checked to be UTF-8 on the way, so it is never held in memory
+        whole. Splitting, embedding and storing happen in the background
+        workers; progress is reported by GET /documents/jobs/{id}.
+        """
         try:
             if not file.filename.endswith('.md'):
                 raise HTTPException(status_code=400, detail="Only .md files are allowed")
             
-            content = await file.read()
-            content_str = content.decode('utf-8')
-            
             corpus_path = Path(settings.corpus_absolute_path)
             corpus_path.mkdir(exist_ok=True)
             
@@ -35,44 +43,38 @@ class UploadDocumentController:
             new_filename = f"{name_parts[0]}_{current_date}.{name_parts[1]}"
             file_path = corpus_path / new_filename
             
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(content)
-            
-            # Split document using TokenBasedTextSplitter
-            text_splitter = TextSplitter()
-            token_limit = settings.DOCUMENT_TOKEN_LIMIT
-            split_documents = await text_splitter.split(content_str, limit=token_limit)
-            
-            logger.info(f"Split document into {len(split_documents)} parts")
-            
-            repository = DocumentRepository(db)
-            saved_documents: List[Document] = []
+            await UploadDocumentController._spool_upload(file, file_path)
             
-            # Process each split document
-            for i, split_doc in enumerate(split_documents):
-                # Set the localisation for each split document
-                split_doc.localisation = f"{file_path.stem}_part_{i+1:03d}.md"
-                
-                # Save to both PostgreSQL and Qdrant
-                saved_doc = await repository.save_document(split_doc, str(file_path))
-                saved_documents.append(saved_doc)
-                
-                logger.info(f"Saved document part {i+1}/{len(split_documents)}: {saved_doc.id}")
-            
-            # Return response for the first document (or summary)
-            first_doc = saved_documents[0] if saved_documents else None
-            if not first_doc:
-                raise HTTPException(status_code=500, detail="Failed to process document")
+            job = await IngestionJobRepository(db).enqueue(str(file_path), file.filename, user_id)
+            ingestion_workers.notify()
             
             return DocumentUploadResponse(
-                id=str(first_doc.id),
-                localisation=first_doc.localisation,
-                message=f"Document uploaded and split into {len(saved_documents)} parts successfully",
-                created_at=first_doc.created_at
+                id=str(job.id),
+                localisation=new_filename,
+                message=f"Document queued for ingestion, see /documents/jobs/{job.id}",
+                created_at=job.created_at,
+                status=job.status
             )
             
         except HTTPException:
             raise
         except Exception as e:
             logger.error(f"Error uploading document: {str(e)}")
-            raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @staticmethod
+    async def _spool_upload(file: UploadFile, file_path: Path) -> None:
+        """Copy the upload to file_path block by block; removes the file and raises 400 if it is not UTF-8."""
+        # Incremental, so multi-byte characters split between blocks are decoded correctly
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            async with aiofiles.open(file_path, 'wb') as f:
+                while True:
+                    block = await file.read(settings.UPLOAD_READ_SIZE)
+                    decoder.decode(block, final=not block)
+                    if not block:
+                        break
+                    await f.write(block)
+        except UnicodeDecodeError:
+            os.remove(file_path)
+            raise HTTPException(status_code=400, detail="File is not valid UTF-8")
\ No newline at end of file
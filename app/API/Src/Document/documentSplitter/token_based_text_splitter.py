@@ -6,13 +6,48 @@ while preserving metadata such as headers, URLs, and images.
 """
 
 import re
+import bisect
 import logging
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator, Dict, List, Tuple, Optional
 import tiktoken
 from app.API.Src.Document.models.document import Document
 
 logger = logging.getLogger(__name__)
 
+# Map model names to tiktoken encodings
+MODEL_ENCODINGS = {
+    "gpt-4o": "cl100k_base",
+    "gpt-4": "cl100k_base", 
+    "gpt-3.5-turbo": "cl100k_base",
+    "gpt-3.5-turbo-16k": "cl100k_base",
+    "text-embedding-ada-002": "cl100k_base",
+    "text-davinci-003": "p50k_base",
+    "text-davinci-002": "p50k_base",
+    "text-davinci-001": "r50k_base",
+    "text-curie-001": "r50k_base",
+    "text-babbage-001": "r50k_base",
+    "text-ada-001": "r50k_base",
+    "davinci": "r50k_base",
+    "curie": "r50k_base",
+    "babbage": "r50k_base",
+    "ada": "r50k_base",
+}
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model_name: str) -> tiktoken.Encoding:
+    """
+    Get the tiktoken encoding of a model, cl100k_base for unknown models.
+    
+    Args:
+        model_name: Model name, e.g. "gpt-4"
+        
+    Returns:
+        Shared tiktoken encoding
+    """
+    return tiktoken.get_encoding(MODEL_ENCODINGS.get(model_name, "cl100k_base"))
+
 
 class Headers:
     """Represents headers extracted from text documents."""
@@ -47,8 +82,59 @@ class Headers:
         del self._headers[key]
 
 
+class TokenOffsets:
+    """
+    Token-to-character offset map of a text encoded in a single pass.
+    
+    Lets the splitter estimate the token count of any slice of the text with
+    a binary search instead of encoding the slice again.
+    """
+    
+    def __init__(self, offsets: List[int], text_length: int):
+        self._offsets = offsets
+        self._text_length = text_length
+    
+    @classmethod
+    def from_text(cls, tokenizer: tiktoken.Encoding, text: str) -> 'TokenOffsets':
+        """
+        Encode the text once and record the character offset of every token.
+        
+        Args:
+            tokenizer: Tokenizer used for encoding
+            text: Text to encode
+            
+        Returns:
+            TokenOffsets for the given text
+        """
+        tokens = tokenizer.encode(text)
+        _, offsets = tokenizer.decode_with_offsets(tokens)
+        return cls(offsets, len(text))
+    
+    def __len__(self) -> int:
+        return len(self._offsets)
+    
+    def token_index(self, position: int) -> int:
+        """Index of the first token starting at or after the character position."""
+        return bisect.bisect_left(self._offsets, position)
+    
+    def count(self, start: int, end: int) -> int:
+        """Number of tokens starting within text[start:end]."""
+        return self.token_index(min(end, self._text_length)) - self.token_index(start)
+    
+    def position(self, index: int) -> int:
+        """Character position of the token at the index, the text length past the last token."""
+        return self._offsets[index] if index < len(self._offsets) else self._text_length
+
+
 # IDoc class removed - using Document model directly
 
+# Tokens a slice may gain or lose at its edges when encoded on its own instead of within the full text
+EDGE_TOKENS = 8
+# The end of a document is estimated from the token density of the next DENSITY_WINDOW * limit tokens
+DENSITY_WINDOW = 2
+# Start of a markdown header line, as matched by _extract_headers
+HEADER_LINE = re.compile(r'#{1,6}\s')
+
 
 class TextSplitter:
     """
@@ -56,6 +142,11 @@ class TextSplitter:
     
     This class handles text splitting while preserving document structure,
     extracting headers, URLs, and images from text documents.
+    
+    A document never runs past the start of a section (a header following
+    body text): sections longer than the limit are split from their own
+    start, so after an edit the documents of the following sections are
+    cut the same as before.
     """
     
     def __init__(self, model_name: str = "gpt-4o"):
@@ -79,27 +170,7 @@ class TextSplitter:
         """Initialize the tokenizer if not already initialized."""
         if self.tokenizer is None:
             try:
-                # Map model names to tiktoken encodings
-                model_mapping = {
-                    "gpt-4o": "cl100k_base",
-                    "gpt-4": "cl100k_base", 
-                    "gpt-3.5-turbo": "cl100k_base",
-                    "gpt-3.5-turbo-16k": "cl100k_base",
-                    "text-embedding-ada-002": "cl100k_base",
-                    "text-davinci-003": "p50k_base",
-                    "text-davinci-002": "p50k_base",
-                    "text-davinci-001": "r50k_base",
-                    "text-curie-001": "r50k_base",
-                    "text-babbage-001": "r50k_base",
-                    "text-ada-001": "r50k_base",
-                    "davinci": "r50k_base",
-                    "curie": "r50k_base",
-                    "babbage": "r50k_base",
-                    "ada": "r50k_base",
-                }
-                
-                encoding_name = model_mapping.get(self.model_name, "cl100k_base")
-                self.tokenizer = tiktoken.get_encoding(encoding_name)
+                self.tokenizer = get_tokenizer(self.model_name)
                 logger.info(f"Tokenizer initialized for model: {self.model_name}")
                 
             except Exception as e:
@@ -152,15 +223,99 @@ class TextSplitter:
         logger.info(f"Starting split process with limit: {limit} tokens")
         
         self._initialize_tokenizer()
-        documents: List[Document] = []
+        documents, _ = self._split_text(text, limit, Headers())
+        
+        logger.info(f"Split process completed. Total documents: {len(documents)}")
+        return documents
+    
+    async def split_stream(self, blocks: AsyncIterable[str], limit: int) -> AsyncIterator[Document]:
+        """
+        Split text arriving in blocks, yielding each document as soon as it is final.
+        
+        Only the text not yet split is buffered, with the line before it so
+        it is encoded as within the whole text. Complete lines are split, and
+        a document is cut once more than DENSITY_WINDOW times the limit of
+        tokens follows its start: its end estimate, boundary and newline
+        alignment only look that far, so the documents are the same as
+        split() cuts from the whole text. The rest waits for the next block.
+        
+        Args:
+            blocks: Successive parts of the text, e.g. reads of a file
+            limit: Maximum tokens per document
+            
+        Yields:
+            Documents with metadata, in text order
+        """
+        logger.info(f"Starting streaming split process with limit: {limit} tokens")
+        
+        self._initialize_tokenizer()
+        current_headers = Headers()
+        buffer = ""
         position = 0
+        count = 0
+        
+        async for block in blocks:
+            buffer += block
+            # A partial last line could be encoded differently once the rest of it arrives
+            complete = buffer.rfind("\n") + 1
+            if complete <= position:
+                continue
+            documents, position = self._split_text(
+                buffer[:complete], limit, current_headers, start=position, reserve_tokens=DENSITY_WINDOW * limit + 1
+            )
+            # Keep the line before the split position as encoding context
+            context = buffer.rfind("\n", 0, max(position - 1, 0)) + 1
+            buffer, position = buffer[context:], position - context
+            for document in documents:
+                count += 1
+                yield document
+        
+        documents, _ = self._split_text(buffer, limit, current_headers, start=position)
+        for document in documents:
+            count += 1
+            yield document
+        
+        logger.info(f"Streaming split process completed. Total documents: {count}")
+    
+    def _split_text(
+        self,
+        text: str,
+        limit: int,
+        current_headers: Headers,
+        start: int = 0,
+        reserve_tokens: int = 0
+    ) -> Tuple[List[Document], int]:
+        """
+        Split text into documents from a position.
+        
+        Args:
+            text: Text to split
+            limit: Maximum tokens per document
+            current_headers: Headers in effect at the start position, updated in place
+            start: Position to split from; the text before it is only encoding context
+            reserve_tokens: Stop once fewer tokens than this remain (0 splits the whole text)
+            
+        Returns:
+            Tuple of (documents, position where splitting stopped)
+        """
+        documents: List[Document] = []
+        position = start
         total_length = len(text)
-        current_headers = Headers()
+        
+        # Encode the whole text once; chunk boundaries are placed using this map
+        token_offsets = TokenOffsets.from_text(self.tokenizer, text)
+        # Token overhead due to formatting, the same for every document
+        wrapper_tokens = self._count_tokens("")
+        overhead = self._count_tokens(self._format_for_tokenization("")) - wrapper_tokens
         
         while position < total_length:
+            if reserve_tokens and token_offsets.count(position, total_length) < reserve_tokens:
+                break
             logger.info(f"Processing document starting at position: {position}")
             
-            document_text, document_end = self._get_document(text, position, limit)
+            document_text, document_end = self._get_document(
+                text, position, limit, token_offsets, wrapper_tokens, overhead
+            )
             tokens = self._count_tokens(document_text)
             logger.info(f"Document tokens: {tokens}")
             
@@ -182,10 +337,17 @@ class TextSplitter:
             logger.info(f"Document processed. New position: {document_end}")
             position = document_end
         
-        logger.info(f"Split process completed. Total documents: {len(documents)}")
-        return documents
+        return documents, position
     
-    def _get_document(self, text: str, start: int, limit: int) -> Tuple[str, int]:
+    def _get_document(
+        self,
+        text: str,
+        start: int,
+        limit: int,
+        token_offsets: TokenOffsets,
+        wrapper_tokens: int,
+        overhead: int
+    ) -> Tuple[str, int]:
         """
         Get a single document of text within token limit.
         
@@ -193,54 +355,124 @@ class TextSplitter:
             text: Full text to split into documents
             start: Starting position
             limit: Token limit
+            token_offsets: Token offset map of the full text
+            wrapper_tokens: Tokens added by the formatting of an empty text
+            overhead: Token overhead due to formatting
             
         Returns:
             Tuple of (document_text, document_end_position)
         """
         logger.info(f"Getting document starting at {start} with limit {limit}")
         
-        # Account for token overhead due to formatting
-        overhead = self._count_tokens(self._format_for_tokenization("")) - self._count_tokens("")
-        
         # Initial tentative end position
         if start >= len(text):
             return "", start
         
-        # Estimate end position based on token density
-        remaining_text = text[start:]
-        if not remaining_text:
+        # Estimate end position based on token density of the text ahead; only a window
+        # is used, so a streaming split that has buffered the window gets the same estimate
+        first_token = token_offsets.token_index(start)
+        window_end = token_offsets.position(first_token + DENSITY_WINDOW * limit)
+        window_tokens = token_offsets.count(start, window_end)
+        if window_tokens == 0:
             return "", start
         
-        estimated_tokens = self._count_tokens(remaining_text)
-        if estimated_tokens == 0:
-            return "", start
+        estimated_tokens = window_tokens + wrapper_tokens
         
         # Calculate approximate end position
         end = min(
-            start + int((len(remaining_text) * limit) / estimated_tokens),
+            start + max(int(((window_end - start) * limit) / estimated_tokens), 1),
             len(text)
         )
         
         # Adjust end to avoid exceeding token limit
-        document_text = text[start:end]
-        tokens = self._count_tokens(document_text)
+        end = self._find_fitting_document_end(text, start, end, limit, overhead, wrapper_tokens, token_offsets)
         
-        while tokens + overhead > limit and end > start:
-            logger.info(f"Document exceeds limit with {tokens + overhead} tokens. Adjusting end position...")
-            end = self._find_new_document_end(text, start, end)
-            document_text = text[start:end]
-            tokens = self._count_tokens(document_text)
+        # End the document where the next section starts, so cut points line up again after an edit
+        section_start = self._find_section_start(text, start, end)
+        if section_start is not None:
+            logger.info(f"Ending document at the section starting at position {section_start}")
+            return text[start:section_start], section_start
+        
+        tokens = self._count_tokens(text[start:end])
         
         # Adjust document end to align with newlines
-        end = self._adjust_document_end(text, start, end, tokens + overhead, limit)
+        end = self._adjust_document_end(text, start, end, tokens + overhead, limit, token_offsets, wrapper_tokens)
         
         document_text = text[start:end]
-        tokens = self._count_tokens(document_text)
         logger.info(f"Final document end: {end}")
         
         return document_text, end
     
-    def _adjust_document_end(self, text: str, start: int, end: int, current_tokens: int, limit: int) -> int:
+    def _find_fitting_document_end(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        limit: int,
+        overhead: int,
+        wrapper_tokens: int,
+        token_offsets: TokenOffsets
+    ) -> int:
+        """
+        Find the largest end position within the token limit.
+        
+        Candidates are the successive 10% reductions of the tentative end. The
+        first fitting candidate is located by binary search over the token
+        offset map and then confirmed with exact token counts.
+        
+        Args:
+            text: Full text
+            start: Document start position
+            end: Tentative document end position
+            limit: Token limit
+            overhead: Token overhead due to formatting
+            wrapper_tokens: Tokens added by the formatting of an empty text
+            token_offsets: Token offset map of the full text
+            
+        Returns:
+            End position of a document within the token limit
+        """
+        candidates = [end]
+        while candidates[-1] > start + 1:
+            new_end = self._find_new_document_end(text, start, candidates[-1])
+            if new_end >= candidates[-1]:
+                new_end = candidates[-1] - 1
+            candidates.append(new_end)
+        
+        def fits_estimated(candidate_end: int) -> bool:
+            return token_offsets.count(start, candidate_end) + wrapper_tokens + overhead <= limit
+        
+        def fits_exactly(candidate_end: int) -> bool:
+            return self._count_tokens(text[start:candidate_end]) + overhead <= limit
+        
+        # Candidates shrink monotonically, so the fitting ones form a suffix of the list
+        low, high = 0, len(candidates) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if fits_estimated(candidates[middle]):
+                high = middle
+            else:
+                low = middle + 1
+        
+        # Token boundaries at the slice edges can differ from the full-text encoding
+        while low > 0 and fits_exactly(candidates[low - 1]):
+            low -= 1
+        while low < len(candidates) - 1 and not fits_exactly(candidates[low]):
+            logger.info(f"Document exceeds limit at position {candidates[low]}. Adjusting end position...")
+            low += 1
+        
+        return candidates[low]
+    
+    def _adjust_document_end(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        current_tokens: int,
+        limit: int,
+        token_offsets: TokenOffsets,
+        wrapper_tokens: int
+    ) -> int:
         """
         Adjust document end to align with newlines when possible.
         
@@ -250,6 +482,8 @@ class TextSplitter:
             end: Current document end position
             current_tokens: Current token count
             limit: Token limit
+            token_offsets: Token offset map of the full text
+            wrapper_tokens: Tokens added by the formatting of an empty text
             
         Returns:
             Adjusted end position
@@ -262,8 +496,10 @@ class TextSplitter:
         # Try extending to next newline
         if next_newline != -1 and next_newline < len(text):
             extended_end = next_newline + 1
-            document_text = text[start:extended_end]
-            tokens = self._count_tokens(document_text)
+            # Screened with the offset map, so a distant newline is never tokenized; the
+            # estimate can differ from the exact count by a few tokens at the slice edges
+            estimated = token_offsets.count(start, extended_end) + wrapper_tokens
+            tokens = self._count_tokens(text[start:extended_end]) if estimated <= limit + EDGE_TOKENS else estimated
             if tokens <= limit and tokens >= min_document_tokens:
                 logger.info(f"Extending document to next newline at position {extended_end}")
                 return extended_end
@@ -280,6 +516,36 @@ class TextSplitter:
         # Return original end if adjustments aren't suitable
         return end
     
+    def _find_section_start(self, text: str, start: int, end: int) -> Optional[int]:
+        """
+        Find the first section starting within a document.
+        
+        A section starts after the last line of body text before a header,
+        so the blank lines before the header belong to it; headers and blank
+        lines at the start of the document belong to its first section.
+        
+        Args:
+            text: Full text
+            start: Document start position
+            end: Document end position
+            
+        Returns:
+            Position of the first section start after body text, or None
+        """
+        body_end = None
+        position = start
+        while position < end:
+            line_end = text.find('\n', position, end)
+            if line_end == -1:
+                line_end = end
+            if HEADER_LINE.match(text, position, line_end):
+                if body_end is not None:
+                    return body_end
+            elif text[position:line_end].strip():
+                body_end = line_end + 1
+            position = line_end + 1
+        return None
+    
     def _find_new_document_end(self, text: str, start: int, end: int) -> int:
         """
         Find new document end position by reducing current end.
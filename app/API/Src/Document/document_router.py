@@ -1,24 +1,46 @@
 from fastapi import APIRouter, Depends, Query, UploadFile, File
 from uuid import UUID
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.API.Src.core.database.Postgres.database import get_db_session
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, get_client_registry
 from app.API.Src.Document.controller.upload_document import UploadDocumentController
 from app.API.Src.Document.controller.get_document_list import GetDocumentListController
 from app.API.Src.Document.controller.get_document import GetDocumentController
 from app.API.Src.Document.controller.delete_document import DeleteDocumentController
+from app.API.Src.Document.controller.get_ingestion_job import GetIngestionJobController
+from app.API.Src.Document.controller.bulk_import import BulkImportController
 from app.API.Src.Document.response.document_upload_response import DocumentUploadResponse
 from app.API.Src.Document.response.document_list_response import DocumentListResponse
 from app.API.Src.Document.response.document_response import DocumentResponse
+from app.API.Src.Document.response.ingestion_job_response import IngestionJobResponse
+from app.API.Src.Document.response.bulk_import_response import BulkImportResponse
 
 router = APIRouter()
 
-@router.post("/documents", response_model=DocumentUploadResponse, tags=["Documents"])
-async def upload_document(file: UploadFile = File(...), db: AsyncSession = Depends(get_db_session)):
-    return await UploadDocumentController.upload_document(file, db)
+@router.post("/documents", response_model=DocumentUploadResponse, status_code=202, tags=["Documents"])
+async def upload_document(file: UploadFile = File(...), user_id: Optional[UUID] = Query(default=None, description="Owner of the document, used to scope searches"), db: AsyncSession = Depends(get_db_session)):
+    return await UploadDocumentController.upload_document(file, db, user_id)
+
+@router.get("/documents/jobs/{job_id}", response_model=IngestionJobResponse, tags=["Documents"])
+async def get_ingestion_job(job_id: UUID, db: AsyncSession = Depends(get_db_session)):
+    return await GetIngestionJobController.get_ingestion_job(job_id, db)
+
+@router.post("/documents/imports", response_model=BulkImportResponse, status_code=202, tags=["Documents"])
+async def start_bulk_import(file: Optional[UploadFile] = File(default=None, description="Archive (.zip, .tar, .tar.gz) of .md files"), directory: Optional[str] = Query(default=None, description="Directory inside BULK_IMPORT_ROOT to import instead of an archive"), user_id: Optional[UUID] = Query(default=None, description="Owner of the documents, used to scope searches"), db: AsyncSession = Depends(get_db_session)):
+    return await BulkImportController.start_import(file, directory, db, user_id)
+
+@router.get("/documents/imports/{import_id}", response_model=BulkImportResponse, tags=["Documents"])
+async def get_bulk_import(import_id: UUID, db: AsyncSession = Depends(get_db_session)):
+    return await BulkImportController.get_import(import_id, db)
+
+@router.post("/documents/imports/{import_id}/resume", response_model=BulkImportResponse, status_code=202, tags=["Documents"])
+async def resume_bulk_import(import_id: UUID, db: AsyncSession = Depends(get_db_session)):
+    return await BulkImportController.resume_import(import_id, db)
 
 @router.get("/documents", response_model=DocumentListResponse, tags=["Documents"])
-async def get_documents(limit: int = Query(default=100, le=1000), offset: int = Query(default=0, ge=0), db: AsyncSession = Depends(get_db_session)):
-    return await GetDocumentListController.get_documents(limit, offset, db)
+async def get_documents(limit: int = Query(default=100, le=1000), offset: int = Query(default=0, ge=0), cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"), total: str = Query(default="exact", pattern="^(exact|estimated|none)$", description="How to compute the total count"), db: AsyncSession = Depends(get_db_session)):
+    return await GetDocumentListController.get_documents(limit, offset, db, cursor, total)
 
 
 @router.get("/documents/{document_id}", response_model=DocumentResponse, tags=["Documents"])
@@ -26,5 +48,5 @@ async def get_document(document_id: UUID, db: AsyncSession = Depends(get_db_sess
     return await GetDocumentController.get_document(document_id, db)
 
 @router.delete("/documents/{document_id}", response_model=dict, tags=["Documents"])
-async def delete_document(document_id: UUID, db: AsyncSession = Depends(get_db_session)):
-    return await DeleteDocumentController.delete_document(document_id, db)
\ No newline at end of file
+async def delete_document(document_id: UUID, db: AsyncSession = Depends(get_db_session), clients: ClientRegistry = Depends(get_client_registry)):
+    return await DeleteDocumentController.delete_document(document_id, db, clients)
\ No newline at end of file
@@ -0,0 +1,477 @@
+"""
+Bulk import of a directory or archive of markdown files.
+
+Files are split in a process pool, since the splitter is CPU-bound. Their
+chunks are embedded in batches of settings.INGESTION_BATCH_SIZE chunks,
+which may span several small files, and each batch is written with one bulk
+INSERT and Qdrant upsert. Every file is a job in the ingestion_jobs table
+with the import's ID, so running an interrupted import again resumes with
+the files not done yet. Importing files again only embeds their changed
+chunks (see ChunkDiff), and copies of chunks already stored are linked to
+them instead of embedded (see ChunkDeduplicator); a file's source is its
+path within the import.
+
+Usage:
+    python -m app.API.Src.Document.ingestion.bulk_import ./Corpus
+    python -m app.API.Src.Document.ingestion.bulk_import export.zip --processes 8 --user-id <uuid>
+    python -m app.API.Src.Document.ingestion.bulk_import --resume <import_id>
+"""
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tarfile
+import time
+import uuid
+import zipfile
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.API.Src.core.config import settings
+from app.API.Src.core.database.Postgres.database import AsyncSessionLocal, init_db
+from app.API.Src.core.database.Qdrant.client import qdrant_db
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, client_registry
+from app.API.Src.Document.ingestion.chunk_diff import ChunkDiff
+from app.API.Src.Document.ingestion.deduplication import ChunkDeduplicator
+from app.API.Src.Document.ingestion.split_worker import split_file
+from app.API.Src.Document.models.document import Document
+from app.API.Src.Document.models.ingestion_job import IngestionJob, JOB_RUNNING
+from app.API.Src.Document.repository.document_repository import DocumentRepository
+from app.API.Src.Document.repository.ingestion_job_repository import IngestionJobRepository
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+def is_archive(path: Path) -> bool:
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def extract_archive(archive_path: Path, target: Path) -> int:
+    """
+    Extract the .md files of a zip or tar archive into target.
+
+    Members that would land outside target (absolute paths, "..") and links
+    are skipped. The sizes the archive declares for its members are checked
+    before anything is extracted; reading a member stops at its declared size.
+
+    Returns:
+        Number of files extracted
+
+    Raises:
+        ValueError: If the archive has more than settings.BULK_IMPORT_MAX_FILES .md files
+            or they add up to more than settings.BULK_IMPORT_MAX_EXTRACTED_BYTES
+    """
+    target = target.resolve()
+    extracted = 0
+    if archive_path.name.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            members = [member for member in archive.infolist() if not member.is_dir() and member.filename.endswith(".md")]
+            _check_archive_size(archive_path, len(members), sum(member.file_size for member in members))
+            for member in members:
+                with archive.open(member) as source:
+                    extracted += _extract_member(target, member.filename, source)
+    else:
+        with tarfile.open(archive_path) as archive:
+            members = [member for member in archive.getmembers() if member.isfile() and member.name.endswith(".md")]
+            _check_archive_size(archive_path, len(members), sum(member.size for member in members))
+            for member in members:
+                with archive.extractfile(member) as source:
+                    extracted += _extract_member(target, member.name, source)
+    return extracted
+
+
+def _check_archive_size(archive_path: Path, files: int, size: int) -> None:
+    if files > settings.BULK_IMPORT_MAX_FILES:
+        raise ValueError(f"{archive_path.name} has {files} .md files, more than the limit of {settings.BULK_IMPORT_MAX_FILES}")
+    if size > settings.BULK_IMPORT_MAX_EXTRACTED_BYTES:
+        raise ValueError(
+            f"{archive_path.name} extracts to {size} bytes, more than the limit of {settings.BULK_IMPORT_MAX_EXTRACTED_BYTES}"
+        )
+
+
+def _extract_member(target: Path, name: str, source) -> int:
+    destination = (target / name).resolve()
+    if target not in destination.parents:
+        logger.warning(f"Skipping archive member outside the import directory: {name}")
+        return 0
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with open(destination, "wb") as output:
+        shutil.copyfileobj(source, output)
+    return 1
+
+
+def import_directory(import_id: UUID) -> Path:
+    """Directory in Corpus an archive of an import is extracted to; it stays there for resumes."""
+    return settings.corpus_absolute_path / "imports" / str(import_id)
+
+
+def collect_files(directory: Path) -> List[Tuple[str, str]]:
+    """
+    Find the markdown files under a directory.
+
+    Returns:
+        (absolute file path, path relative to directory) of each file, sorted by path;
+        the relative path is stored as the source of its chunks
+    """
+    directory = directory.resolve()
+    return [
+        (str(path), path.relative_to(directory).as_posix())
+        for path in sorted(directory.rglob("*.md"))
+        if path.is_file()
+    ]
+
+
+class BulkImportProgress:
+    """Counters of one run of a bulk import."""
+
+    def __init__(self, files_total: int):
+        self.files_total = files_total
+        self.files_done = 0
+        self.files_failed = 0
+        self.chunks = 0  # Chunks of the files done
+        self.chunks_embedded = 0  # New or changed chunks; the others were kept from a previous import or are copies
+        self.chunks_duplicate = 0  # New chunks linked to an identical or near-identical chunk instead of embedded
+        self.chunks_removed = 0  # Chunks of previous versions no longer in the files
+        self.timings: Dict[str, float] = {}  # Milliseconds the run waited on each stage
+        self.started = time.perf_counter()
+
+    @property
+    def seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def files_per_second(self) -> float:
+        return (self.files_done + self.files_failed) / self.seconds if self.seconds > 0 else 0.0
+
+    def add_timing(self, stage: str, start: float) -> None:
+        self.timings[stage] = round(self.timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000, 1)
+
+    def __str__(self) -> str:
+        return (f"{self.files_done + self.files_failed}/{self.files_total} files ({self.files_failed} failed), "
+                f"{self.chunks} chunks ({self.chunks_embedded} embedded, {self.chunks_duplicate} duplicates, "
+                f"{self.chunks_removed} removed), "
+                f"{self.seconds:.1f} s, {self.files_per_second:.1f} files/s")
+
+
+class BulkImportService:
+    """
+    Creates and runs bulk imports.
+
+    The API runs imports as tasks of its event loop (start()); the CLI below
+    runs one directly (run()). Splitting uses settings.BULK_IMPORT_PROCESSES
+    processes, started with "spawn" so they do not inherit the API's open
+    connections.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        clients: Optional[ClientRegistry] = None,
+        processes: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ):
+        self.session_factory = session_factory
+        self.clients = clients or client_registry
+        self.processes = processes or settings.BULK_IMPORT_PROCESSES or os.cpu_count() or 1
+        # Executor to split in instead of a process pool per run (tests)
+        self.executor = executor
+        self._tasks: Dict[UUID, asyncio.Task] = {}
+
+    async def create_import(
+        self,
+        directory: Path,
+        user_id: Optional[UUID] = None,
+        import_id: Optional[UUID] = None
+    ) -> UUID:
+        """
+        Queue the markdown files under a directory as a new bulk import.
+
+        Args:
+            directory: Directory to import, searched recursively
+            user_id: Owner of the documents (optional)
+            import_id: ID for the import (generated if omitted)
+
+        Returns:
+            ID of the import
+        """
+        files = collect_files(directory)
+        if not files:
+            raise ValueError(f"No .md files found in {directory}")
+        import_id = import_id or uuid.uuid4()
+        async with self.session_factory() as session:
+            await IngestionJobRepository(session).enqueue_import(import_id, files, user_id)
+        return import_id
+
+    def start(self, import_id: UUID) -> None:
+        """Run an import in the background of the event loop."""
+        task = asyncio.create_task(self._run_in_background(import_id))
+        self._tasks[import_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(import_id, None))
+
+    async def _run_in_background(self, import_id: UUID) -> None:
+        try:
+            await self.run(import_id)
+        except Exception as e:
+            logger.error(f"Error running bulk import {import_id}: {str(e)}")
+
+    def is_running(self, import_id: UUID) -> bool:
+        return import_id in self._tasks
+
+    async def stop(self) -> None:
+        """Cancel the running imports; their files not done are queued again for a resume."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(
+        self,
+        import_id: UUID,
+        on_progress: Optional[Callable[[BulkImportProgress], None]] = None
+    ) -> BulkImportProgress:
+        """
+        Import the files of an import that are not done yet.
+
+        Args:
+            import_id: ID of the import
+            on_progress: Called after each stored batch and failed file (optional)
+
+        Returns:
+            Counters of this run
+        """
+        async with self.session_factory() as job_session, self.session_factory() as document_session:
+            jobs = IngestionJobRepository(job_session)
+            claimed = await jobs.claim_import(import_id)
+            progress = BulkImportProgress(len(claimed))
+            if not claimed:
+                return progress
+            logger.info(f"Running bulk import {import_id}: {len(claimed)} files, {self.processes} processes")
+
+            documents = DocumentRepository(
+                document_session,
+                embedding_generator=self.clients.get_embedding_generator(),
+                qdrant_repo=self.clients.get_qdrant_repository()
+            )
+            # Parts stored by an interrupted run, which may be incomplete
+            leftover = [UUID(document_id) for job in claimed for document_id in (job.document_ids or [])]
+            if leftover:
+                await documents.delete_documents(leftover)
+
+            executor = self.executor or ProcessPoolExecutor(
+                self.processes, mp_context=multiprocessing.get_context("spawn")
+            )
+            keep_alive = asyncio.create_task(self._keep_alive([job.id for job in claimed]))
+            try:
+                await self._import_files(claimed, executor, jobs, documents, progress, on_progress)
+            except BaseException:
+                # Interrupted: the files not finished can be taken by a resume right away
+                keep_alive.cancel()
+                await jobs.release([job for job in claimed if job.status == JOB_RUNNING])
+                raise
+            finally:
+                keep_alive.cancel()
+                if self.executor is None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.info(f"Bulk import {import_id} run finished: {progress}, timings (ms): {progress.timings}")
+        return progress
+
+    async def _keep_alive(self, job_ids: List[UUID]) -> None:
+        """
+        Refresh the heartbeat of the run's files every third of
+        settings.INGESTION_STALE_AFTER, so a resume does not take over the
+        files still waiting for their batch.
+        """
+        while True:
+            await asyncio.sleep(settings.INGESTION_STALE_AFTER / 3)
+            try:
+                async with self.session_factory() as session:
+                    await IngestionJobRepository(session).heartbeat(job_ids)
+            except Exception as e:
+                logger.error(f"Error refreshing the heartbeat of bulk import files: {str(e)}")
+
+    async def _import_files(
+        self,
+        claimed: List[IngestionJob],
+        executor: Executor,
+        jobs: IngestionJobRepository,
+        documents: DocumentRepository,
+        progress: BulkImportProgress,
+        on_progress: Optional[Callable[[BulkImportProgress], None]]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        queue = iter(claimed)
+        splitting: Dict[asyncio.Future, IngestionJob] = {}
+
+        def submit_next() -> None:
+            job = next(queue, None)
+            if job is not None:
+                future = loop.run_in_executor(executor, split_file, job.file_path, settings.DOCUMENT_TOKEN_LIMIT)
+                splitting[future] = job
+
+        # Two files per process keep the pool busy while a batch is embedded and stored
+        for _ in range(2 * self.processes):
+            submit_next()
+
+        batch: List[Tuple[IngestionJob, List[Document]]] = []
+        batch_chunks = 0
+        while splitting:
+            start = time.perf_counter()
+            finished, _ = await asyncio.wait(splitting, return_when=asyncio.FIRST_COMPLETED)
+            progress.add_timing("split", start)
+
+            for future in finished:
+                job = splitting.pop(future)
+                submit_next()
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    logger.error(f"Error splitting {job.file_path}: {str(e)}")
+                    await jobs.fail_batch([job], str(e), {})
+                    progress.files_failed += 1
+                    if on_progress is not None:
+                        on_progress(progress)
+                    continue
+
+                batch.append((job, [self._to_document(job, row) for row in rows]))
+                batch_chunks += len(rows)
+
+            if batch_chunks >= settings.INGESTION_BATCH_SIZE or (batch and not splitting):
+                await self._store_batch(batch, jobs, documents, progress)
+                batch, batch_chunks = [], 0
+                if on_progress is not None:
+                    on_progress(progress)
+
+    async def _store_batch(
+        self,
+        batch: List[Tuple[IngestionJob, List[Document]]],
+        jobs: IngestionJobRepository,
+        documents: DocumentRepository,
+        progress: BulkImportProgress
+    ) -> None:
+        batch_jobs = [job for job, _ in batch]
+        # The stored versions of the files, diffed so only new chunks are embedded; an import has one owner
+        stored: Dict[str, List[Document]] = defaultdict(list)
+        for document in await documents.get_documents_by_sources([job.source for job in batch_jobs], batch_jobs[0].user_id):
+            stored[document.source].append(document)
+
+        diffs: List[ChunkDiff] = []
+        file_ids: List[List[UUID]] = []
+        new_chunks: List[Document] = []
+        for job, file_chunks in batch:
+            diff = ChunkDiff(stored[job.source])
+            ids: List[UUID] = []
+            for index, chunk in enumerate(file_chunks, 1):
+                kept = diff.match(chunk, f"{Path(job.file_path).stem}_part_{index:03d}.md")
+                if kept is None:
+                    chunk.id = uuid.uuid4()
+                    new_chunks.append(chunk)
+                ids.append(chunk.id if kept is None else kept.id)
+            diffs.append(diff)
+            file_ids.append(ids)
+        new_ids = {chunk.id for chunk in new_chunks}
+        await jobs.record_batch(batch_jobs, [[document_id for document_id in ids if document_id in new_ids] for ids in file_ids])
+
+        timings: Dict[str, float] = {}
+        saved = False
+        canonical: List[Document] = []
+        try:
+            if new_chunks:
+                start = time.perf_counter()
+                canonical = await ChunkDeduplicator(documents).link(new_chunks)
+                timings["deduplication"] = round((time.perf_counter() - start) * 1000, 1)
+
+                start = time.perf_counter()
+                embeddings = await self.clients.get_embedding_generator().generate_embeddings(
+                    [chunk.content for chunk in canonical]
+                ) if canonical else []
+                timings["embedding"] = round((time.perf_counter() - start) * 1000, 1)
+
+                start = time.perf_counter()
+                await documents.save_documents(new_chunks, embeddings)
+                saved = True
+                timings["storage"] = round((time.perf_counter() - start) * 1000, 1)
+
+            # The new versions are complete; update what is left of the previous ones
+            start = time.perf_counter()
+            await documents.update_localisations({
+                document_id: localisation for diff in diffs for document_id, localisation in diff.renamed.items()
+            })
+            await documents.delete_documents([document_id for diff in diffs for document_id in diff.vanished_ids()])
+            timings["storage"] = round(timings.get("storage", 0.0) + (time.perf_counter() - start) * 1000, 1)
+        except Exception as e:
+            # save_documents leaves nothing behind on its own failure; the previous versions are untouched
+            if saved:
+                await documents.delete_documents(list(new_ids))
+            await jobs.fail_batch(batch_jobs, str(e), timings)
+            progress.files_failed += len(batch_jobs)
+            return
+
+        for stage, milliseconds in timings.items():
+            progress.timings[stage] = round(progress.timings.get(stage, 0.0) + milliseconds, 1)
+        await jobs.complete_batch(batch_jobs, file_ids, timings)
+        progress.files_done += len(batch_jobs)
+        progress.chunks += sum(len(ids) for ids in file_ids)
+        progress.chunks_embedded += len(canonical)
+        progress.chunks_duplicate += len(new_chunks) - len(canonical)
+        progress.chunks_removed += sum(len(diff.vanished_ids()) for diff in diffs)
+
+    @staticmethod
+    def _to_document(job: IngestionJob, row: Dict) -> Document:
+        return Document(source=job.source, user_id=job.user_id, **row)
+
+
+bulk_imports = BulkImportService()
+
+
+async def main(args: argparse.Namespace) -> int:
+    # The splitter and repositories log every chunk at INFO level
+    logging.basicConfig(level=logging.WARNING)
+    await init_db()
+    if settings.VECTOR_STORE_BACKEND == "qdrant":
+        await qdrant_db.connect()
+    await client_registry.connect()
+    try:
+        await client_registry.get_qdrant_repository().create_collection()
+        service = BulkImportService(processes=args.processes)
+
+        if args.resume:
+            import_id = args.resume
+        elif is_archive(args.path):
+            import_id = uuid.uuid4()
+            directory = import_directory(import_id)
+            print(f"Extracted {extract_archive(args.path, directory)} files from {args.path} to {directory}")
+            await service.create_import(directory, args.user_id, import_id)
+        else:
+            import_id = await service.create_import(args.path, args.user_id)
+        print(f"Bulk import {import_id}; resume with --resume {import_id}")
+
+        progress = await service.run(import_id, on_progress=lambda progress: print(progress, flush=True))
+        print(f"Done: {progress}")
+        print(f"Timings (ms waited per stage): {progress.timings}")
+        return 1 if progress.files_failed else 0
+    finally:
+        await client_registry.disconnect()
+        await qdrant_db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a directory or archive of markdown files")
+    parser.add_argument("path", type=Path, nargs="?", help="Directory or .zip/.tar/.tar.gz archive of .md files")
+    parser.add_argument("--resume", type=UUID, help="ID of an interrupted import to finish")
+    parser.add_argument("--processes", type=int, default=None, help="Splitting processes (default: one per CPU)")
+    parser.add_argument("--user-id", type=UUID, default=None, help="Owner of the documents")
+    parsed = parser.parse_args()
+    if (parsed.path is None) == (parsed.resume is None):
+        parser.error("give either a path or --resume")
+    sys.exit(asyncio.run(main(parsed)))
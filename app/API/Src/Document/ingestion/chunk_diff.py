@@ -0,0 +1,69 @@
+"""
+Diff of a new version of a source file against its stored chunks.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from app.API.Src.Document.models.document import Document, content_hash
+
+
+class ChunkDiff:
+    """
+    Matches the chunks of a new version of a file with the stored chunks of
+    the previous one.
+
+    A chunk with the same content hash and headers as a stored chunk is
+    unchanged: the stored chunk, its embedding and its vector point are kept.
+    The other chunks are new and need embedding; stored chunks left without
+    a match after the whole file is diffed have vanished.
+    """
+
+    def __init__(self, stored: List[Document]):
+        self._stored_ids = [document.id for document in stored]
+        # Stored chunks per hash, in file order, so repeated chunks keep their order
+        self._by_hash: Dict[str, List[Document]] = defaultdict(list)
+        for document in stored:
+            if document.content_hash:
+                self._by_hash[document.content_hash].append(document)
+        self.kept: List[Document] = []
+        self.added = 0
+        # New localisation (part number) of kept chunks that moved in the file
+        self.renamed: Dict[UUID, str] = {}
+
+    def match(self, chunk: Document, localisation: str) -> Optional[Document]:
+        """
+        Find the stored chunk the new chunk is unchanged from.
+
+        Sets the chunk's content_hash. A new chunk is given the localisation;
+        for a matched stored chunk that moved, the rename is recorded in
+        renamed (the stored object itself is not changed).
+
+        Args:
+            chunk: Chunk of the new version
+            localisation: Name of the chunk in the new version (<stem>_part_NNN.md)
+
+        Returns:
+            The stored chunk to keep, or None if the chunk is new
+        """
+        chunk.content_hash = content_hash(chunk.content)
+        candidates = self._by_hash.get(chunk.content_hash, [])
+        for index, document in enumerate(candidates):
+            if document.headers == chunk.headers:
+                candidates.pop(index)
+                self.kept.append(document)
+                if document.localisation != localisation:
+                    self.renamed[document.id] = localisation
+                return document
+
+        chunk.localisation = localisation
+        self.added += 1
+        return None
+
+    def vanished_ids(self) -> List[UUID]:
+        """IDs of the stored chunks without a match in the new version."""
+        kept_ids = {document.id for document in self.kept}
+        return [document_id for document_id in self._stored_ids if document_id not in kept_ids]
+
+    def __str__(self) -> str:
+        return f"{len(self.kept)} unchanged, {self.added} new, {len(self.vanished_ids())} removed"
@@ -0,0 +1,113 @@
+"""
+Deduplication of chunks at ingestion.
+
+A new chunk with the same content hash as a stored chunk of the same owner
+is an exact copy; one whose MinHash signature estimates a Jaccard
+similarity of at least settings.DEDUP_NEAR_THRESHOLD with a stored chunk is
+a near-duplicate. Copies are stored linked to their canonical chunk
+(canonical_id) without an embedding or a vector point; the canonical
+chunk's point carries the sources and headers of its copies, so filtered
+searches still find it, and retrieval keeps one document per group.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional
+from uuid import UUID
+import uuid
+
+from app.API.Src.core.config import settings
+from app.API.Src.Document.ingestion.minhash import MINHASH_BANDS, band_buckets, minhash, similarity
+from app.API.Src.Document.models.document import Document, content_hash
+from app.API.Src.Document.repository.document_repository import DocumentRepository
+
+
+class ChunkDeduplicator:
+    """
+    Links new chunks to the canonical chunks they copy.
+
+    Candidates are looked up with one query per owner and batch: stored
+    canonical chunks with the same content hash or sharing a MinHash bucket
+    (see minhash). Chunks earlier in the same batch are candidates as well.
+    """
+
+    def __init__(self, repository: DocumentRepository, threshold: Optional[float] = None):
+        self.repository = repository
+        self.threshold = settings.DEDUP_NEAR_THRESHOLD if threshold is None else threshold
+        self.exact = 0
+        self.near = 0
+
+    async def link(self, chunks: List[Document]) -> List[Document]:
+        """
+        Fingerprint new chunks and link the copies to their canonical chunk.
+
+        Chunks without an ID are given one, so copies later in the batch can
+        refer to them. Copies get canonical_id set.
+
+        Args:
+            chunks: New chunks, not stored yet
+
+        Returns:
+            The canonical chunks, which need embedding, in input order
+        """
+        for chunk in chunks:
+            chunk.id = chunk.id or uuid.uuid4()
+            chunk.content_hash = chunk.content_hash or content_hash(chunk.content)
+            chunk.minhash = minhash(chunk.content)
+        if not settings.DEDUP_ENABLED:
+            return list(chunks)
+
+        near = self.threshold < 1.0
+        by_owner: Dict[Optional[UUID], List[Document]] = defaultdict(list)
+        for chunk in chunks:
+            by_owner[chunk.user_id].append(chunk)
+        for user_id, owner_chunks in by_owner.items():
+            buckets = [band_buckets(chunk.minhash) for chunk in owner_chunks if chunk.minhash is not None] if near else []
+            stored = await self.repository.find_canonical_documents(
+                [chunk.content_hash for chunk in owner_chunks],
+                [[chunk_buckets[band] for chunk_buckets in buckets] for band in range(MINHASH_BANDS)] if buckets else None,
+                user_id
+            )
+            canonical = _CanonicalIndex(stored)
+            for chunk in owner_chunks:
+                match = canonical.find(chunk, self.threshold if near else None)
+                if match is None:
+                    canonical.add(chunk)
+                    continue
+                chunk.canonical_id = match.id
+                if match.content_hash == chunk.content_hash:
+                    self.exact += 1
+                else:
+                    self.near += 1
+        return [chunk for chunk in chunks if chunk.canonical_id is None]
+
+    def __str__(self) -> str:
+        return f"{self.exact} exact and {self.near} near duplicates"
+
+
+class _CanonicalIndex:
+    """Canonical chunks by content hash and by MinHash bucket."""
+
+    def __init__(self, documents: List[Document]):
+        self._by_hash: Dict[str, Document] = {}
+        self._by_bucket: List[Dict[int, List[Document]]] = [defaultdict(list) for _ in range(MINHASH_BANDS)]
+        for document in documents:
+            self.add(document)
+
+    def add(self, document: Document) -> None:
+        if document.content_hash:
+            self._by_hash.setdefault(document.content_hash, document)
+        if document.minhash is not None:
+            for band, bucket in enumerate(band_buckets(document.minhash)):
+                self._by_bucket[band][bucket].append(document)
+
+    def find(self, chunk: Document, threshold: Optional[float]) -> Optional[Document]:
+        """The chunk's canonical chunk: the same hash, else the most similar one at the threshold or above."""
+        exact = self._by_hash.get(chunk.content_hash)
+        if exact is not None or chunk.minhash is None or threshold is None:
+            return exact
+        nearest, best = None, 0.0
+        for band, bucket in enumerate(band_buckets(chunk.minhash)):
+            for document in self._by_bucket[band].get(bucket, []):
+                score = similarity(chunk.minhash, document.minhash)
+                if score >= threshold and score > best:
+                    nearest, best = document, score
+        return nearest
@@ -0,0 +1,181 @@
+"""
+Ingestion of an uploaded markdown file: split, embed and store its chunks.
+"""
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+from uuid import UUID
+import logging
+import time
+import uuid
+
+import aiofiles
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.API.Src.core.config import settings
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, client_registry
+from app.API.Src.Document.documentSplitter.token_based_text_splitter import TextSplitter
+from app.API.Src.Document.ingestion.chunk_diff import ChunkDiff
+from app.API.Src.Document.ingestion.deduplication import ChunkDeduplicator
+from app.API.Src.Document.models.document import Document
+from app.API.Src.Document.repository.document_repository import DocumentRepository
+
+logger = logging.getLogger(__name__)
+
+# Called after each stored batch with the number of new chunks saved so far and
+# the number of chunks of the file, which is known (not None) once the whole file is split
+ProgressCallback = Callable[[int, Optional[int]], Awaitable[None]]
+
+
+class DocumentIngestionService:
+    """
+    Streams a file through the splitter and embeds and stores its chunks in
+    batches of settings.INGESTION_BATCH_SIZE, reporting progress after each
+    batch.
+    
+    The file is read settings.INGESTION_READ_SIZE characters at a time and
+    each batch is stored as soon as the splitter has produced it; only the
+    IDs of the stored chunks are kept, so memory use does not grow with the
+    file size.
+    
+    A file uploaded again replaces the previous version of the same source
+    and owner incrementally (see ChunkDiff): only new chunks are embedded
+    and stored, unchanged ones are kept and vanished ones deleted once the
+    new version is complete.
+    
+    New chunks that copy a stored chunk of the same owner, or an earlier
+    chunk of the file, are stored linked to it instead of being embedded
+    (see ChunkDeduplicator).
+    
+    A failed file leaves nothing behind: the chunks stored by earlier
+    batches are deleted before the error is raised, and the previous
+    version is left as it was.
+    """
+    
+    def __init__(
+        self,
+        session: AsyncSession,
+        clients: Optional[ClientRegistry] = None,
+        splitter: Optional[TextSplitter] = None
+    ):
+        self.clients = clients or client_registry
+        self.embedding_generator = self.clients.get_embedding_generator()
+        self.repository = DocumentRepository(
+            session,
+            embedding_generator=self.embedding_generator,
+            qdrant_repo=self.clients.get_qdrant_repository()
+        )
+        self.splitter = splitter or TextSplitter()
+    
+    async def ingest_file(
+        self,
+        file_path: Path,
+        source: str,
+        user_id: Optional[UUID] = None,
+        timings: Optional[Dict[str, float]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        chunk_ids: Optional[Iterator[UUID]] = None
+    ) -> List[UUID]:
+        """
+        Split, embed and store a markdown file.
+        
+        Args:
+            file_path: File in Corpus; its stem names the chunks (<stem>_part_001.md, ...)
+            source: Name of the uploaded file, stored for search filters and to find its previous version
+            user_id: Owner of the file (optional)
+            timings: Dict to add the milliseconds of each stage to (read, split, deduplication, embedding, storage)
+            on_progress: Coroutine function called after each stored batch with the number of new chunks saved so far (optional)
+            chunk_ids: IDs to give the new chunks, in file order (random if omitted)
+            
+        Returns:
+            IDs of the documents of the file in file order: kept ones of the previous version and saved new ones
+        """
+        timings = timings if timings is not None else {}
+        diff = ChunkDiff(await self.repository.get_documents_by_sources([source], user_id))
+        deduplicator = ChunkDeduplicator(self.repository)
+        chunks = self.splitter.split_stream(
+            self._read_blocks(file_path, timings),
+            limit=settings.DOCUMENT_TOKEN_LIMIT
+        )
+        
+        part_ids: List[UUID] = []
+        saved_ids: List[UUID] = []
+        batch: List[Document] = []
+        try:
+            start = time.perf_counter()
+            async for chunk in chunks:
+                localisation = f"{file_path.stem}_part_{len(part_ids) + 1:03d}.md"
+                kept = diff.match(chunk, localisation)
+                if kept is not None:
+                    part_ids.append(kept.id)
+                    continue
+                
+                chunk.id = next(chunk_ids) if chunk_ids is not None else uuid.uuid4()
+                chunk.source = source
+                chunk.user_id = user_id
+                part_ids.append(chunk.id)
+                batch.append(chunk)
+                if len(batch) >= settings.INGESTION_BATCH_SIZE:
+                    self._add_timing(timings, "split", start)
+                    await self._store_batch(batch, saved_ids, deduplicator, timings)
+                    batch = []
+                    if on_progress is not None:
+                        await on_progress(len(saved_ids), None)
+                    start = time.perf_counter()
+            self._add_timing(timings, "split", start)
+            
+            if batch:
+                await self._store_batch(batch, saved_ids, deduplicator, timings)
+            if on_progress is not None:
+                await on_progress(len(saved_ids), len(part_ids))
+            
+            # The new version is complete; update what is left of the previous one
+            start = time.perf_counter()
+            await self.repository.update_localisations(diff.renamed)
+            await self.repository.delete_documents(diff.vanished_ids())
+            self._add_timing(timings, "storage", start)
+        except Exception:
+            if saved_ids:
+                logger.warning(f"Removing {len(saved_ids)} parts of {file_path.name} stored before the failure")
+                await self.repository.delete_documents(saved_ids)
+            raise
+        
+        # The split stage includes the reads it waited for
+        timings["split"] = round(timings["split"] - timings.get("read", 0.0), 1)
+        logger.info(f"Ingested {file_path.name}: {len(part_ids)} parts ({diff}; {deduplicator}), timings (ms): {timings}")
+        return part_ids
+    
+    async def _store_batch(
+        self,
+        batch: List[Document],
+        saved_ids: List[UUID],
+        deduplicator: ChunkDeduplicator,
+        timings: Dict[str, float]
+    ) -> None:
+        start = time.perf_counter()
+        canonical = await deduplicator.link(batch)
+        self._add_timing(timings, "deduplication", start)
+        
+        start = time.perf_counter()
+        embeddings = await self.embedding_generator.generate_embeddings([chunk.content for chunk in canonical]) if canonical else []
+        self._add_timing(timings, "embedding", start)
+        
+        start = time.perf_counter()
+        saved = await self.repository.save_documents(batch, embeddings)
+        saved_ids.extend(document.id for document in saved)
+        self._add_timing(timings, "storage", start)
+    
+    @staticmethod
+    async def _read_blocks(file_path: Path, timings: Dict[str, float]) -> AsyncIterator[str]:
+        """Read the file settings.INGESTION_READ_SIZE characters at a time."""
+        async with aiofiles.open(file_path, "r", encoding="utf-8") as file:
+            while True:
+                start = time.perf_counter()
+                block = await file.read(settings.INGESTION_READ_SIZE)
+                DocumentIngestionService._add_timing(timings, "read", start)
+                if not block:
+                    return
+                yield block
+    
+    @staticmethod
+    def _add_timing(timings: Dict[str, float], stage: str, start: float) -> None:
+        timings[stage] = round(timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000, 1)
@@ -0,0 +1,78 @@
+"""
+MinHash signatures of chunks, for finding near-duplicates.
+
+The signature of a chunk is the minimum of MINHASH_PERMUTATIONS hash
+functions over its word shingles; the share of equal values of two
+signatures estimates the Jaccard similarity of their shingle sets. For
+lookup, a signature is cut into MINHASH_BANDS bands and each band hashed to
+a bucket (locality-sensitive hashing): two chunks share a bucket with
+probability 1 - (1 - J^8)^8, 0.99 at a similarity J of 0.9 and 0.03 at 0.5.
+"""
+from typing import List, Optional
+import hashlib
+import re
+
+import numpy as np
+
+SHINGLE_WORDS = 3
+# Shorter chunks are only linked as exact copies
+MIN_SHINGLES = 8
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 8
+# Signature values are 32-bit, stored big-endian
+_VALUE_BYTES = 4
+_BAND_BYTES = MINHASH_PERMUTATIONS // MINHASH_BANDS * _VALUE_BYTES
+
+_WORD = re.compile(r"\w+")
+
+
+def _permutations() -> np.ndarray:
+    """Multipliers (odd) and offsets of the multiply-shift hash functions, derived from fixed seeds."""
+    digests = [hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest() for i in range(MINHASH_PERMUTATIONS)]
+    return np.array(
+        [[int.from_bytes(digest[:8], "big") | 1, int.from_bytes(digest[8:], "big")] for digest in digests],
+        dtype=np.uint64
+    )
+
+
+_MULTIPLIERS, _OFFSETS = _permutations().T
+
+
+def shingles(content: str) -> List[str]:
+    """Overlapping runs of SHINGLE_WORDS lowercase words of the content."""
+    words = _WORD.findall(content.lower())
+    return [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+
+
+def minhash(content: str) -> Optional[bytes]:
+    """
+    MinHash signature of the content's shingles.
+
+    Returns:
+        MINHASH_PERMUTATIONS 32-bit values, or None if the content has fewer than MIN_SHINGLES shingles
+    """
+    features = set(shingles(content))
+    if len(features) < MIN_SHINGLES:
+        return None
+    digests = b"".join(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest() for feature in features)
+    hashes = np.frombuffer(digests, dtype=">u8").astype(np.uint64)
+    # (a * x + b) mod 2^64, high 32 bits: one hash function per row, applied to every shingle
+    values = (_MULTIPLIERS[:, None] * hashes[None, :] + _OFFSETS[:, None]) >> np.uint64(32)
+    return values.min(axis=1).astype(">u4").tobytes()
+
+
+def similarity(signature: bytes, other: bytes) -> float:
+    """Estimated Jaccard similarity of the shingles of two chunks."""
+    return float(np.mean(np.frombuffer(signature, dtype=">u4") == np.frombuffer(other, dtype=">u4")))
+
+
+def band_buckets(signature: bytes) -> List[int]:
+    """Bucket of each band of a signature, as signed 64-bit integers (BIGINT)."""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(signature[band * _BAND_BYTES:(band + 1) * _BAND_BYTES], digest_size=8).digest(),
+            "big",
+            signed=True
+        )
+        for band in range(MINHASH_BANDS)
+    ]
@@ -0,0 +1,58 @@
+"""
+Splitting of files in worker processes of a bulk import.
+
+Kept apart from bulk_import so a spawned worker process only imports the
+splitter, not the API clients.
+"""
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+
+from app.API.Src.core.config import settings
+from app.API.Src.Document.documentSplitter.token_based_text_splitter import TextSplitter
+
+# One splitter (and tokenizer) per worker process, created by its first file
+_splitter: Optional[TextSplitter] = None
+
+
+def split_file(file_path: str, limit: int) -> List[Dict]:
+    """
+    Split a markdown file into chunks.
+
+    Runs in a worker process, so it returns the column values of each chunk
+    (content, tokens, headers, urls, images, document_metadata) instead of
+    Document objects.
+
+    Args:
+        file_path: File to split, UTF-8 encoded
+        limit: Maximum tokens per chunk
+
+    Returns:
+        Column values of the chunks, in file order
+    """
+    global _splitter
+    if _splitter is None:
+        _splitter = TextSplitter()
+    return asyncio.run(_split(_splitter, file_path, limit))
+
+
+async def _split(splitter: TextSplitter, file_path: str, limit: int) -> List[Dict]:
+    return [
+        {
+            "content": chunk.content,
+            "tokens": chunk.tokens,
+            "headers": chunk.headers,
+            "urls": chunk.urls,
+            "images": chunk.images,
+            "document_metadata": chunk.document_metadata
+        }
+        async for chunk in splitter.split_stream(_read_blocks(file_path), limit)
+    ]
+
+
+async def _read_blocks(file_path: str) -> AsyncIterator[str]:
+    with open(file_path, "r", encoding="utf-8") as file:
+        while True:
+            block = file.read(settings.INGESTION_READ_SIZE)
+            if not block:
+                return
+            yield block
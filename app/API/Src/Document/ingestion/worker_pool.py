@@ -0,0 +1,165 @@
+"""
+Background workers processing the ingestion_jobs queue.
+"""
+from pathlib import Path
+from itertools import count, islice
+from typing import Iterator, List, Optional
+from uuid import UUID
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.API.Src.core.config import settings
+from app.API.Src.core.database.Postgres.database import AsyncSessionLocal
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, client_registry
+from app.API.Src.Document.ingestion.document_ingestion import DocumentIngestionService
+from app.API.Src.Document.repository.document_repository import DocumentRepository
+from app.API.Src.Document.repository.ingestion_job_repository import IngestionJobRepository
+
+logger = logging.getLogger(__name__)
+
+
+def attempt_chunk_ids(job_id: UUID, attempt: int) -> Iterator[UUID]:
+    """
+    IDs of the new chunks of an attempt at a job, in file order.
+    
+    Derived from the job and attempt number, so the chunks stored by an
+    attempt that was interrupted are found again from its chunk count.
+    """
+    return (uuid.uuid5(job_id, f"{attempt}:{index}") for index in count())
+
+
+class IngestionWorkerPool:
+    """
+    Runs settings.INGESTION_WORKERS workers in the API process's event loop.
+    
+    Each worker claims a job from the queue table, ingests its file and
+    records the outcome, then claims the next one. Idle workers check the
+    queue every settings.INGESTION_POLL_INTERVAL seconds, or as soon as an
+    upload in this process calls notify().
+    """
+    
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal, clients: Optional[ClientRegistry] = None):
+        self.session_factory = session_factory
+        self.clients = clients or client_registry
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+    
+    async def start(self, concurrency: Optional[int] = None) -> None:
+        concurrency = concurrency or settings.INGESTION_WORKERS
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run_worker(i)) for i in range(concurrency)]
+        logger.info(f"Started {concurrency} ingestion workers")
+    
+    async def stop(self) -> None:
+        """Cancel the workers; a job interrupted here is taken over once it becomes stale."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Stopped ingestion workers")
+    
+    def notify(self) -> None:
+        """Wake idle workers after a job was queued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    async def _run_worker(self, index: int) -> None:
+        while True:
+            try:
+                if await self.process_next():
+                    continue
+            except Exception as e:
+                # Database unavailable and the like; keep the worker alive
+                logger.error(f"Ingestion worker {index} error: {str(e)}")
+            
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.INGESTION_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def process_next(self) -> bool:
+        """
+        Claim and process one job.
+        
+        Returns:
+            False if the queue had no job to claim
+        """
+        async with self.session_factory() as session:
+            jobs = IngestionJobRepository(session)
+            job = await jobs.claim_next()
+            if job is None:
+                return False
+            
+            logger.info(f"Processing ingestion job {job.id} ({job.source}), attempt {job.attempts}")
+            timings = {}
+            start = time.perf_counter()
+            keep_alive = asyncio.create_task(self._keep_alive(job.id))
+            try:
+                async with self.session_factory() as ingestion_session:
+                    if job.attempts > 1:
+                        # Parts stored by an attempt that was interrupted before it could clean up,
+                        # with the batch it may have been storing after its last progress
+                        interrupted = attempt_chunk_ids(job.id, job.attempts - 1)
+                        await DocumentRepository(
+                            ingestion_session,
+                            embedding_generator=self.clients.get_embedding_generator(),
+                            qdrant_repo=self.clients.get_qdrant_repository()
+                        ).delete_documents(list(islice(interrupted, job.chunks_done + settings.INGESTION_BATCH_SIZE)))
+                    
+                    service = DocumentIngestionService(ingestion_session, self.clients)
+                    document_ids = await service.ingest_file(
+                        Path(job.file_path),
+                        job.source,
+                        job.user_id,
+                        timings,
+                        on_progress=lambda chunks_done, chunks_total: jobs.record_progress(job, chunks_done, chunks_total),
+                        chunk_ids=attempt_chunk_ids(job.id, job.attempts)
+                    )
+                timings["total"] = round((time.perf_counter() - start) * 1000, 1)
+                await jobs.complete(job, document_ids, timings)
+            except Exception as e:
+                timings["total"] = round((time.perf_counter() - start) * 1000, 1)
+                logger.error(f"Error processing ingestion job {job.id}: {str(e)}")
+                await jobs.fail(job, str(e), timings)
+            else:
+                await self._remove_superseded_files(jobs, job)
+            finally:
+                keep_alive.cancel()
+            return True
+    
+    async def _keep_alive(self, job_id: UUID) -> None:
+        """
+        Refresh the heartbeat of a job every third of settings.INGESTION_STALE_AFTER,
+        so another worker does not take it over while no batch is stored, e.g.
+        while a re-upload is split whose chunks are all kept.
+        """
+        while True:
+            await asyncio.sleep(settings.INGESTION_STALE_AFTER / 3)
+            try:
+                async with self.session_factory() as session:
+                    await IngestionJobRepository(session).heartbeat([job_id])
+            except Exception as e:
+                logger.error(f"Error refreshing the heartbeat of ingestion job {job_id}: {str(e)}")
+    
+    @staticmethod
+    async def _remove_superseded_files(jobs: IngestionJobRepository, job) -> None:
+        """Delete the Corpus copies of earlier uploads of the file, whose chunks the job replaced."""
+        corpus_path = settings.corpus_absolute_path
+        for file_path in await jobs.superseded_files(job):
+            path = Path(file_path)
+            if corpus_path not in path.resolve().parents or not path.exists():
+                continue
+            try:
+                os.remove(path)
+                logger.info(f"Removed {path.name}, superseded by {Path(job.file_path).name}")
+            except OSError as e:
+                logger.warning(f"Could not remove superseded file {path.name}: {str(e)}")
+
+
+ingestion_workers = IngestionWorkerPool()
@@ -0,0 +1,6 @@
+-- Migration adding bulk imports to the ingestion queue table
+-- Run this script to update your existing database schema (init_db creates it on new databases)
+
+ALTER TABLE ingestion_jobs ADD COLUMN IF NOT EXISTS import_id UUID;
+
+CREATE INDEX IF NOT EXISTS ix_ingestion_jobs_import_id ON ingestion_jobs (import_id);
@@ -0,0 +1,14 @@
+-- Migration to add the content hash used to re-index a re-uploaded file incrementally
+-- Run this script to update your existing database schema
+-- Existing rows are hashed here (the same SHA-256 of the UTF-8 content as content_hash() in Python),
+-- so their unchanged chunks are kept on the next upload of their source
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+UPDATE documents SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex') WHERE content_hash IS NULL;
+
+-- Replaces the single-column source index; source filters use its leading column
+CREATE INDEX IF NOT EXISTS ix_documents_source_user_id ON documents (source, user_id);
+DROP INDEX IF EXISTS ix_documents_source;
+
+COMMENT ON COLUMN documents.content_hash IS 'SHA-256 of the content, to keep unchanged chunks when the source is uploaded again';
@@ -0,0 +1,23 @@
+-- Migration to add the deduplication index of chunks
+-- Run this script to update your existing database schema
+-- Existing rows stay canonical and have no MinHash signature (it is computed in Python at ingestion),
+-- so new chunks are linked to them only as exact copies (by content_hash)
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS canonical_id UUID;
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS minhash BYTEA;
+
+CREATE INDEX IF NOT EXISTS ix_documents_content_hash ON documents (content_hash);
+CREATE INDEX IF NOT EXISTS ix_documents_canonical_id ON documents (canonical_id);
+
+CREATE TABLE IF NOT EXISTS document_bands (
+    band SMALLINT NOT NULL,
+    bucket BIGINT NOT NULL,
+    document_id UUID NOT NULL,
+    PRIMARY KEY (band, bucket, document_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_document_bands_document_id ON document_bands (document_id);
+
+COMMENT ON COLUMN documents.canonical_id IS 'Chunk this one is an identical or near-identical copy of; copies have no vector point';
+COMMENT ON COLUMN documents.minhash IS 'MinHash signature of the word shingles of the content, to estimate the similarity of near-duplicates';
+COMMENT ON TABLE document_bands IS 'Locality-sensitive hashing buckets of the MinHash signatures of canonical chunks';
@@ -0,0 +1,13 @@
+-- Migration to add the columns used to scope retrieval to a source file or user
+-- Run this script to update your existing database schema
+-- Existing rows keep NULL; their Qdrant points have no source or user_id payload either,
+-- so scoped searches skip them until the documents are uploaded again
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS source VARCHAR(500);
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS user_id UUID;
+
+CREATE INDEX IF NOT EXISTS ix_documents_source ON documents (source);
+CREATE INDEX IF NOT EXISTS ix_documents_user_id ON documents (user_id);
+
+COMMENT ON COLUMN documents.source IS 'Name of the uploaded file the document was split from';
+COMMENT ON COLUMN documents.user_id IS 'User who uploaded the file';
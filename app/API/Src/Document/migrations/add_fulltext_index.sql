@@ -0,0 +1,5 @@
+-- Migration to add the full-text search index used by lexical and hybrid retrieval
+-- Run this script to update your existing database schema
+-- The text search configuration must match TEXT_SEARCH_CONFIG in models/Document.py
+
+CREATE INDEX IF NOT EXISTS ix_documents_content_fts ON documents USING GIN (to_tsvector('simple', content));
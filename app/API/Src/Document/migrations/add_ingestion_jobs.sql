@@ -0,0 +1,22 @@
+-- Migration to add the queue table of background document ingestion
+-- Run this script to update your existing database schema (init_db creates it on new databases)
+
+CREATE TABLE IF NOT EXISTS ingestion_jobs (
+    id UUID PRIMARY KEY,
+    status VARCHAR(20) NOT NULL,
+    file_path VARCHAR(500) NOT NULL,
+    source VARCHAR(500) NOT NULL,
+    user_id UUID,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    chunks_total INTEGER,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    document_ids JSON,
+    timings JSON,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS ix_ingestion_jobs_status_created_at ON ingestion_jobs (status, created_at);
@@ -0,0 +1,4 @@
+-- Migration to add the keyset pagination index to documents table
+-- Run this script to update your existing database schema
+
+CREATE INDEX IF NOT EXISTS ix_documents_created_at_id ON documents (created_at, id);
@@ -1,18 +1,33 @@
-from sqlalchemy import Column, String, DateTime, Text, Integer, JSON
+from sqlalchemy import Column, String, DateTime, Text, Integer, LargeBinary, JSON, Index, literal_column
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
+import hashlib
 import uuid
 from typing import Dict, List, Optional
 
 Base = declarative_base()
 
+# Text search configuration of lexical search and its index (see migrations/add_fulltext_index.sql).
+# "simple" does no stemming or stop words, so identifiers and error codes match as written.
+TEXT_SEARCH_CONFIG = "simple"
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 hex digest of a chunk's content; the same as sha256() of its UTF-8 bytes in PostgreSQL."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
 class Document(Base):
     __tablename__ = "documents"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     localisation = Column(String(500), nullable=False)  # File path in Corpus
+    source = Column(String(500), nullable=True)  # Name of the uploaded file the chunk comes from
+    user_id = Column(UUID(as_uuid=True), nullable=True)  # Owner of the uploaded file
     content = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # content_hash(content); matches unchanged chunks on re-upload
+    canonical_id = Column(UUID(as_uuid=True), nullable=True)  # Chunk this one is a copy of; copies have no vector point
+    minhash = Column(LargeBinary, nullable=True)  # MinHash signature of the content's shingles, None for short chunks
     tokens = Column(Integer, nullable=True)  # Number of tokens in document
     headers = Column(JSON, nullable=True)  # Extracted headers from document
     urls = Column(JSON, nullable=True)  # List of URLs found in document
@@ -21,6 +36,29 @@ class Document(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Keyset pagination order
+    __table_args__ = (
+        Index("ix_documents_created_at_id", "created_at", "id"),
+        # Scoping filters of lexical search, and the stored chunks of a source
+        # diffed against a new version of it
+        Index("ix_documents_source_user_id", "source", "user_id"),
+        Index("ix_documents_user_id", "user_id"),
+        # Exact copies of a new chunk, and the copies of a chunk
+        Index("ix_documents_content_hash", "content_hash"),
+        Index("ix_documents_canonical_id", "canonical_id"),
+        # Full-text search of lexical retrieval, PostgreSQL only
+        Index(
+            "ix_documents_content_fts",
+            func.to_tsvector(literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"), content),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+    
+    # Similarity score set by vector search (not persisted)
+    score = None
+    # Score set by the rerank stage (not persisted)
+    rerank_score = None
+    
     def __init__(self, content: str = None, metadata: Dict = None, **kwargs):
         """Initialize Document with content and metadata from text splitter."""
         if content is not None:
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, SmallInteger, BigInteger, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.API.Src.Document.models.document import Base
+
+class DocumentBand(Base):
+    """
+    One band of the MinHash signature of a canonical chunk (locality-sensitive hashing).
+    
+    Chunks whose signatures agree on all rows of a band land in the same
+    bucket, so the near-duplicates of a new chunk are looked up by its
+    buckets instead of comparing it with every stored chunk. Copies have no
+    bands: new chunks are only linked to canonical chunks.
+    """
+    __tablename__ = "document_bands"
+    
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)  # Hash of the band's rows of the signature
+    document_id = Column(UUID(as_uuid=True), primary_key=True)
+    
+    # Bands of deleted documents
+    __table_args__ = (
+        Index("ix_document_bands_document_id", "document_id"),
+    )
\ No newline at end of file
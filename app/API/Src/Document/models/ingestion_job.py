@@ -0,0 +1,48 @@
+from sqlalchemy import Column, String, DateTime, Text, Integer, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from app.API.Src.Document.models.document import Base
+
+# Job statuses, in lifecycle order
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+class IngestionJob(Base):
+    """
+    An uploaded file waiting for or going through ingestion (split, embed, store).
+    
+    The table is the queue: workers claim the oldest queued job with
+    SELECT ... FOR UPDATE SKIP LOCKED, so jobs survive restarts and several
+    API processes can share the work. Jobs of a bulk import (import_id set)
+    are left to the BulkImportService running that import.
+    """
+    __tablename__ = "ingestion_jobs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    import_id = Column(UUID(as_uuid=True), nullable=True)  # Bulk import the file belongs to
+    status = Column(String(20), nullable=False, default=JOB_QUEUED)
+    file_path = Column(String(500), nullable=False)  # Spooled upload in Corpus
+    source = Column(String(500), nullable=False)  # Name of the uploaded file
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    chunks_total = Column(Integer, nullable=True)  # Known once the whole file is split
+    chunks_done = Column(Integer, nullable=False, default=0)
+    document_ids = Column(JSON, nullable=True)  # Saved documents, in file order
+    timings = Column(JSON, nullable=True)  # Milliseconds per stage
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Last progress of the running attempt
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Queue order of claimable jobs
+    __table_args__ = (
+        Index("ix_ingestion_jobs_status_created_at", "status", "created_at"),
+        Index("ix_ingestion_jobs_import_id", "import_id"),
+    )
+    
+    def __repr__(self):
+        return f"<IngestionJob(id={self.id}, status={self.status}, source={self.source})>"
\ No newline at end of file
@@ -1,52 +1,69 @@
-from typing import Optional, List, Tuple
+from collections import defaultdict
+from typing import Any, Optional, List, Tuple, Dict
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from app.API.Src.Document.models.document import Document
+from sqlalchemy import select, func, insert, update, delete, literal_column, cast, and_, or_, Text
+from sqlalchemy.orm import load_only
+import json
+import uuid
+from app.API.Src.Document.models.document import Document, TEXT_SEARCH_CONFIG, content_hash
+from app.API.Src.Document.models.document_band import DocumentBand
+from app.API.Src.Document.ingestion.minhash import band_buckets
 from app.API.Src.core.ExternalApiHelper.OpenAI.embedding_generator import EmbeddingGenerator
-from app.API.Src.core.database.Qdrant.repository import QdrantRepository
+from app.API.Src.core.database.vector_store import VectorStore
 from app.API.Src.core.database.Qdrant.models import VectorDocument, VectorSearchQuery
+from app.API.Src.core.ExternalApiHelper.client_registry import client_registry
+from app.API.Src.core.database.Postgres.pagination import paginate, next_page, count_total
+from app.API.Src.Tools.Technical_anwer.response_cache import ResponseCache
+from app.API.Src.RAG.model.search_filters import SearchFilters
 import logging
 
 logger = logging.getLogger(__name__)
 
 class DocumentRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        embedding_generator: Optional[EmbeddingGenerator] = None,
+        qdrant_repo: Optional[VectorStore] = None,
+        response_cache: Optional[ResponseCache] = None
+    ):
         self.session = session
-        self.embedding_generator = EmbeddingGenerator()
-        self.qdrant_repo = QdrantRepository()
+        # Shared clients from the registry unless injected explicitly
+        self.embedding_generator = embedding_generator or client_registry.get_embedding_generator()
+        self.qdrant_repo = qdrant_repo or client_registry.get_qdrant_repository()
+        # Cached chat answers citing a changed or deleted document are dropped
+        self.response_cache = response_cache or client_registry.get_response_cache()
     
-    async def save_document(self, document: Document, file_path: str = None) -> Document:
+    async def save_document(self, document: Document, file_path: str = None, embedding: Optional[List[float]] = None) -> Document:
         """
         Save a Document object to both PostgreSQL and Qdrant databases.
         
         Args:
             document: Document object to save
             file_path: Original file path for vector storage metadata
+            embedding: Precomputed embedding of the content (generated if omitted)
             
         Returns:
             Saved Document object with updated ID and timestamps
         """
         try:
             # Save to PostgreSQL first
+            document.content_hash = document.content_hash or content_hash(document.content)
             self.session.add(document)
             await self.session.commit()
             await self.session.refresh(document)
             
-            # Generate embedding and save to Qdrant
-            embedding = await self.embedding_generator.generate_embedding(document.content)
-            
-            # Create summary from content (first 50 characters) - temporary solution, will be replaced with API summarization
-            summary = document.content[:50] + "..." if len(document.content) > 50 else document.content
+            # Generate embedding unless precomputed in a batch, then save to Qdrant
+            if embedding is None:
+                embedding = await self.embedding_generator.generate_embedding(document.content)
             
             # Create vector document for Qdrant
-            vector_doc = VectorDocument.from_document(
-                str(document.id),
-                summary
-            )
+            vector_doc = self._to_vector_document(document)
             
             # Save to Qdrant
             await self.qdrant_repo.upsert_document(vector_doc, embedding)
+            self._invalidate_answers([document.id])
             
             logger.info(f"Successfully saved document {document.id} to both PostgreSQL and Qdrant")
             return document
@@ -57,27 +74,305 @@ class DocumentRepository:
             logger.error(f"Error saving document: {str(e)}")
             raise
     
+    async def save_documents(
+        self,
+        documents: List[Document],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> List[Document]:
+        """
+        Save many Document objects to PostgreSQL and Qdrant as one unit.
+        
+        All rows are inserted in one transaction with a single bulk INSERT ... RETURNING,
+        then the vectors are upserted to Qdrant in batches before the transaction commits.
+        If the vector write fails the transaction is rolled back and any points already
+        written are deleted, so both stores keep the same documents.
+        
+        Copies linked to a canonical chunk (canonical_id, see ChunkDeduplicator) are
+        stored without a vector point; the point of their canonical chunk is given the
+        sources and headers of the whole group.
+        
+        Args:
+            documents: Document objects to save
+            embeddings: Precomputed embeddings, one per document that is not a copy (generated if omitted)
+            
+        Returns:
+            Saved Document objects with IDs and timestamps, in input order
+        """
+        if not documents:
+            return []
+        
+        canonical = [document for document in documents if document.canonical_id is None]
+        if embeddings is None:
+            embeddings = await self.embedding_generator.generate_embeddings(
+                [document.content for document in canonical]
+            ) if canonical else []
+        if len(embeddings) != len(canonical):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(canonical)} canonical documents")
+        
+        vector_ids: List[str] = []
+        try:
+            # Insert all rows without committing, RETURNING the server-generated columns
+            rows = [self._to_row(document) for document in documents]
+            result = await self.session.scalars(insert(Document).returning(Document), rows)
+            saved_by_id = {document.id: document for document in result.all()}
+            saved_documents = [saved_by_id[row["id"]] for row in rows]
+            await self._insert_bands(saved_documents)
+            
+            # Canonical chunks, new or stored, that got copies in this batch
+            groups = await self._group_payloads(
+                list({document.canonical_id for document in saved_documents if document.canonical_id is not None})
+            )
+            vector_docs = [
+                self._to_vector_document(document, groups.pop(document.id, None))
+                for document in saved_documents if document.canonical_id is None
+            ]
+            vector_ids = [vector_doc.id for vector_doc in vector_docs]
+            if vector_docs and not await self.qdrant_repo.upsert_documents(vector_docs, embeddings):
+                raise RuntimeError(f"Failed to store vectors of {len(vector_docs)} documents in Qdrant")
+            if groups and not await self.qdrant_repo.update_payloads({str(key): value for key, value in groups.items()}):
+                raise RuntimeError(f"Failed to update the payload of {len(groups)} documents in Qdrant")
+            
+            await self.session.commit()
+            self._invalidate_answers([document.id for document in saved_documents])
+            logger.info(f"Successfully saved {len(saved_documents)} documents to both PostgreSQL and Qdrant")
+            return saved_documents
+            
+        except Exception as e:
+            # Undo both stores: the rows were never committed, the points may be partially written
+            await self.session.rollback()
+            if vector_ids:
+                await self.qdrant_repo.delete_documents(vector_ids)
+            logger.error(f"Error saving {len(documents)} documents: {str(e)}")
+            raise
+    
+    async def _insert_bands(self, documents: List[Document]) -> None:
+        """Index the MinHash buckets of canonical chunks, where new chunks look for near-duplicates."""
+        rows = [
+            {"band": band, "bucket": bucket, "document_id": document.id}
+            for document in documents if document.canonical_id is None and document.minhash is not None
+            for band, bucket in enumerate(band_buckets(document.minhash))
+        ]
+        if rows:
+            await self.session.execute(insert(DocumentBand), rows)
+    
+    def _invalidate_answers(self, document_ids: List[UUID]) -> None:
+        if self.response_cache is not None:
+            self.response_cache.invalidate_documents(document_ids)
+    
+    @staticmethod
+    def _to_row(document: Document) -> dict:
+        """Column values of a transient Document for a bulk insert."""
+        return {
+            "id": document.id or uuid.uuid4(),
+            "localisation": document.localisation,
+            "source": document.source,
+            "user_id": document.user_id,
+            "content": document.content,
+            "content_hash": document.content_hash or content_hash(document.content),
+            "canonical_id": document.canonical_id,
+            "minhash": document.minhash,
+            "tokens": document.tokens,
+            "headers": document.headers,
+            "urls": document.urls,
+            "images": document.images,
+            "document_metadata": document.document_metadata
+        }
+    
+    @staticmethod
+    def _to_vector_document(document: Document, group: Optional[Dict[str, Any]] = None) -> VectorDocument:
+        # Create summary from content (first 50 characters) - temporary solution, will be replaced with API summarization
+        summary = document.content[:50] + "..." if len(document.content) > 50 else document.content
+        # Filterable fields, indexed in Qdrant (see QdrantRepository.PAYLOAD_INDEXES);
+        # a canonical chunk with copies has the source and headers of its group
+        group = group or {"source": document.source, "headers": DocumentRepository._header_path(document.headers)}
+        return VectorDocument.from_document(
+            str(document.id),
+            summary,
+            user_id=str(document.user_id) if document.user_id else None,
+            tokens=document.tokens,
+            **group
+        )
+    
+    async def _group_payloads(self, canonical_ids: List[UUID]) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Payload source and headers of canonical chunks: those of the chunk and all its copies.
+        
+        The source is a list when the group spans several files; Qdrant matches a
+        filter value against any element of a list.
+        """
+        if not canonical_ids:
+            return {}
+        result = await self.session.execute(
+            select(Document.id, Document.canonical_id, Document.source, Document.headers)
+            .where(or_(Document.id.in_(canonical_ids), Document.canonical_id.in_(canonical_ids)))
+            .order_by(Document.canonical_id.is_not(None), Document.created_at, Document.id)
+        )
+        sources: Dict[UUID, List[str]] = defaultdict(list)
+        headers: Dict[UUID, List[str]] = defaultdict(list)
+        for row in result:
+            group = row.canonical_id or row.id
+            if row.source is not None and row.source not in sources[group]:
+                sources[group].append(row.source)
+            headers[group].extend(header for header in self._header_path(row.headers) if header not in headers[group])
+        return {
+            group: {
+                "source": sources[group][0] if len(sources[group]) == 1 else sources[group] or None,
+                "headers": headers[group]
+            }
+            for group in headers
+        }
+    
+    @staticmethod
+    def _header_path(headers: Optional[Dict[str, List[str]]]) -> List[str]:
+        """Headers the document is under, outermost (h1) first."""
+        return [header for level in sorted(headers or {}) for header in headers[level]]
+    
+    @staticmethod
+    def _filter_clauses(filters: Optional[SearchFilters]) -> list:
+        """SQL conditions matching the documents a vector search with the same filters finds."""
+        if filters is None:
+            return []
+        clauses = []
+        if filters.sources:
+            clauses.append(Document.source.in_(filters.sources))
+        if filters.user_id:
+            clauses.append(Document.user_id == filters.user_id)
+        if filters.headers:
+            # Headers are stored as JSON lists of strings, matched as quoted JSON strings
+            header_text = cast(Document.headers, Text)
+            clauses.append(or_(*(header_text.contains(json.dumps(header), autoescape=True) for header in filters.headers)))
+        if filters.min_tokens is not None:
+            clauses.append(Document.tokens >= filters.min_tokens)
+        if filters.max_tokens is not None:
+            clauses.append(Document.tokens <= filters.max_tokens)
+        return clauses
+    
     async def get_document_by_id(self, document_id: UUID) -> Optional[Document]:
         result = await self.session.execute(
             select(Document).where(Document.id == document_id)
         )
         return result.scalar_one_or_none()
     
-    async def get_documents_paginated(self, limit: int = 100, offset: int = 0) -> Tuple[List[Document], int]:
-        # Get total count
-        count_result = await self.session.execute(
-            select(func.count(Document.id))
+    async def get_documents_by_ids(self, document_ids: List[UUID]) -> List[Document]:
+        """
+        Load many documents with a single query.
+        
+        Args:
+            document_ids: IDs of documents to load
+            
+        Returns:
+            Found documents in the order of document_ids (missing IDs are skipped)
+        """
+        if not document_ids:
+            return []
+        
+        result = await self.session.execute(
+            select(Document).where(Document.id.in_(document_ids))
         )
-        total = count_result.scalar()
+        documents_by_id = {document.id: document for document in result.scalars().all()}
+        return [documents_by_id[document_id] for document_id in document_ids if document_id in documents_by_id]
+    
+    async def get_documents_by_sources(self, sources: List[str], user_id: Optional[UUID] = None) -> List[Document]:
+        """
+        Load the stored chunks of source files with a single query.
         
-        # Get paginated results
+        Args:
+            sources: Source names (uploaded file names or paths within an import)
+            user_id: Owner of the files; None loads the chunks without an owner
+            
+        Returns:
+            Documents ordered by source and localisation (part number)
+        """
+        if not sources:
+            return []
+        
+        owner = Document.user_id == user_id if user_id is not None else Document.user_id.is_(None)
         result = await self.session.execute(
             select(Document)
-            .order_by(Document.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+            .where(Document.source.in_(sources), owner)
+            .order_by(Document.source, Document.localisation)
+        )
+        return list(result.scalars().all())
+    
+    async def find_canonical_documents(
+        self,
+        content_hashes: List[str],
+        buckets: Optional[List[List[int]]],
+        user_id: Optional[UUID] = None
+    ) -> List[Document]:
+        """
+        Load the canonical chunks new chunks may copy, with a single query.
+        
+        Only the fingerprint columns (content_hash, minhash) are loaded.
+        
+        Args:
+            content_hashes: Content hashes of the new chunks
+            buckets: MinHash buckets of the new chunks, per band; None finds exact copies only
+            user_id: Owner of the new chunks; None looks in the chunks without an owner
+            
+        Returns:
+            Canonical documents with one of the hashes or buckets, oldest first
+        """
+        matches = [Document.content_hash.in_(set(content_hashes))] if content_hashes else []
+        band_matches = [
+            and_(DocumentBand.band == band, DocumentBand.bucket.in_(set(values)))
+            for band, values in enumerate(buckets or []) if values
+        ]
+        if band_matches:
+            matches.append(Document.id.in_(select(DocumentBand.document_id).where(or_(*band_matches))))
+        if not matches:
+            return []
+        
+        owner = Document.user_id == user_id if user_id is not None else Document.user_id.is_(None)
+        result = await self.session.execute(
+            select(Document)
+            .options(load_only(Document.content_hash, Document.minhash))
+            .where(Document.canonical_id.is_(None), owner, or_(*matches))
+            .order_by(Document.created_at, Document.id)
+        )
+        return list(result.scalars().all())
+    
+    async def update_localisations(self, localisations: Dict[UUID, str]) -> None:
+        """Rename kept chunks (their part number in a new version of the file) with one bulk UPDATE."""
+        if not localisations:
+            return
+        try:
+            await self.session.execute(
+                update(Document),
+                [{"id": document_id, "localisation": localisation} for document_id, localisation in localisations.items()]
+            )
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error renaming {len(localisations)} documents: {str(e)}")
+            raise
+    
+    async def get_documents_paginated(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> Tuple[List[Document], Optional[int], Optional[str]]:
+        """
+        Get a page of documents, newest first.
+        
+        Args:
+            limit: Page size
+            offset: Legacy offset, ignored when a cursor is given
+            cursor: next_cursor of the previous page
+            total_mode: "exact", "estimated" or "none"
+            
+        Returns:
+            Tuple of (documents, total or None, cursor of the next page or None)
+        """
+        total = await count_total(self.session, Document, total_mode=total_mode)
+        
+        result = await self.session.execute(
+            paginate(select(Document), Document, limit, cursor=cursor, offset=offset)
         )
-        return result.scalars().all(), total
+        documents, next_cursor = next_page(result.scalars().all(), limit)
+        return documents, total, next_cursor
     
     async def search_documents_by_vector(self, prompt: str, count: int, score_threshold: Optional[float] = None) -> List[Document]:
         """
@@ -89,56 +384,141 @@ class DocumentRepository:
             score_threshold: Minimum similarity threshold (optional)
             
         Returns:
-            List of documents sorted by similarity
+            List of documents sorted by similarity, each with its `score` set
         """
         try:
-            # 1. Generate embedding from prompt
-            query_embedding = await self.embedding_generator.generate_embedding(prompt)
-            logger.info(f"Generated embedding for search prompt: '{prompt[:50]}...'")
-            
-            # 2. Prepare query for Qdrant
-            search_query = VectorSearchQuery(
-                query_vector=query_embedding,
-                limit=count,
-                score_threshold=score_threshold
-            )
-            
-            # 3. Execute search in Qdrant
-            search_results = await self.qdrant_repo.search_similar(search_query)
-            logger.info(f"Found {len(search_results)} results from Qdrant search")
-            
-            if not search_results:
+            scores = await self.search_document_scores_by_vector(prompt, count, score_threshold)
+            if not scores:
                 logger.info("No results found in vector search")
                 return []
             
-            # 4. Retrieve full documents from PostgreSQL
-            documents = []
-            for result in search_results:
-                try:
-                    # Convert ID from string to UUID
-                    document_id = UUID(result.id)
-                    document = await self.get_document_by_id(document_id)
-                    
-                    if document:
-                        documents.append(document)
-                        logger.debug(f"Retrieved document {document_id} with score {result.score}")
-                    else:
-                        logger.warning(f"Document {document_id} not found in PostgreSQL")
-                        
-                except ValueError as e:
-                    logger.error(f"Invalid UUID format for document ID {result.id}: {e}")
-                    continue
-                except Exception as e:
-                    logger.error(f"Error retrieving document {result.id}: {e}")
-                    continue
-            
-            logger.info(f"Successfully retrieved {len(documents)} documents for search query")
-            return documents
+            return await self.get_scored_documents(scores)
             
         except Exception as e:
             logger.error(f"Error in vector search for prompt '{prompt}': {str(e)}")
             return []
     
+    async def search_document_scores_by_vector(
+        self,
+        prompt: str,
+        count: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[UUID, float]:
+        """
+        Find the IDs of the most similar documents without touching PostgreSQL.
+        
+        Only the embedding API and Qdrant are called, so this can run while the
+        session is used by another query.
+        
+        Args:
+            prompt: Query text to generate embedding
+            count: Maximum number of results to return
+            score_threshold: Minimum similarity threshold (optional)
+            filters: Scope of the search, applied by Qdrant with its payload indexes (optional)
+            
+        Returns:
+            Document IDs mapped to similarity scores, best match first
+        """
+        # 1. Generate embedding from prompt
+        query_embedding = await self.embedding_generator.generate_embedding(prompt)
+        logger.info(f"Generated embedding for search prompt: '{prompt[:50]}...'")
+        
+        # 2. Prepare query for Qdrant
+        search_query = VectorSearchQuery(
+            query_vector=query_embedding,
+            limit=count,
+            score_threshold=score_threshold,
+            filter_conditions=filters.to_vector_filter() if filters else None
+        )
+        
+        # 3. Execute search in Qdrant
+        search_results = await self.qdrant_repo.search_similar(search_query)
+        logger.info(f"Found {len(search_results)} results from Qdrant search")
+        
+        scores: Dict[UUID, float] = {}
+        for result in search_results:
+            try:
+                # Convert ID from string to UUID
+                scores[UUID(result.id)] = result.score
+            except ValueError as e:
+                logger.error(f"Invalid UUID format for document ID {result.id}: {e}")
+        return scores
+    
+    async def search_document_scores_by_text(
+        self,
+        prompt: str,
+        count: int,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[UUID, float]:
+        """
+        Find the documents whose content best matches the words of the prompt.
+        
+        Uses PostgreSQL full-text search: the prompt is parsed with
+        websearch_to_tsquery (so "quoted phrases", OR and -exclusions work)
+        and matches are ranked with ts_rank_cd.
+        
+        Args:
+            prompt: Query text
+            count: Maximum number of results to return
+            filters: Scope of the search (optional)
+            
+        Returns:
+            Document IDs mapped to text search ranks, best match first
+        """
+        config = literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+        document_vector = func.to_tsvector(config, Document.content)
+        query = func.websearch_to_tsquery(config, prompt)
+        rank = func.ts_rank_cd(document_vector, query)
+        
+        # In a savepoint, so a failed search does not abort the transaction used to load the results
+        async with self.session.begin_nested():
+            result = await self.session.execute(
+                select(Document.id, rank.label("rank"))
+                .where(document_vector.op("@@")(query), *self._filter_clauses(filters))
+                .order_by(rank.desc(), Document.id)
+                .limit(count)
+            )
+            scores = {row.id: float(row.rank) for row in result}
+        logger.info(f"Found {len(scores)} results from full-text search")
+        return scores
+    
+    async def get_scored_documents(self, scores: Dict[UUID, float]) -> List[Document]:
+        """
+        Load documents found by a vector search in one query, keeping score order.
+        
+        Args:
+            scores: Document IDs mapped to similarity scores, best match first
+            
+        Copies of the same canonical chunk are collapsed into the best-scored one,
+        so the same text is not put into a prompt twice.
+        
+        Returns:
+            Found documents, each with its `score` set
+        """
+        documents = await self.get_documents_by_ids(list(scores))
+        for document in documents:
+            document.score = scores[document.id]
+            logger.debug(f"Retrieved document {document.id} with score {document.score}")
+        
+        if len(documents) < len(scores):
+            missing = set(scores) - {document.id for document in documents}
+            logger.warning(f"Documents {[str(document_id) for document_id in missing]} not found in PostgreSQL")
+        
+        groups = set()
+        unique = []
+        for document in documents:
+            group = document.canonical_id or document.id
+            if group not in groups:
+                groups.add(group)
+                unique.append(document)
+        if len(unique) < len(documents):
+            logger.info(f"Collapsed {len(documents) - len(unique)} duplicates of retrieved documents")
+        documents = unique
+        
+        logger.info(f"Successfully retrieved {len(documents)} documents for search query")
+        return documents
+    
     async def delete_document(self, document_id: UUID) -> bool:
         """
         Delete document from both databases: PostgreSQL and Qdrant.
@@ -156,17 +536,8 @@ class DocumentRepository:
                 logger.warning(f"Document {document_id} not found in PostgreSQL")
                 return False
             
-            # 2. Delete from Qdrant
-            try:
-                await self.qdrant_repo.delete_document(str(document_id))
-                logger.info(f"Successfully deleted document {document_id} from Qdrant")
-            except Exception as e:
-                logger.error(f"Error deleting document {document_id} from Qdrant: {str(e)}")
-                # Continue with PostgreSQL deletion even if Qdrant fails
-            
-            # 3. Delete from PostgreSQL
-            await self.session.delete(document)
-            await self.session.commit()
+            # 2. Delete from both databases, keeping its copies (see delete_documents)
+            await self.delete_documents([document_id])
             
             logger.info(f"Successfully deleted document {document_id} from both databases")
             return True
@@ -175,4 +546,85 @@ class DocumentRepository:
             # Rollback PostgreSQL transaction in case of error
             await self.session.rollback()
             logger.error(f"Error deleting document {document_id}: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    async def delete_documents(self, document_ids: List[UUID]) -> int:
+        """
+        Delete many documents from both databases with one request to each.
+        
+        Copies of a deleted canonical chunk are kept: the oldest one becomes
+        canonical, is embedded and gets a vector point, and the others are linked
+        to it. Canonical chunks that lost copies get the payload of their
+        remaining group.
+        
+        Args:
+            document_ids: UUIDs of documents to delete
+            
+        Returns:
+            Number of documents deleted from PostgreSQL
+        """
+        if not document_ids:
+            return 0
+        vector_ids: List[str] = []
+        try:
+            deleted = set(document_ids)
+            copies = (await self.session.scalars(
+                select(Document)
+                .where(Document.canonical_id.in_(document_ids), Document.id.not_in(document_ids))
+                .order_by(Document.created_at, Document.id)
+            )).all()
+            shrunk = set((await self.session.scalars(
+                select(Document.canonical_id).where(Document.id.in_(document_ids), Document.canonical_id.is_not(None))
+            )).all()) - deleted
+            
+            result = await self.session.execute(delete(Document).where(Document.id.in_(document_ids)))
+            await self.session.execute(delete(DocumentBand).where(DocumentBand.document_id.in_(document_ids)))
+            await self._promote_copies(copies, vector_ids)
+            groups = await self._group_payloads(list(shrunk))
+            if groups and not await self.qdrant_repo.update_payloads({str(key): value for key, value in groups.items()}):
+                logger.error(f"Error updating the payload of {len(groups)} documents in Qdrant")
+            
+            if not await self.qdrant_repo.delete_documents([str(document_id) for document_id in document_ids]):
+                logger.error(f"Error deleting {len(document_ids)} documents from Qdrant")
+            await self.session.commit()
+            self._invalidate_answers(document_ids)
+            
+            logger.info(f"Deleted {result.rowcount} documents from both databases")
+            return result.rowcount
+            
+        except Exception as e:
+            await self.session.rollback()
+            if vector_ids:
+                await self.qdrant_repo.delete_documents(vector_ids)
+            logger.error(f"Error deleting {len(document_ids)} documents: {str(e)}")
+            raise
+    
+    async def _promote_copies(self, copies: List[Document], vector_ids: List[str]) -> None:
+        """
+        Make the oldest copy of each deleted canonical chunk canonical and link the other copies to it.
+        
+        Args:
+            copies: Remaining copies of deleted canonical chunks, oldest first
+            vector_ids: Collects the IDs of the vector points written for the promoted copies
+        """
+        if not copies:
+            return
+        groups: Dict[UUID, List[Document]] = defaultdict(list)
+        for copy in copies:
+            groups[copy.canonical_id].append(copy)
+        promoted = []
+        for members in groups.values():
+            members[0].canonical_id = None
+            for member in members[1:]:
+                member.canonical_id = members[0].id
+            promoted.append(members[0])
+        await self.session.flush()
+        await self._insert_bands(promoted)
+        
+        embeddings = await self.embedding_generator.generate_embeddings([document.content for document in promoted])
+        payloads = await self._group_payloads([document.id for document in promoted])
+        vector_docs = [self._to_vector_document(document, payloads.get(document.id)) for document in promoted]
+        vector_ids.extend(vector_doc.id for vector_doc in vector_docs)
+        if not await self.qdrant_repo.upsert_documents(vector_docs, embeddings):
+            raise RuntimeError(f"Failed to store vectors of {len(vector_docs)} promoted documents in Qdrant")
+        logger.info(f"Promoted {len(promoted)} copies of deleted documents to canonical")
\ No newline at end of file
@@ -0,0 +1,373 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import select, update, or_, and_, func, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.API.Src.core.config import settings
+from app.API.Src.Document.models.ingestion_job import IngestionJob, JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED
+import logging
+
+logger = logging.getLogger(__name__)
+
+class IngestionJobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def enqueue(self, file_path: str, source: str, user_id: Optional[UUID] = None) -> IngestionJob:
+        """
+        Add a queued job for a file spooled to Corpus.
+        
+        Args:
+            file_path: Path of the stored upload
+            source: Name of the uploaded file
+            user_id: Owner of the file (optional)
+            
+        Returns:
+            Saved job with its ID
+        """
+        job = IngestionJob(status=JOB_QUEUED, file_path=file_path, source=source, user_id=user_id, attempts=0, chunks_done=0)
+        self.session.add(job)
+        await self.session.commit()
+        await self.session.refresh(job)
+        logger.info(f"Queued ingestion job {job.id} for {source}")
+        return job
+    
+    async def get_job(self, job_id: UUID) -> Optional[IngestionJob]:
+        result = await self.session.execute(
+            select(IngestionJob).where(IngestionJob.id == job_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def claim_next(self) -> Optional[IngestionJob]:
+        """
+        Take the oldest queued job and mark it running.
+        
+        Rows locked by another worker are skipped (FOR UPDATE SKIP LOCKED), so
+        concurrent workers, also in other processes, never claim the same job.
+        A running job without progress for settings.INGESTION_STALE_AFTER
+        seconds belongs to a worker that died, e.g. in a restart, and is
+        claimed again. Jobs of bulk imports are not claimed, nor a job whose
+        source and owner has another job running, since a new version of a
+        file is diffed against the chunks the other one is replacing; claims
+        of the same source and owner are serialized (see _lock_sources), so
+        two workers never both take a version of a file.
+        
+        Returns:
+            The claimed job, or None if there is nothing to do
+        """
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=settings.INGESTION_STALE_AFTER)
+        while True:
+            job = await self._next_job(stale_before)
+            if job is None:
+                # End the transaction instead of keeping it open while idle
+                await self.session.commit()
+                return None
+            await self._lock_sources([job])
+            busy = await self._busy_sources([job.source], stale_before, IngestionJob.id != job.id)
+            if (job.source, job.user_id) not in busy:
+                break
+            # Another worker claimed a version of the file meanwhile; the next query skips it
+            await self.session.commit()
+        
+        if job.status == JOB_RUNNING:
+            logger.warning(f"Taking over ingestion job {job.id} without progress since {job.heartbeat_at}")
+        job.status = JOB_RUNNING
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        job.error = None
+        await self.session.commit()
+        return job
+    
+    async def _next_job(self, stale_before: datetime) -> Optional[IngestionJob]:
+        """The oldest claimable upload job, locked until the transaction ends."""
+        running = aliased(IngestionJob)
+        result = await self.session.execute(
+            select(IngestionJob)
+            .where(
+                IngestionJob.import_id.is_(None),
+                or_(
+                    IngestionJob.status == JOB_QUEUED,
+                    and_(IngestionJob.status == JOB_RUNNING, IngestionJob.heartbeat_at < stale_before)
+                ),
+                ~exists().where(
+                    running.status == JOB_RUNNING,
+                    running.heartbeat_at >= stale_before,
+                    running.source == IngestionJob.source,
+                    running.user_id.is_not_distinct_from(IngestionJob.user_id)
+                )
+            )
+            .order_by(IngestionJob.created_at, IngestionJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalar_one_or_none()
+    
+    async def _lock_sources(self, jobs: List[IngestionJob]) -> None:
+        """
+        Serialize the claims of the jobs' sources and owners until the transaction ends.
+        
+        The NOT EXISTS of a claim does not see a job of the same file that a
+        concurrent transaction is claiming (READ COMMITTED), so claims take a
+        transaction-level advisory lock per source and owner, in a fixed
+        order, and check again for a running job once they hold it. Other
+        databases (SQLite in tests) run one write transaction at a time.
+        """
+        if self.session.bind.dialect.name != "postgresql":
+            return
+        for key in sorted({f"{job.user_id}:{job.source}" for job in jobs}):
+            await self.session.execute(select(func.pg_advisory_xact_lock(func.hashtext(key))))
+    
+    async def _busy_sources(self, sources: List[str], stale_before: datetime, *exclude) -> Set[Tuple[str, Optional[UUID]]]:
+        """(source, owner) among the sources with a job running, other than the excluded ones."""
+        result = await self.session.execute(
+            select(IngestionJob.source, IngestionJob.user_id)
+            .where(
+                IngestionJob.source.in_(sources),
+                IngestionJob.status == JOB_RUNNING,
+                IngestionJob.heartbeat_at >= stale_before,
+                *exclude
+            )
+        )
+        return {(source, user_id) for source, user_id in result.all()}
+    
+    async def record_progress(self, job: IngestionJob, chunks_done: int, chunks_total: Optional[int]) -> None:
+        """
+        Store the number of new chunks saved so far; also the heartbeat of the running attempt.
+        
+        Only counts are written, so the update does not grow with the file;
+        the IDs are stored once the job is done (the IDs of an interrupted
+        attempt are derived from the job, see attempt_chunk_ids).
+        """
+        job.chunks_done = chunks_done
+        job.chunks_total = chunks_total
+        job.heartbeat_at = datetime.now(timezone.utc)
+        await self.session.commit()
+    
+    async def complete(self, job: IngestionJob, document_ids: List[UUID], timings: Dict[str, float]) -> None:
+        job.status = JOB_DONE
+        job.document_ids = [str(document_id) for document_id in document_ids]
+        job.chunks_done = len(document_ids)
+        job.chunks_total = len(document_ids)
+        job.timings = timings
+        job.finished_at = datetime.now(timezone.utc)
+        await self.session.commit()
+        logger.info(f"Ingestion job {job.id} done: {len(document_ids)} parts")
+    
+    async def superseded_files(self, job: IngestionJob) -> List[str]:
+        """
+        Files of the earlier uploads of a job's source and owner, replaced by
+        the job's version once it is done.
+        """
+        result = await self.session.execute(
+            select(IngestionJob.file_path)
+            .where(
+                IngestionJob.import_id.is_(None),
+                IngestionJob.status == JOB_DONE,
+                IngestionJob.source == job.source,
+                IngestionJob.user_id.is_not_distinct_from(job.user_id),
+                IngestionJob.created_at < job.created_at,
+                IngestionJob.file_path != job.file_path
+            )
+        )
+        return list(result.scalars().all())
+    
+    async def fail(self, job: IngestionJob, error: str, timings: Dict[str, float]) -> None:
+        """
+        Record a failed attempt; the job is queued again until it has used
+        settings.INGESTION_MAX_ATTEMPTS attempts.
+        """
+        job.error = error
+        job.timings = timings
+        job.document_ids = None
+        job.chunks_done = 0
+        if job.attempts < settings.INGESTION_MAX_ATTEMPTS:
+            job.status = JOB_QUEUED
+            logger.warning(f"Ingestion job {job.id} attempt {job.attempts} failed, queued again: {error}")
+        else:
+            job.status = JOB_FAILED
+            job.finished_at = datetime.now(timezone.utc)
+            logger.error(f"Ingestion job {job.id} failed after {job.attempts} attempts: {error}")
+        await self.session.commit()
+    
+    async def enqueue_import(self, import_id: UUID, files: List[Tuple[str, str]], user_id: Optional[UUID] = None) -> int:
+        """
+        Add a queued job per file of a bulk import, in one transaction.
+        
+        Args:
+            import_id: ID of the bulk import
+            files: (file_path, source) of each file
+            user_id: Owner of the files (optional)
+            
+        Returns:
+            Number of jobs added
+        """
+        self.session.add_all([
+            IngestionJob(
+                import_id=import_id,
+                status=JOB_QUEUED,
+                file_path=file_path,
+                source=source,
+                user_id=user_id,
+                attempts=0,
+                chunks_done=0
+            )
+            for file_path, source in files
+        ])
+        await self.session.commit()
+        logger.info(f"Queued {len(files)} files of bulk import {import_id}")
+        return len(files)
+    
+    async def claim_import(self, import_id: UUID) -> List[IngestionJob]:
+        """
+        Take the jobs of a bulk import that are not done and mark them running.
+        
+        Queued and failed jobs are taken, and running ones without progress
+        for settings.INGESTION_STALE_AFTER seconds, left by an interrupted
+        run; so a second run of the same import resumes where the first one
+        stopped and two concurrent runs never take the same job. Files with
+        an upload of the same source and owner running are left queued for
+        a later run (see _lock_sources).
+        
+        Returns:
+            Claimed jobs in queue order
+        """
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=settings.INGESTION_STALE_AFTER)
+        result = await self.session.execute(
+            select(IngestionJob)
+            .where(
+                IngestionJob.import_id == import_id,
+                or_(
+                    IngestionJob.status.in_([JOB_QUEUED, JOB_FAILED]),
+                    and_(IngestionJob.status == JOB_RUNNING, IngestionJob.heartbeat_at < stale_before)
+                )
+            )
+            .order_by(IngestionJob.created_at, IngestionJob.id)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = list(result.scalars().all())
+        if jobs:
+            await self._lock_sources(jobs)
+            busy = await self._busy_sources(
+                [job.source for job in jobs], stale_before, IngestionJob.import_id.is_distinct_from(import_id)
+            )
+            if busy:
+                logger.warning(f"Leaving {len(busy)} files of bulk import {import_id} queued while their upload is ingested")
+                jobs = [job for job in jobs if (job.source, job.user_id) not in busy]
+        for job in jobs:
+            job.status = JOB_RUNNING
+            job.attempts += 1
+            job.started_at = now
+            job.heartbeat_at = now
+            job.error = None
+            job.finished_at = None
+        await self.session.commit()
+        return jobs
+    
+    async def record_batch(self, jobs: List[IngestionJob], document_ids: List[List[UUID]]) -> None:
+        """
+        Store the IDs of the new chunks of jobs about to be saved, in one commit.
+        
+        Written before the documents, so a run interrupted while saving them
+        leaves the IDs to delete on the next attempt.
+        """
+        now = datetime.now(timezone.utc)
+        for job, ids in zip(jobs, document_ids):
+            job.document_ids = [str(document_id) for document_id in ids]
+            job.heartbeat_at = now
+        await self.session.commit()
+    
+    async def heartbeat(self, job_ids: List[UUID]) -> None:
+        """
+        Refresh the heartbeat of the jobs still running among the given ones.
+        
+        A bulk import run marks all its files running when it claims them, so
+        the files waiting for their batch need it as well as the stored ones.
+        """
+        await self.session.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id.in_(job_ids), IngestionJob.status == JOB_RUNNING)
+            .values(heartbeat_at=datetime.now(timezone.utc))
+        )
+        await self.session.commit()
+    
+    async def complete_batch(self, jobs: List[IngestionJob], document_ids: List[List[UUID]], timings: Dict[str, float]) -> None:
+        """Mark jobs done with the documents of their files (kept and new, in file order), in one commit."""
+        now = datetime.now(timezone.utc)
+        for job, ids in zip(jobs, document_ids):
+            job.status = JOB_DONE
+            job.document_ids = [str(document_id) for document_id in ids]
+            job.chunks_total = len(ids)
+            job.chunks_done = len(ids)
+            job.timings = timings
+            job.finished_at = now
+        await self.session.commit()
+    
+    async def fail_batch(self, jobs: List[IngestionJob], error: str, timings: Dict[str, float]) -> None:
+        """
+        Mark jobs of a bulk import failed, in one commit.
+        
+        They are not queued again; running the import again retries them.
+        """
+        now = datetime.now(timezone.utc)
+        for job in jobs:
+            job.status = JOB_FAILED
+            job.error = error
+            job.timings = timings
+            job.document_ids = None
+            job.chunks_done = 0
+            job.finished_at = now
+        await self.session.commit()
+        logger.error(f"{len(jobs)} files of bulk import failed: {error}")
+    
+    async def release(self, jobs: List[IngestionJob]) -> None:
+        """
+        Queue the jobs of an interrupted bulk import run again, keeping their
+        document IDs so the next run deletes what was stored of them.
+        """
+        for job in jobs:
+            job.status = JOB_QUEUED
+        try:
+            await self.session.commit()
+        except Exception as e:
+            # They are taken over once stale instead
+            logger.error(f"Error releasing {len(jobs)} bulk import jobs: {str(e)}")
+    
+    async def import_summary(self, import_id: UUID) -> Dict:
+        """
+        Count the files of a bulk import by status.
+        
+        Returns:
+            Dict with the file count per status, total files and chunks stored,
+            and the start of the earliest and end of the latest finished file
+        """
+        result = await self.session.execute(
+            select(
+                IngestionJob.status,
+                func.count(IngestionJob.id),
+                func.coalesce(func.sum(IngestionJob.chunks_done), 0),
+                func.min(IngestionJob.started_at),
+                func.max(IngestionJob.finished_at)
+            )
+            .where(IngestionJob.import_id == import_id)
+            .group_by(IngestionJob.status)
+        )
+        summary = {
+            "files": {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0},
+            "files_total": 0,
+            "chunks": 0,
+            "started_at": None,
+            "finished_at": None
+        }
+        for status, count, chunks, started_at, finished_at in result.all():
+            summary["files"][status] = count
+            summary["files_total"] += count
+            summary["chunks"] += chunks
+            if started_at is not None and (summary["started_at"] is None or started_at < summary["started_at"]):
+                summary["started_at"] = started_at
+            if finished_at is not None and (summary["finished_at"] is None or finished_at > summary["finished_at"]):
+                summary["finished_at"] = finished_at
+        return summary
\ No newline at end of file
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class BulkImportResponse(BaseModel):
+    id: str
+    status: str  # running, done, failed (some files failed) or interrupted (resume it)
+    files_total: int
+    files_queued: int = 0
+    files_running: int = 0
+    files_done: int = 0
+    files_failed: int = 0
+    chunks: int = 0
+    files_per_second: Optional[float] = None  # Files done per second between the first start and the last finish
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_summary(cls, import_id, summary: Dict, running: bool) -> "BulkImportResponse":
+        files = summary["files"]
+        if running:
+            status = "running"
+        elif files["queued"] or files["running"]:
+            status = "interrupted"
+        elif files["failed"]:
+            status = "failed"
+        else:
+            status = "done"
+        
+        files_per_second = None
+        if summary["started_at"] and summary["finished_at"]:
+            seconds = (summary["finished_at"] - summary["started_at"]).total_seconds()
+            if seconds > 0:
+                files_per_second = round(files["done"] / seconds, 2)
+        return cls(
+            id=str(import_id),
+            status=status,
+            files_total=summary["files_total"],
+            files_queued=files["queued"],
+            files_running=files["running"],
+            files_done=files["done"],
+            files_failed=files["failed"],
+            chunks=summary["chunks"],
+            files_per_second=files_per_second,
+            started_at=summary["started_at"],
+            finished_at=summary["finished_at"]
+        )
\ No newline at end of file
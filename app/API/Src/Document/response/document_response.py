@@ -8,6 +8,8 @@ class DocumentResponse(BaseModel):
     
     id: str
     localisation: str
+    source: Optional[str] = None
+    user_id: Optional[str] = None
     content: str
     tokens: Optional[int] = None
     headers: Optional[Dict[str, List[str]]] = None
@@ -16,6 +18,7 @@ class DocumentResponse(BaseModel):
     document_metadata: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+    score: Optional[float] = None
     
     @classmethod
     def from_document(cls, document) -> "DocumentResponse":
@@ -26,6 +29,8 @@ class DocumentResponse(BaseModel):
         return cls(
             id=str(document.id),
             localisation=document.localisation,
+            source=document.source,
+            user_id=str(document.user_id) if document.user_id else None,
             content=document.content,
             tokens=document.tokens,
             headers=document.headers,
@@ -33,5 +38,6 @@ class DocumentResponse(BaseModel):
             images=document.images,
             document_metadata=document.document_metadata,
             created_at=document.created_at,
-            updated_at=document.updated_at
+            updated_at=document.updated_at,
+            score=document.score
         )
\ No newline at end of file
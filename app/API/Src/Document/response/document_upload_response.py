@@ -3,7 +3,8 @@ from datetime import datetime
 
 
 class DocumentUploadResponse(BaseModel):
-    id: str
+    id: str  # Ingestion job ID
     localisation: str
     message: str
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+    status: str = "queued"
\ No newline at end of file
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict
+
+
+class IngestionJobResponse(BaseModel):
+    id: str
+    status: str  # queued, running, done or failed
+    source: str
+    localisation: str
+    user_id: Optional[str] = None
+    attempts: int
+    chunks_total: Optional[int] = None
+    chunks_done: int = 0
+    progress: Optional[float] = None  # Share of chunks stored, once the file is split
+    document_ids: Optional[list] = None
+    timings_ms: Optional[Dict[str, float]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_job(cls, job) -> "IngestionJobResponse":
+        progress = None
+        if job.chunks_total is not None:
+            progress = job.chunks_done / job.chunks_total if job.chunks_total else 1.0
+        return cls(
+            id=str(job.id),
+            status=job.status,
+            source=job.source,
+            localisation=Path(job.file_path).name,
+            user_id=str(job.user_id) if job.user_id else None,
+            attempts=job.attempts,
+            chunks_total=job.chunks_total,
+            chunks_done=job.chunks_done,
+            progress=progress,
+            document_ids=job.document_ids,
+            timings_ms=job.timings,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at
+        )
@@ -0,0 +1,156 @@
+"""
+Token-budgeted assembly of the prompt context from retrieved documents and chat history.
+"""
+from typing import List, Optional, Tuple
+import logging
+import tiktoken
+from app.API.Src.core.config import settings
+from app.API.Src.Document.models.document import Document
+from app.API.Src.Document.documentSplitter.token_based_text_splitter import get_tokenizer
+from app.API.Src.RAG.model.assembled_context import AssembledContext
+
+logger = logging.getLogger(__name__)
+
+# Context tokens per chat model, leaving room for the prompt template and the answer.
+# Models not listed use settings.CONTEXT_TOKEN_BUDGET.
+MODEL_CONTEXT_BUDGETS = {
+    "gpt-4": 6000,
+    "gemini-2.5-flash": 24000,
+    "gemini-pro": 24000,
+    "gemini-1.5-pro": 24000,
+    "gemini-1.5-flash": 24000,
+}
+
+DOCUMENT_SEPARATOR = "\n---\n"
+HISTORY_HEADER = "\n\nPrevious conversation:\n"
+TRUNCATION_MARK = " [...]"
+
+
+def format_document(index: int, document: Document) -> str:
+    """Format one retrieved document for the prompt context."""
+    return f"Document {index} ({document.localisation}):\n{document.content}\n"
+
+
+def format_message(message) -> str:
+    """Format one chat message for the prompt context."""
+    role = "User" if message.author == "user" else "Assistant"
+    return f"{role}: {message.message}"
+
+
+def format_history(lines: List[str]) -> str:
+    """Format formatted messages, oldest first, as the conversation context."""
+    if not lines:
+        return ""
+    return HISTORY_HEADER + "\n".join(lines) + "\n"
+
+
+class ContextBuilder:
+    """
+    Fills a per-model token budget with context, by priority:
+
+    1. Retrieved documents, best score first, within the budget minus a
+       reserve kept for history. A document that does not fit is skipped and
+       the next (shorter) one is tried.
+    2. The most recent messages, verbatim.
+    3. Older messages, truncated to a few tokens each.
+
+    Messages are added newest first and stop at the first one that does not
+    fit, so the history never has gaps. Tokens are counted with the same
+    tiktoken encodings as TextSplitter (cl100k_base for non-OpenAI models,
+    a close approximation).
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        budget: Optional[int] = None,
+        tokenizer: Optional[tiktoken.Encoding] = None
+    ):
+        self.budget = budget or MODEL_CONTEXT_BUDGETS.get(model, settings.CONTEXT_TOKEN_BUDGET)
+        self.tokenizer = tokenizer or get_tokenizer(model or "gpt-4")
+        self.history_reserve = int(self.budget * settings.CONTEXT_HISTORY_SHARE)
+        self.recent_messages = settings.CONTEXT_RECENT_MESSAGES
+        self.compressed_message_tokens = settings.CONTEXT_COMPRESSED_MESSAGE_TOKENS
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, disallowed_special=()))
+
+    def build(self, documents: List[Document], messages: List) -> AssembledContext:
+        """
+        Assemble the prompt context within the token budget.
+
+        Args:
+            documents: Retrieved documents, best match first
+            messages: Chat messages, oldest first
+
+        Returns:
+            AssembledContext with the formatted context and its token accounting
+        """
+        document_budget = self.budget - (self.history_reserve if messages else 0)
+        used_documents = self._select_documents(documents, document_budget)
+        document_context = DOCUMENT_SEPARATOR.join(
+            format_document(i, document) for i, document in enumerate(used_documents, 1)
+        )
+        document_tokens = self.count_tokens(document_context)
+
+        lines, compressed = self._select_messages(messages, self.budget - document_tokens)
+        conversation_context = format_history(lines)
+
+        context = AssembledContext(
+            document_context=document_context,
+            conversation_context=conversation_context,
+            documents=used_documents,
+            budget=self.budget,
+            document_tokens=document_tokens,
+            conversation_tokens=self.count_tokens(conversation_context),
+            documents_dropped=len(documents) - len(used_documents),
+            messages_used=len(lines) - compressed,
+            messages_compressed=compressed,
+            messages_dropped=len(messages) - len(lines)
+        )
+        logger.info(f"Assembled context: {context.get_token_usage()}")
+        return context
+
+    def _select_documents(self, documents: List[Document], budget: int) -> List[Document]:
+        selected: List[Document] = []
+        separator_tokens = self.count_tokens(DOCUMENT_SEPARATOR)
+        used = 0
+        for document in documents:
+            # Numbering follows the position in the context, as in the formatted output
+            tokens = self.count_tokens(format_document(len(selected) + 1, document))
+            if selected:
+                tokens += separator_tokens
+            if used + tokens <= budget:
+                selected.append(document)
+                used += tokens
+        return selected
+
+    def _select_messages(self, messages: List, budget: int) -> Tuple[List[str], int]:
+        """Pick messages newest first; returns (formatted lines oldest first, number compressed)."""
+        lines: List[str] = []
+        compressed = 0
+        used = self.count_tokens(HISTORY_HEADER) + 1
+        for age, message in enumerate(reversed(messages)):
+            line = format_message(message)
+            tokens = self.count_tokens(line) + 1
+            truncated = False
+            # Older messages are always truncated; a recent one only when it does not fit verbatim
+            if age >= self.recent_messages or used + tokens > budget:
+                short_line = self._truncate(line, self.compressed_message_tokens)
+                if short_line != line:
+                    line = short_line
+                    tokens = self.count_tokens(line) + 1
+                    truncated = True
+            if used + tokens > budget:
+                break
+            lines.append(line)
+            used += tokens
+            compressed += truncated
+        lines.reverse()
+        return lines, compressed
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.tokenizer.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return self.tokenizer.decode(tokens[:max_tokens]) + TRUNCATION_MARK
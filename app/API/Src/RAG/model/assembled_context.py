@@ -0,0 +1,44 @@
+from typing import List, Dict, Any
+from pydantic import BaseModel, Field
+from app.API.Src.Document.models.document import Document
+
+
+class AssembledContext(BaseModel):
+    """
+    Model representing the prompt context built by ContextBuilder within a token budget.
+    Contains the formatted document and conversation context and how the budget was spent.
+    """
+
+    document_context: str = Field(default="", description="Formatted context from documents")
+    conversation_context: str = Field(default="", description="Formatted conversation history")
+    documents: List[Document] = Field(default_factory=list, description="Documents included in the context")
+    budget: int = Field(..., description="Token budget of the context")
+    document_tokens: int = Field(default=0, description="Tokens used by document context")
+    conversation_tokens: int = Field(default=0, description="Tokens used by conversation history")
+    documents_dropped: int = Field(default=0, description="Retrieved documents left out to fit the budget")
+    messages_used: int = Field(default=0, description="Messages included verbatim")
+    messages_compressed: int = Field(default=0, description="Older messages included truncated")
+    messages_dropped: int = Field(default=0, description="Messages left out to fit the budget")
+
+    class Config:
+        """Pydantic configuration"""
+        arbitrary_types_allowed = True  # Allow SQLAlchemy models
+
+    @property
+    def total_tokens(self) -> int:
+        """Get the number of tokens used by the whole context"""
+        return self.document_tokens + self.conversation_tokens
+
+    def get_token_usage(self) -> Dict[str, Any]:
+        """Get the token accounting reported in response metadata"""
+        return {
+            "budget": self.budget,
+            "total": self.total_tokens,
+            "documents": self.document_tokens,
+            "conversation": self.conversation_tokens,
+            "documents_used": len(self.documents),
+            "documents_dropped": self.documents_dropped,
+            "messages_used": self.messages_used,
+            "messages_compressed": self.messages_compressed,
+            "messages_dropped": self.messages_dropped
+        }
@@ -46,6 +46,10 @@ class RAGResponse(BaseModel):
         """Get list of document source locations/filenames"""
         return [doc.localisation for doc in self.documents]
     
+    def get_document_scores(self) -> List[Optional[float]]:
+        """Get list of similarity scores of retrieved documents"""
+        return [doc.score for doc in self.documents]
+    
     @classmethod
     def create_success_response(
         cls, 
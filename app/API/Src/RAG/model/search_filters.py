@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+class SearchFilters(BaseModel):
+    """
+    Scope of a retrieval: only documents matching every given field are searched.
+    
+    The fields are stored in the payload of each vector and indexed in Qdrant,
+    so the vector search filters before ranking instead of discarding results
+    afterwards.
+    """
+
+    sources: Optional[List[str]] = Field(default=None, description="Names of uploaded files, any of them")
+    user_id: Optional[UUID] = Field(default=None, description="Owner of the uploaded files")
+    headers: Optional[List[str]] = Field(default=None, description="Section headers, documents under any of them")
+    min_tokens: Optional[int] = Field(default=None, ge=0, description="Minimum document size in tokens")
+    max_tokens: Optional[int] = Field(default=None, ge=0, description="Maximum document size in tokens")
+
+    def is_empty(self) -> bool:
+        """Whether no field restricts the search"""
+        return not (self.sources or self.user_id or self.headers) \
+            and self.min_tokens is None and self.max_tokens is None
+
+    def to_vector_filter(self) -> Optional[Dict[str, Any]]:
+        """Qdrant filter conditions over the document payload, None without restrictions"""
+        must: List[Dict[str, Any]] = []
+        if self.sources:
+            must.append({"key": "source", "match": {"any": self.sources}})
+        if self.user_id:
+            must.append({"key": "user_id", "match": {"value": str(self.user_id)}})
+        if self.headers:
+            must.append({"key": "headers", "match": {"any": self.headers}})
+        if self.min_tokens is not None or self.max_tokens is not None:
+            must.append({"key": "tokens", "range": {"gte": self.min_tokens, "lte": self.max_tokens}})
+        return {"must": must} if must else None
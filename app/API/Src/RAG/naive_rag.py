@@ -1,36 +1,86 @@
-from typing import List
+from typing import List, Optional, Dict
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, client_registry
 from app.API.Src.Document.repository.document_repository import DocumentRepository
 from app.API.Src.Document.models.document import Document
 from app.API.Src.RAG.model.rag_response import RAGResponse
+from app.API.Src.RAG.model.search_filters import SearchFilters
+from app.API.Src.RAG.context_builder import format_document, DOCUMENT_SEPARATOR
+from app.API.Src.RAG.rank_fusion import RETRIEVAL_MODES, reciprocal_rank_fusion
+from app.API.Src.RAG.reranker import LexicalReranker
+from app.API.Src.core.config import settings
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 class NaiveRAGService:
     """
     Naive RAG (Retrieval-Augmented Generation) service that retrieves
-    the most relevant documents based on user prompt using vector similarity.
+    the most relevant documents based on user prompt.
+    
+    Retrieval modes:
+        dense: vector similarity search in Qdrant
+        lexical: PostgreSQL full-text search over document content
+        hybrid: both, merged with reciprocal rank fusion; finds exact
+            identifiers, product names and error codes that embeddings miss
+    
+    With settings.RERANK_ENABLED, settings.RERANK_CANDIDATES candidates are
+    retrieved and rescored on CPU by LexicalReranker, and only the best
+    `count` of them are returned.
+    
+    SearchFilters scope every mode to the matching documents: the vector
+    search filters with Qdrant payload indexes and the full-text search in
+    SQL, so candidates are only ever drawn from the matching documents.
     """
     
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, clients: Optional[ClientRegistry] = None):
         """
         Initialize the RAG service with a database session.
         
         Args:
             db_session: Async database session for document operations
+            clients: Registry of shared external clients (defaults to the process-wide one)
         """
         self.db_session = db_session
-        self.document_repository = DocumentRepository(db_session)
+        self.clients = clients or client_registry
+        self.document_repository = DocumentRepository(
+            db_session,
+            embedding_generator=self.clients.get_embedding_generator(),
+            qdrant_repo=self.clients.get_qdrant_repository()
+        )
+        self.reranker = LexicalReranker(weight=settings.RERANK_WEIGHT) if settings.RERANK_ENABLED else None
+    
+    @staticmethod
+    def resolve_mode(mode: Optional[str] = None) -> str:
+        """Return the retrieval mode to use, settings.RETRIEVAL_MODE by default."""
+        mode = mode or settings.RETRIEVAL_MODE
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}', expected one of {', '.join(RETRIEVAL_MODES)}")
+        return mode
+    
+    def candidate_count(self, count: int) -> int:
+        """Number of candidates to retrieve for a result of `count` documents."""
+        return max(count, settings.RERANK_CANDIDATES) if self.reranker is not None else count
     
-    async def retrieve_documents(self, user_prompt: str, count: int = 5, score_threshold: float = None) -> List[Document]:
+    async def retrieve_documents(
+        self,
+        user_prompt: str,
+        count: int = 5,
+        score_threshold: float = None,
+        mode: Optional[str] = None,
+        filters: Optional[SearchFilters] = None
+    ) -> List[Document]:
         """
         Retrieve the most relevant documents for a given user prompt.
         
         Args:
             user_prompt: The user's query/prompt
             count: Number of documents to retrieve (default: 5)
-            score_threshold: Minimum similarity score threshold (optional)
+            score_threshold: Minimum similarity score threshold (optional, dense results only)
+            mode: Retrieval mode, dense, lexical or hybrid (default: settings.RETRIEVAL_MODE)
+            filters: Scope of the search (optional)
             
         Returns:
             List of most relevant Document objects
@@ -38,12 +88,10 @@ class NaiveRAGService:
         try:
             logger.info(f"Starting RAG document retrieval for prompt: '{user_prompt[:50]}...'")
             
-            # Use the existing vector search functionality
-            documents = await self.document_repository.search_documents_by_vector(
-                prompt=user_prompt,
-                count=count,
-                score_threshold=score_threshold
-            )
+            dense_scores = await self.search_scores(user_prompt, count, score_threshold, mode, filters)
+            scores = await self.rank_scores(user_prompt, dense_scores, count, mode, filters)
+            documents = await self.document_repository.get_scored_documents(scores) if scores else []
+            documents = self.rerank_documents(user_prompt, documents, count)
             
             logger.info(f"RAG service retrieved {len(documents)} documents for prompt")
             return documents
@@ -52,6 +100,159 @@ class NaiveRAGService:
             logger.error(f"Error in RAG document retrieval: {str(e)}")
             return []
     
+    async def search_scores(
+        self,
+        user_prompt: str,
+        count: int = 5,
+        score_threshold: float = None,
+        mode: Optional[str] = None,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[UUID, float]:
+        """
+        First phase of retrieval: vector search without database access.
+        
+        In hybrid mode more candidates are fetched (settings.HYBRID_CANDIDATES)
+        for fusion, and with reranking enabled, enough for the rerank stage;
+        in lexical mode there is no vector search.
+        
+        Args:
+            user_prompt: The user's query/prompt
+            count: Number of documents to retrieve (default: 5)
+            score_threshold: Minimum similarity score threshold (optional)
+            mode: Retrieval mode (default: settings.RETRIEVAL_MODE)
+            filters: Scope of the search (optional)
+            
+        Returns:
+            Document IDs mapped to similarity scores, empty on failure
+        """
+        mode = self.resolve_mode(mode)
+        if mode == "lexical":
+            return {}
+        candidates = self.candidate_count(count)
+        try:
+            return await self.document_repository.search_document_scores_by_vector(
+                prompt=user_prompt,
+                count=max(candidates, settings.HYBRID_CANDIDATES) if mode == "hybrid" else candidates,
+                score_threshold=score_threshold,
+                filters=filters
+            )
+        except Exception as e:
+            logger.error(f"Error in RAG vector search: {str(e)}")
+            return {}
+    
+    async def rank_scores(
+        self,
+        user_prompt: str,
+        dense_scores: Dict[UUID, float],
+        count: int = 5,
+        mode: Optional[str] = None,
+        filters: Optional[SearchFilters] = None
+    ) -> Dict[UUID, float]:
+        """
+        Second phase of retrieval: full-text search in PostgreSQL and fusion.
+        
+        Uses the database session, so it must not run concurrently with other
+        queries on it. In hybrid mode the scores are reciprocal rank fusion
+        scores, not similarities. If full-text search fails, hybrid mode falls
+        back to the dense results.
+        
+        Args:
+            user_prompt: The user's query/prompt
+            dense_scores: Result of search_scores
+            count: Number of documents to retrieve (default: 5)
+            mode: Retrieval mode (default: settings.RETRIEVAL_MODE)
+            filters: Scope of the search, the same as given to search_scores (optional)
+            
+        Returns:
+            Document IDs mapped to scores, best match first
+        """
+        mode = self.resolve_mode(mode)
+        if mode == "dense":
+            return dense_scores
+        
+        candidates = self.candidate_count(count)
+        try:
+            lexical_scores = await self.document_repository.search_document_scores_by_text(
+                prompt=user_prompt,
+                count=max(candidates, settings.HYBRID_CANDIDATES) if mode == "hybrid" else candidates,
+                filters=filters
+            )
+        except Exception as e:
+            logger.error(f"Error in RAG full-text search: {str(e)}")
+            lexical_scores = {}
+        
+        if mode == "lexical":
+            return lexical_scores
+        return reciprocal_rank_fusion([dense_scores, lexical_scores], k=settings.RRF_K, limit=candidates)
+    
+    def rerank_documents(
+        self,
+        user_prompt: str,
+        documents: List[Document],
+        count: int,
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[Document]:
+        """
+        Rerank stage: keep the best `count` candidates.
+        
+        Without a reranker the retrieval order is kept. The time spent is
+        logged and, if given, recorded in timings["rerank"] (milliseconds).
+        
+        Args:
+            user_prompt: The user's query/prompt
+            documents: Candidates, best retrieval match first
+            count: Number of documents to keep
+            timings: Stage timings to record the rerank latency in (optional)
+            
+        Returns:
+            Best `count` documents
+        """
+        if self.reranker is None:
+            return documents[:count]
+        
+        start = time.perf_counter()
+        reranked = self.reranker.rerank(user_prompt, documents, count)
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        if timings is not None:
+            timings["rerank"] = elapsed_ms
+        logger.info(f"Reranked {len(documents)} candidates to {len(reranked)} documents in {elapsed_ms} ms")
+        return reranked
+    
+    async def format_scored_context(
+        self,
+        user_prompt: str,
+        scores: Dict[UUID, float],
+        count: Optional[int] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> RAGResponse:
+        """
+        Last phase of retrieval: load the found documents, rerank and format them.
+        
+        Args:
+            user_prompt: The user's query/prompt
+            scores: Result of rank_scores
+            count: Number of documents to keep (default: all)
+            timings: Stage timings to record the rerank latency in (optional)
+            
+        Returns:
+            RAGResponse object containing documents and formatted context
+        """
+        try:
+            documents = await self.document_repository.get_scored_documents(scores) if scores else []
+            documents = self.rerank_documents(user_prompt, documents, count or len(documents), timings)
+            context = await self.get_context_from_documents(documents)
+            return RAGResponse.create_success_response(
+                query=user_prompt,
+                documents=documents,
+                context=context
+            )
+        except Exception as e:
+            logger.error(f"Error in RAG format_scored_context: {str(e)}")
+            return RAGResponse.create_error_response(
+                query=user_prompt,
+                error_message=str(e)
+            )
+    
     async def get_context_from_documents(self, documents: List[Document]) -> str:
         """
         Extract and combine content from retrieved documents to create context.
@@ -66,13 +267,9 @@ class NaiveRAGService:
             if not documents:
                 return ""
             
-            context_parts = []
-            for i, doc in enumerate(documents, 1):
-                # Add document metadata and content
-                doc_context = f"Document {i} ({doc.localisation}):\n{doc.content}\n"
-                context_parts.append(doc_context)
+            context_parts = [format_document(i, doc) for i, doc in enumerate(documents, 1)]
             
-            combined_context = "\n---\n".join(context_parts)
+            combined_context = DOCUMENT_SEPARATOR.join(context_parts)
             logger.info(f"Created context from {len(documents)} documents, total length: {len(combined_context)} characters")
             
             return combined_context
@@ -81,21 +278,30 @@ class NaiveRAGService:
             logger.error(f"Error creating context from documents: {str(e)}")
             return ""
     
-    async def retrieve_and_format_context(self, user_prompt: str, count: int = 5, score_threshold: float = None) -> RAGResponse:
+    async def retrieve_and_format_context(
+        self,
+        user_prompt: str,
+        count: int = 5,
+        score_threshold: float = None,
+        mode: Optional[str] = None,
+        filters: Optional[SearchFilters] = None
+    ) -> RAGResponse:
         """
         Complete RAG retrieval process: find documents and format as context.
         
         Args:
             user_prompt: The user's query/prompt
             count: Number of documents to retrieve (default: 5)
-            score_threshold: Minimum similarity score threshold (optional)
+            score_threshold: Minimum similarity score threshold (optional, dense results only)
+            mode: Retrieval mode, dense, lexical or hybrid (default: settings.RETRIEVAL_MODE)
+            filters: Scope of the search (optional)
             
         Returns:
             RAGResponse object containing documents and formatted context
         """
         try:
             # Retrieve relevant documents
-            documents = await self.retrieve_documents(user_prompt, count, score_threshold)
+            documents = await self.retrieve_documents(user_prompt, count, score_threshold, mode, filters)
             
             # Create formatted context
             context = await self.get_context_from_documents(documents)
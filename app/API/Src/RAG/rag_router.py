@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import List, Optional
+from uuid import UUID
 from app.API.Src.core.database.Postgres.database import get_db_session
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, get_client_registry
 from app.API.Src.RAG.naive_rag import NaiveRAGService
 from app.API.Src.RAG.model.rag_response import RAGResponse
+from app.API.Src.RAG.model.search_filters import SearchFilters
 from app.API.Src.Document.response.document_response import DocumentResponse
 
 router = APIRouter()
@@ -12,16 +15,29 @@ router = APIRouter()
 async def rag_search(
     prompt: str = Query(..., description="User prompt for document retrieval"),
     count: int = Query(default=5, le=20, description="Number of documents to retrieve"),
-    score_threshold: Optional[float] = Query(default=None, description="Minimum similarity score"),
-    db: AsyncSession = Depends(get_db_session)
+    score_threshold: Optional[float] = Query(default=None, description="Minimum similarity score (dense results only)"),
+    mode: Optional[str] = Query(default=None, pattern="^(dense|lexical|hybrid)$", description="Retrieval mode, defaults to RETRIEVAL_MODE"),
+    source: Optional[List[str]] = Query(default=None, description="Only documents split from these uploaded files"),
+    user_id: Optional[UUID] = Query(default=None, description="Only documents uploaded by this user"),
+    header: Optional[List[str]] = Query(default=None, description="Only documents under one of these section headers"),
+    min_tokens: Optional[int] = Query(default=None, ge=0, description="Minimum document size in tokens"),
+    max_tokens: Optional[int] = Query(default=None, ge=0, description="Maximum document size in tokens"),
+    db: AsyncSession = Depends(get_db_session),
+    clients: ClientRegistry = Depends(get_client_registry)
 ):
     """
     RAG (Retrieval-Augmented Generation) endpoint that retrieves the most relevant documents
-    for a given user prompt using vector similarity search.
+    for a given user prompt using vector similarity search, full-text search or both
+    (hybrid, merged with reciprocal rank fusion).
+    The source, user_id, header and token filters restrict the search to the matching documents.
     Endpoint mostly for testing purposes, use chat endpoint for production.
     """
-    rag_service = NaiveRAGService(db)
-    rag_response = await rag_service.retrieve_and_format_context(prompt, count, score_threshold)
+    filters = SearchFilters(sources=source, user_id=user_id, headers=header, min_tokens=min_tokens, max_tokens=max_tokens)
+    rag_service = NaiveRAGService(db, clients)
+    mode = rag_service.resolve_mode(mode)
+    rag_response = await rag_service.retrieve_and_format_context(
+        prompt, count, score_threshold, mode, None if filters.is_empty() else filters
+    )
     
     # Convert documents to response format
     document_responses = [
@@ -30,11 +46,22 @@ async def rag_search(
     
     return {
         "query": rag_response.query,
+        "mode": mode,
+        "filters": filters.model_dump(mode="json", exclude_none=True),
         "document_count": rag_response.document_count,
         "documents": document_responses,
         "context": rag_response.context,
         "context_length": rag_response.context_length,
         "has_context": rag_response.has_context,
         "document_sources": rag_response.get_document_sources(),
+        "document_scores": rag_response.get_document_scores(),
         "error": rag_response.error
-    }
\ No newline at end of file
+    }
+
+@router.get("/rag/embedding-cache", response_model=dict, tags=["RAG"])
+async def embedding_cache_stats(clients: ClientRegistry = Depends(get_client_registry)):
+    """
+    Hit/miss counters of the embedding cache.
+    """
+    cache = clients.get_embedding_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
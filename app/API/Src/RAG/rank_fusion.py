@@ -0,0 +1,36 @@
+"""
+Fusion of ranked retrieval results.
+"""
+from typing import Dict, List, Optional
+from uuid import UUID
+
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid")
+
+
+def reciprocal_rank_fusion(
+    rankings: List[Dict[UUID, float]],
+    k: int = 60,
+    limit: Optional[int] = None
+) -> Dict[UUID, float]:
+    """
+    Merge rankings with reciprocal rank fusion.
+
+    Each document scores sum(1 / (k + rank)) over the rankings it appears in,
+    with ranks starting at 1. Only ranks are used, so dense similarities and
+    lexical ranks, which are on different scales, can be combined.
+
+    Args:
+        rankings: Document IDs mapped to scores, each best match first
+        k: Smoothing constant; higher values flatten the gap between top ranks
+        limit: Maximum number of results (all if omitted)
+
+    Returns:
+        Document IDs mapped to fused scores, best match first
+    """
+    fused: Dict[UUID, float] = {}
+    for ranking in rankings:
+        for rank, document_id in enumerate(ranking, 1):
+            fused[document_id] = fused.get(document_id, 0.0) + 1.0 / (k + rank)
+
+    ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return dict(ordered[:limit] if limit is not None else ordered)
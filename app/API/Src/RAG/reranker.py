@@ -0,0 +1,86 @@
+"""
+Local CPU reranking of retrieved documents.
+"""
+import math
+import re
+from collections import Counter
+from typing import List
+
+from app.API.Src.Document.models.document import Document
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; identifiers like ERR-4021 split into their parts."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class LexicalReranker:
+    """
+    Rescores retrieval candidates by query term overlap.
+
+    Each candidate gets a BM25 score against the query, with document
+    frequencies taken from the candidate set itself, so no index or model is
+    needed. The normalized BM25 score is blended with the candidate's
+    position in the retrieval ranking, which keeps semantic matches that share
+    no words with the query from dropping to the bottom.
+    """
+
+    def __init__(self, weight: float = 0.5, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            weight: Share of the lexical score in the final score (0 keeps the retrieval order)
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.weight = weight
+        self.k1 = k1
+        self.b = b
+
+    def rerank(self, query: str, documents: List[Document], top_k: int) -> List[Document]:
+        """
+        Reorder candidates and keep the best top_k.
+
+        Args:
+            query: User prompt
+            documents: Candidates, best retrieval match first
+            top_k: Number of documents to keep
+
+        Returns:
+            Best top_k documents, each with its `rerank_score` set
+        """
+        if not documents:
+            return []
+
+        lexical_scores = self.score(query, [document.content for document in documents])
+        best_lexical = max(lexical_scores) or 1.0
+        count = len(documents)
+        for position, (document, lexical_score) in enumerate(zip(documents, lexical_scores)):
+            retrieval_prior = 1.0 - position / count
+            document.rerank_score = self.weight * lexical_score / best_lexical + (1 - self.weight) * retrieval_prior
+
+        return sorted(documents, key=lambda document: document.rerank_score, reverse=True)[:top_k]
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        """BM25 score of each text against the query, with statistics of the given texts."""
+        query_terms = set(tokenize(query))
+        term_counts = [Counter(tokenize(text)) for text in texts]
+        lengths = [sum(counts.values()) for counts in term_counts]
+        average_length = sum(lengths) / len(lengths) or 1.0
+
+        idf = {}
+        for term in query_terms:
+            frequency = sum(1 for counts in term_counts if term in counts)
+            idf[term] = math.log(1 + (len(texts) - frequency + 0.5) / (frequency + 0.5))
+
+        scores = []
+        for counts, length in zip(term_counts, lengths):
+            score = 0.0
+            for term in query_terms:
+                tf = counts.get(term, 0)
+                if tf:
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                    score += idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
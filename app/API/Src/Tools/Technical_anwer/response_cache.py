@@ -0,0 +1,199 @@
+"""
+Cache of generated answers for repeated chat questions.
+"""
+import hashlib
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from app.API.Src.core.ExternalApiHelper.model.ai_response import AiResponse
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+
+class CachedAnswer:
+    def __init__(self, response: AiResponse, document_ids: List[str], embedding: Optional[List[float]], expires_at: float):
+        self.response = response
+        self.document_ids = document_ids
+        self.embedding = embedding
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of answers keyed by (model, context fingerprint, normalized prompt).
+
+    The context fingerprint is a hash of the system prompt, which holds the
+    retrieved documents and the chat history, so an answer is only reused
+    for the same sources. With a similarity threshold, a differently worded
+    prompt whose embedding is close enough to a cached one also hits, within
+    the same model and context. Entries are indexed by the IDs of the
+    documents they cite, so changing or deleting a document drops them.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: float = 3600.0, similarity_threshold: float = 0.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[CacheKey, CachedAnswer]" = OrderedDict()
+        self._by_context: Dict[Tuple[str, str], Set[CacheKey]] = {}
+        self._by_document: Dict[str, Set[CacheKey]] = {}
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def semantic(self) -> bool:
+        """Whether lookups also match on prompt embedding similarity"""
+        return self.similarity_threshold > 0
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """Lowercase, collapse whitespace and drop trailing punctuation."""
+        return re.sub(r"\s+", " ", prompt).strip().lower().rstrip("?!.").strip()
+
+    @staticmethod
+    def context_fingerprint(system_prompt: str) -> str:
+        return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        model: str,
+        prompt: str,
+        context: str,
+        embedding: Optional[List[float]] = None
+    ) -> Optional[AiResponse]:
+        """
+        Look up an answer.
+
+        Args:
+            model: AI model of the answer
+            prompt: User prompt
+            context: Fingerprint of the prompt context (see context_fingerprint)
+            embedding: Embedding of the prompt, for similarity matching (optional)
+
+        Returns:
+            Copy of the cached answer, or None
+        """
+        key = (model, context, self.normalize_prompt(prompt))
+        entry = self._live_entry(key)
+        if entry is not None:
+            self.hits += 1
+        elif embedding is not None and self.semantic:
+            entry = self._find_similar(model, context, embedding)
+            if entry is not None:
+                self.semantic_hits += 1
+
+        if entry is None:
+            self.misses += 1
+            return None
+        return entry.response.model_copy(deep=True)
+
+    def set(
+        self,
+        model: str,
+        prompt: str,
+        context: str,
+        document_ids: List[str],
+        response: AiResponse,
+        embedding: Optional[List[float]] = None
+    ) -> None:
+        """Store an answer, evicting the least recently used entries beyond max_size."""
+        key = (model, context, self.normalize_prompt(prompt))
+        self._remove(key)
+        self._entries[key] = CachedAnswer(
+            response.model_copy(deep=True),
+            list(document_ids),
+            embedding,
+            time.monotonic() + self.ttl
+        )
+        self._by_context.setdefault((model, context), set()).add(key)
+        for document_id in document_ids:
+            self._by_document.setdefault(document_id, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_documents(self, document_ids: Iterable[Any]) -> int:
+        """
+        Drop every answer citing one of the documents.
+
+        Returns:
+            Number of answers dropped
+        """
+        keys: Set[CacheKey] = set()
+        for document_id in document_ids:
+            keys |= self._by_document.get(str(document_id), set())
+        for key in keys:
+            self._remove(key)
+        if keys:
+            self.invalidations += len(keys)
+            logger.info(f"Invalidated {len(keys)} cached answers")
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_context.clear()
+        self._by_document.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.semantic_hits + self.misses
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "max_size": self.max_size
+        }
+
+    def _live_entry(self, key: CacheKey) -> Optional[CachedAnswer]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _find_similar(self, model: str, context: str, embedding: List[float]) -> Optional[CachedAnswer]:
+        best_key, best_score = None, self.similarity_threshold
+        for key in list(self._by_context.get((model, context), ())):
+            entry = self._live_entry(key)
+            if entry is None or entry.embedding is None:
+                continue
+            score = self._cosine(embedding, entry.embedding)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return self._entries[best_key] if best_key is not None else None
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        group = self._by_context.get(key[:2])
+        if group is not None:
+            group.discard(key)
+            if not group:
+                del self._by_context[key[:2]]
+        for document_id in entry.document_ids:
+            keys = self._by_document.get(document_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_document[document_id]
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
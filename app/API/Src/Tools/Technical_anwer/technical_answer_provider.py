@@ -1,123 +1,189 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.API.Src.Tools.Technical_anwer.prompt.process_chat_question_prompt import get_prompts
-from app.API.Src.core.ExternalApiHelper.ai_client import completion
+from app.API.Src.core.ExternalApiHelper.ai_client import completion, stream_completion
 from app.API.Src.core.ExternalApiHelper.model.ai_response import AiResponse
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, client_registry
 from app.API.Src.RAG.naive_rag import NaiveRAGService
 from app.API.Src.Chat.repository.message_repository import MessageRepository
-from typing import List, Optional
+from app.API.Src.RAG.model.rag_response import RAGResponse
+from app.API.Src.RAG.model.search_filters import SearchFilters
+from app.API.Src.RAG.context_builder import ContextBuilder
+from app.API.Src.Tools.Technical_anwer.response_cache import ResponseCache
+from typing import List, Optional, Tuple, Dict, Any, AsyncIterator, Awaitable, TypeVar
 from uuid import UUID
+import asyncio
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 class TechnicalAnswerProvider:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, clients: Optional[ClientRegistry] = None):
         self.db = db
-        self.rag_service = NaiveRAGService(db)
+        self.clients = clients or client_registry
+        self.rag_service = NaiveRAGService(db, self.clients)
         self.message_repository = MessageRepository(db)
+        self.response_cache = self.clients.get_response_cache()
     
-    async def format_conversation_history(self, messages: List) -> str:
-        """Format conversation history for AI context"""
-        if not messages:
-            return ""
-        
-        formatted_history = []
-        for message in messages:
-            role = "User" if message.author == "user" else "Assistant"
-            formatted_history.append(f"{role}: {message.message}")
+    async def get_recent_messages(self, chat_id: Optional[UUID], limit: int = 10) -> List:
+        """Load the recent messages of a chat, oldest first; empty without a chat or on error"""
+        if not chat_id:
+            return []
         
-        return "\n\nPrevious conversation:\n" + "\n".join(formatted_history) + "\n"
+        try:
+            recent_messages = await self.message_repository.get_recent_messages(chat_id, limit=limit)
+            logger.info(f"Loaded conversation history with {len(recent_messages)} messages")
+            return recent_messages
+        except Exception as e:
+            logger.error(f"Error retrieving conversation context: {str(e)}")
+            return []
     
-    async def get_conversation_context(self, chat_id: Optional[UUID], limit: int = 10) -> str:
+    async def prepare_chat_prompts(
+        self,
+        user_prompt: str,
+        chat_id: Optional[UUID] = None,
+        ai_model: Optional[str] = None,
+        rag_count: int = 5,
+        conversation_limit: int = 10,
+        filters: Optional[SearchFilters] = None
+    ) -> Tuple[str, str, Dict[str, Any]]:
         """
-        Retrieve and format conversation history for a given chat
+        Load conversation history and RAG context concurrently and build the prompts
+        
+        The vector search (embedding API and Qdrant) runs while the history is
+        loaded from PostgreSQL. Full-text search and fusion (in lexical and
+        hybrid retrieval modes), then loading the found documents, come last
+        because they use the database session, which is not shared between
+        concurrent queries. Documents and history are then fitted into
+        the token budget of the model by ContextBuilder.
         
         Args:
-            chat_id: The chat ID to retrieve history for
-            limit: Maximum number of recent messages to retrieve
+            user_prompt: The user's question
+            chat_id: Optional chat ID for retrieving conversation history
+            ai_model: AI model the prompts are built for
+            rag_count: Number of documents to retrieve via RAG
+            conversation_limit: Maximum number of recent messages to load
+            filters: Scope of the document retrieval (optional)
             
         Returns:
-            Formatted conversation context string
+            Tuple of (system prompt, user prompt, metadata with rag_info,
+            context_tokens and timings_ms of each stage)
         """
-        if not chat_id:
-            return ""
+        timings: Dict[str, float] = {}
         
-        try:
-            recent_messages = await self.message_repository.get_recent_messages(chat_id, limit=limit)
-            conversation_context = await self.format_conversation_history(recent_messages)
-            logger.info(f"Loaded conversation history with {len(recent_messages)} messages")
-            return conversation_context
-        except Exception as e:
-            logger.error(f"Error retrieving conversation context: {str(e)}")
-            return ""
+        logger.info(f"Retrieving context for prompt: '{user_prompt[:50]}...'")
+        scores, messages = await asyncio.gather(
+            self._timed(timings, "retrieval", self.rag_service.search_scores(user_prompt, rag_count, filters=filters)),
+            self._timed(timings, "history", self.get_recent_messages(chat_id, limit=conversation_limit))
+        )
+        scores = await self._timed(
+            timings, "ranking", self.rag_service.rank_scores(user_prompt, scores, rag_count, filters=filters)
+        )
+        rag_response = await self._timed(
+            timings, "hydration", self.rag_service.format_scored_context(user_prompt, scores, rag_count, timings)
+        )
+        
+        context = ContextBuilder(ai_model).build(rag_response.documents, messages)
+        rag_response.documents = context.documents
+        rag_response.document_count = len(context.documents)
+        rag_response.context = context.document_context
+        
+        system_prompt, prompt, rag_info = self._format_prompts(user_prompt, rag_response, context.conversation_context)
+        metadata = {
+            "rag_info": rag_info,
+            "context_tokens": context.get_token_usage(),
+            "timings_ms": timings
+        }
+        return system_prompt, prompt, metadata
     
-    async def generate_answer(
-        self, 
+    def _format_prompts(
+        self,
         user_prompt: str,
-        conversation_context: str = "",
+        rag_response: RAGResponse,
+        conversation_context: str
+    ) -> Tuple[str, str, Dict[str, Any]]:
+        # Combine RAG context with conversation history
+        full_context = rag_response.context + conversation_context
+        
+        logger.info(f"RAG retrieved {rag_response.document_count} documents for context")
+        
+        # Generate prompts with full context
+        system_prompt, prompt = get_prompts(full_context, user_prompt)
+        
+        rag_info = {
+            "documents_used": rag_response.document_count,
+            "context_length": rag_response.context_length,
+            "has_context": rag_response.has_context,
+            "document_ids": rag_response.get_document_ids(),
+            "document_sources": rag_response.get_document_sources(),
+            "document_scores": rag_response.get_document_scores(),
+            "error": rag_response.error
+        }
+        return system_prompt, prompt, rag_info
+    
+    async def generate_answer_with_chat_context(
+        self,
+        user_prompt: str,
+        chat_id: Optional[UUID] = None,
         ai_model: Optional[str] = None,
-        rag_count: int = 5
+        rag_count: int = 5,
+        conversation_limit: int = 10,
+        filters: Optional[SearchFilters] = None
     ) -> AiResponse:
         """
-        Generate an answer using RAG and AI model
+        Generate an answer with automatic conversation context retrieval
         
         Args:
             user_prompt: The user's question
-            conversation_context: Previous conversation context
+            chat_id: Optional chat ID for retrieving conversation history
             ai_model: AI model to use for generation
             rag_count: Number of documents to retrieve via RAG
+            conversation_limit: Maximum number of recent messages to include
+            filters: Scope of the document retrieval (optional)
             
         Returns:
             AiResponse with generated answer and metadata
         """
         try:
-            # Retrieve relevant documents context using RAG
-            logger.info(f"Retrieving context for prompt: '{user_prompt[:50]}...'")
-            rag_response = await self.rag_service.retrieve_and_format_context(
-                user_prompt=user_prompt,
-                count=rag_count
-            )
-            
-            # Combine RAG context with conversation history
-            full_context = rag_response.context + conversation_context
-            
-            logger.info(f"RAG retrieved {rag_response.document_count} documents for context")
-            
-            # Generate prompts with full context
-            system_prompt, prompt = get_prompts(full_context, user_prompt)
-            
-            # Generate response using AI
-            response: AiResponse = await completion(
-                system_prompt=system_prompt,
-                user_prompt=prompt,
-                ai_model=ai_model
+            start = time.perf_counter()
+            system_prompt, prompt, metadata = await self.prepare_chat_prompts(
+                user_prompt, chat_id, ai_model, rag_count, conversation_limit, filters
             )
+            timings = metadata["timings_ms"]
             
-            # Add RAG metadata to response
-            response.metadata["rag_info"] = {
-                "documents_used": rag_response.document_count,
-                "context_length": rag_response.context_length,
-                "has_context": rag_response.has_context,
-                "document_sources": rag_response.get_document_sources(),
-                "error": rag_response.error
-            }
+            response, prompt_embedding = await self._get_cached_answer(ai_model, user_prompt, system_prompt, metadata)
+            if response is None:
+                # Generate response using AI
+                response = await self._timed(timings, "completion", completion(
+                    system_prompt=system_prompt,
+                    user_prompt=prompt,
+                    ai_model=ai_model,
+                    clients=self.clients
+                ))
+                self._store_answer(ai_model, user_prompt, system_prompt, metadata, response, prompt_embedding)
+            timings["total"] = self._elapsed_ms(start)
+            logger.info(f"Chat turn timings (ms): {timings}")
             
+            response.metadata.update(metadata)
             return response
             
         except Exception as e:
             logger.error(f"Error generating technical answer: {str(e)}")
             raise
     
-    async def generate_answer_with_chat_context(
+    async def stream_answer_with_chat_context(
         self,
         user_prompt: str,
         chat_id: Optional[UUID] = None,
         ai_model: Optional[str] = None,
         rag_count: int = 5,
-        conversation_limit: int = 10
-    ) -> AiResponse:
+        conversation_limit: int = 10,
+        filters: Optional[SearchFilters] = None
+    ) -> Tuple[Dict[str, Any], AsyncIterator[str]]:
         """
-        Generate an answer with automatic conversation context retrieval
+        Prepare the context of an answer and start streaming it
         
         Args:
             user_prompt: The user's question
@@ -125,17 +191,110 @@ class TechnicalAnswerProvider:
             ai_model: AI model to use for generation
             rag_count: Number of documents to retrieve via RAG
             conversation_limit: Maximum number of recent messages to include
+            filters: Scope of the document retrieval (optional)
             
         Returns:
-            AiResponse with generated answer and metadata
+            Tuple of (metadata with rag_info, context_tokens and timings_ms,
+            async iterator over the answer text chunks)
         """
-        # Retrieve conversation context if chat_id is provided
-        conversation_context = await self.get_conversation_context(chat_id, limit=conversation_limit)
+        system_prompt, prompt, metadata = await self.prepare_chat_prompts(
+            user_prompt, chat_id, ai_model, rag_count, conversation_limit, filters
+        )
         
-        # Generate answer with the retrieved context
-        return await self.generate_answer(
-            user_prompt=user_prompt,
-            conversation_context=conversation_context,
+        cached, prompt_embedding = await self._get_cached_answer(ai_model, user_prompt, system_prompt, metadata)
+        if cached is not None:
+            return metadata, self._replay(cached.answer)
+        
+        chunks = stream_completion(
+            system_prompt=system_prompt,
+            user_prompt=prompt,
             ai_model=ai_model,
-            rag_count=rag_count
-        )
\ No newline at end of file
+            clients=self.clients
+        )
+        if self.response_cache is not None:
+            chunks = self._store_when_complete(chunks, ai_model, user_prompt, system_prompt, metadata, prompt_embedding)
+        return metadata, chunks
+    
+    async def _get_cached_answer(
+        self,
+        ai_model: str,
+        user_prompt: str,
+        system_prompt: str,
+        metadata: Dict[str, Any]
+    ) -> Tuple[Optional[AiResponse], Optional[List[float]]]:
+        """
+        Look up the answer cache, if enabled, and record the outcome in metadata.
+        
+        Returns:
+            Tuple of (cached answer or None, prompt embedding for similarity matching or None)
+        """
+        if self.response_cache is None:
+            return None, None
+        
+        prompt_embedding = None
+        if self.response_cache.semantic:
+            # The vector search embedded the same prompt, so this is normally an embedding cache hit
+            prompt_embedding = await self.clients.get_embedding_generator().generate_embedding(user_prompt)
+        
+        cached = self.response_cache.get(
+            ai_model,
+            user_prompt,
+            ResponseCache.context_fingerprint(system_prompt),
+            prompt_embedding
+        )
+        metadata["response_cache"] = "hit" if cached is not None else "miss"
+        return cached, prompt_embedding
+    
+    def _store_answer(
+        self,
+        ai_model: str,
+        user_prompt: str,
+        system_prompt: str,
+        metadata: Dict[str, Any],
+        response: AiResponse,
+        prompt_embedding: Optional[List[float]]
+    ) -> None:
+        if self.response_cache is None or not response.answer:
+            return
+        self.response_cache.set(
+            ai_model,
+            user_prompt,
+            ResponseCache.context_fingerprint(system_prompt),
+            metadata["rag_info"]["document_ids"],
+            response,
+            prompt_embedding
+        )
+    
+    async def _store_when_complete(
+        self,
+        chunks: AsyncIterator[str],
+        ai_model: str,
+        user_prompt: str,
+        system_prompt: str,
+        metadata: Dict[str, Any],
+        prompt_embedding: Optional[List[float]]
+    ) -> AsyncIterator[str]:
+        """Pass a stream through and cache the full answer once it has been generated."""
+        parts: List[str] = []
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        response = AiResponse(finishReason="stop", answer="".join(parts), metadata={})
+        self._store_answer(ai_model, user_prompt, system_prompt, metadata, response, prompt_embedding)
+    
+    @staticmethod
+    async def _replay(answer: str) -> AsyncIterator[str]:
+        yield answer
+    
+    @staticmethod
+    async def _timed(timings: Dict[str, float], stage: str, awaitable: Awaitable[T]) -> T:
+        """Await a pipeline stage and record its duration in milliseconds."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = TechnicalAnswerProvider._elapsed_ms(start)
+    
+    @staticmethod
+    def _elapsed_ms(start: float) -> float:
+        return round((time.perf_counter() - start) * 1000, 1)
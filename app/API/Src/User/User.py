@@ -51,7 +51,7 @@ async def get_users(
 ):
     try:
         repository = UserRepository(db)
-        users, total = await repository.get_users_paginated(limit=limit, offset=offset)
+        users, total, next_cursor = await repository.get_users_paginated(limit=limit, offset=offset)
         
         user_responses = [
             UserResponse(
@@ -66,7 +66,8 @@ async def get_users(
         return UserListResponse(
             users=user_responses,
             total=total,
-            limit=limit
+            limit=limit,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
@@ -0,0 +1,4 @@
+-- Migration to add the keyset pagination index to users table
+-- Run this script to update your existing database schema
+
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id);
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
@@ -14,5 +14,10 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Keyset pagination order
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<User(id={self.id}, login={self.login})>"
\ No newline at end of file
@@ -3,6 +3,7 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, delete
 from app.API.Src.User.models.user import User
+from app.API.Src.core.database.Postgres.pagination import paginate, next_page, count_total
 
 class UserRepository:
     def __init__(self, session: AsyncSession):
@@ -27,19 +28,20 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
     
-    async def get_users_paginated(self, limit: int = 100, offset: int = 0) -> Tuple[List[User], int]:
-        count_result = await self.session.execute(
-            select(func.count(User.id))
-        )
-        total = count_result.scalar()
+    async def get_users_paginated(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> Tuple[List[User], Optional[int], Optional[str]]:
+        total = await count_total(self.session, User, total_mode=total_mode)
         
         result = await self.session.execute(
-            select(User)
-            .order_by(User.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+            paginate(select(User), User, limit, cursor=cursor, offset=offset)
         )
-        return result.scalars().all(), total
+        users, next_cursor = next_page(result.scalars().all(), limit)
+        return users, total, next_cursor
     
     async def delete_user(self, user_id: UUID) -> bool:
         result = await self.session.execute(
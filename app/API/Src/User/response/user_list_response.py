@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import List
+from typing import List, Optional
 from .user_response import UserResponse
 
 
@@ -7,5 +7,6 @@ class UserListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
     users: List[UserResponse]
-    total: int
-    limit: int
\ No newline at end of file
+    total: Optional[int] = None
+    limit: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
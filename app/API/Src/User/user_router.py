@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query
 from uuid import UUID
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.API.Src.core.database.Postgres.database import get_db_session
 from app.API.Src.User.controller.create_user import CreateUserController
@@ -17,8 +18,8 @@ async def create_user(user_request: UserCreateRequest, db: AsyncSession = Depend
     return await CreateUserController.create_user(user_request, db)
 
 @router.get("/users", response_model=UserListResponse, tags=["Users"])
-async def get_users(limit: int = Query(default=100, le=1000), offset: int = Query(default=0, ge=0), db: AsyncSession = Depends(get_db_session)):
-    return await GetUserListController.get_users(limit, offset, db)
+async def get_users(limit: int = Query(default=100, le=1000), offset: int = Query(default=0, ge=0), cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"), total: str = Query(default="exact", pattern="^(exact|estimated|none)$", description="How to compute the total count"), db: AsyncSession = Depends(get_db_session)):
+    return await GetUserListController.get_users(limit, offset, db, cursor, total)
 
 @router.get("/users/{user_id}", response_model=UserResponse, tags=["Users"])
 async def get_user(user_id: UUID, db: AsyncSession = Depends(get_db_session)):
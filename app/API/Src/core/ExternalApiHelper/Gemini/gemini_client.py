@@ -1,11 +1,15 @@
 """
 Gemini client service for AI model integration.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
+import logging
 import google.generativeai as genai
 
 from app.API.Src.core.config import settings
 from app.API.Src.core.ExternalApiHelper.model.ai_response import AiResponse
+from app.API.Src.core.ExternalApiHelper.concurrency import provider_semaphore
+
+logger = logging.getLogger(__name__)
 
 
 class GeminiClient:
@@ -51,7 +55,11 @@ class GeminiClient:
                 gemini_model = genai.GenerativeModel(model)
             
             # Generate content with user prompt
-            response = gemini_model.generate_content(user_prompt)
+            async with provider_semaphore("gemini", settings.GEMINI_MAX_CONCURRENCY):
+                response = await gemini_model.generate_content_async(
+                    user_prompt,
+                    request_options={"timeout": settings.GEMINI_TIMEOUT}
+                )
             
             # Map Gemini response to AiResponse
             # Gemini doesn't provide finish_reason in the same way as OpenAI
@@ -83,5 +91,50 @@ class GeminiClient:
             return AiResponse(finishReason=finish_reason, answer=answer, metadata=metadata)
 
         except Exception as error:
-            print(f"Error in Gemini completion: {error}")
-            raise error
\ No newline at end of file
+            logger.error(f"Error in Gemini completion: {error}")
+            raise error
+
+    async def stream_completion(
+        self,
+        system_prompt: Optional[str],
+        user_prompt: str,
+        model: str = "gemini-2.5-flash"
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion using Gemini API.
+
+        Args:
+            system_prompt: Optional system prompt to set context
+            user_prompt: User's prompt/question
+            model: Model to use for completion
+
+        Yields:
+            str: Text chunks as the model generates them
+
+        Raises:
+            Exception: If API call fails
+        """
+        try:
+            if system_prompt:
+                gemini_model = genai.GenerativeModel(
+                    model_name=model,
+                    system_instruction=system_prompt
+                )
+            else:
+                gemini_model = genai.GenerativeModel(model)
+
+            # The concurrency slot is held until the stream is fully consumed
+            async with provider_semaphore("gemini", settings.GEMINI_MAX_CONCURRENCY):
+                response = await gemini_model.generate_content_async(
+                    user_prompt,
+                    stream=True,
+                    request_options={"timeout": settings.GEMINI_TIMEOUT}
+                )
+                async for chunk in response:
+                    # Chunks without text (e.g. safety-only chunks) raise on .text
+                    if chunk.parts and chunk.text:
+                        yield chunk.text
+
+        except Exception as error:
+            logger.error(f"Error in Gemini streaming completion: {error}")
+            raise error
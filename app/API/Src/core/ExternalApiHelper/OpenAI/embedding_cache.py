@@ -0,0 +1,154 @@
+"""
+Two-tier cache of embedding vectors keyed by (model, sha256(text)).
+
+The memory tier is an LRU bounded by entry count and TTL. The optional disk
+tier is a SQLite file that survives restarts, so re-uploading a corpus or
+repeating a popular query does not pay for the same embedding twice.
+"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+
+class DiskEmbeddingStore:
+    """Persistent (model, hash) -> vector store backed by a SQLite file."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Accessed from worker threads, one at a time
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model, text_hash))"
+        )
+        self.connection.commit()
+
+    def get_many(self, keys: List[CacheKey]) -> Dict[CacheKey, List[float]]:
+        found: Dict[CacheKey, List[float]] = {}
+        with self.lock:
+            for model, text_hash in keys:
+                row = self.connection.execute(
+                    "SELECT vector FROM embeddings WHERE model = ? AND text_hash = ?",
+                    (model, text_hash)
+                ).fetchone()
+                if row is not None:
+                    found[(model, text_hash)] = array("d", row[0]).tolist()
+        return found
+
+    def set_many(self, items: Dict[CacheKey, List[float]]) -> None:
+        rows = [(model, text_hash, array("d", vector).tobytes()) for (model, text_hash), vector in items.items()]
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                rows
+            )
+            self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class EmbeddingCache:
+    """
+    LRU + TTL memory tier with an optional persistent disk tier.
+
+    Entries found on disk are promoted to the memory tier. Disk entries never
+    expire: an embedding is a pure function of the model and the text.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 86400.0, disk_path: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[float]]]" = OrderedDict()
+        self._disk = DiskEmbeddingStore(disk_path) if disk_path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, text: str) -> CacheKey:
+        return model, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    async def get_many(self, model: str, texts: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up embeddings of many texts.
+
+        Returns:
+            Mapping of text to cached embedding; texts not in the cache are absent
+        """
+        found: Dict[str, List[float]] = {}
+        disk_lookups: Dict[CacheKey, str] = {}
+        now = time.monotonic()
+
+        for text in dict.fromkeys(texts):
+            key = self.make_key(model, text)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                found[text] = entry[1]
+                self.memory_hits += 1
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                disk_lookups[key] = text
+
+        stored: Dict[CacheKey, List[float]] = {}
+        if disk_lookups and self._disk is not None:
+            stored = await asyncio.to_thread(self._disk.get_many, list(disk_lookups))
+            for key, vector in stored.items():
+                found[disk_lookups[key]] = vector
+                self._remember(key, vector)
+            self.disk_hits += len(stored)
+
+        self.misses += len(disk_lookups) - len(stored)
+        return found
+
+    async def set_many(self, model: str, embeddings: Dict[str, List[float]]) -> None:
+        """Store freshly generated embeddings in every tier."""
+        items = {self.make_key(model, text): vector for text, vector in embeddings.items()}
+        for key, vector in items.items():
+            self._remember(key, vector)
+
+        if items and self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.set_many, items)
+            except Exception as e:
+                # The memory tier still has the vectors; a disk failure must not fail the request
+                logger.warning(f"Failed to persist {len(items)} embeddings: {e}")
+
+    def _remember(self, key: CacheKey, vector: List[float]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": True,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._entries),
+            "max_size": self.max_size,
+            "persistent": self._disk is not None
+        }
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
@@ -1,21 +1,125 @@
-from typing import List
-import openai
+from typing import List, Optional
+import asyncio
+import tiktoken
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, RateLimitError
 from app.API.Src.core.config import settings
+from app.API.Src.core.ExternalApiHelper.concurrency import provider_semaphore
+from app.API.Src.core.ExternalApiHelper.OpenAI.embedding_cache import EmbeddingCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def is_transient(error: Exception) -> bool:
+    """Rate limits, timeouts, connection errors and server errors may succeed when retried."""
+    if isinstance(error, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
 class EmbeddingGenerator:
-    def __init__(self):
-        openai.api_key = settings.OPENAI_API_KEY
+    def __init__(self, client: Optional[AsyncOpenAI] = None, cache: Optional[EmbeddingCache] = None):
+        # Requests are retried by _embed_batch only, not also by the SDK
+        self.client = (client or AsyncOpenAI(api_key=settings.OPENAI_API_KEY)).with_options(max_retries=0)
+        self.cache = cache
+        self.max_batch_size = settings.EMBEDDING_BATCH_SIZE
+        self.max_batch_tokens = settings.EMBEDDING_BATCH_TOKENS
+        self.max_retries = settings.EMBEDDING_MAX_RETRIES
+        self.tokenizer: Optional[tiktoken.Encoding] = None
     
     async def generate_embedding(self, text: str) -> List[float]:
-        try:
-            response = openai.embeddings.create(
-                model=settings.EMBEDDING_MODEL,
-                input=text
+        if self.cache is not None:
+            cached = await self.cache.get_many(settings.EMBEDDING_MODEL, [text])
+            if text in cached:
+                return cached[text]
+        
+        embedding = (await self._embed_batch([text]))[0]
+        if self.cache is not None:
+            await self.cache.set_many(settings.EMBEDDING_MODEL, {text: embedding})
+        return embedding
+    
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts using as few API requests as possible.
+        
+        Texts found in the cache, and repeated texts, are not sent. The rest are
+        packed into batches that respect the provider limits on the number of
+        inputs and total tokens per request. Batches are sent concurrently, up
+        to EMBEDDING_MAX_CONCURRENCY at a time. A failing batch is retried on
+        its own, without resending batches that already succeeded.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Embedding vectors in the same order as the input texts
+        """
+        if not texts:
+            return []
+        
+        known = await self.cache.get_many(settings.EMBEDDING_MODEL, texts) if self.cache is not None else {}
+        missing = [text for text in dict.fromkeys(texts) if text not in known]
+        
+        if missing:
+            batches = self._pack_batches(missing)
+            logger.info(f"Generating {len(missing)} embeddings in {len(batches)} requests ({len(texts) - len(missing)} cached or repeated)")
+            
+            results = await asyncio.gather(
+                *(self._embed_batch([missing[i] for i in batch]) for batch in batches)
             )
-            return response.data[0].embedding
-        except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
-            raise
\ No newline at end of file
+            generated = {}
+            for batch, batch_embeddings in zip(batches, results):
+                for index, embedding in zip(batch, batch_embeddings):
+                    generated[missing[index]] = embedding
+            
+            if self.cache is not None:
+                await self.cache.set_many(settings.EMBEDDING_MODEL, generated)
+            known.update(generated)
+        
+        return [known[text] for text in texts]
+    
+    def _pack_batches(self, texts: List[str]) -> List[List[int]]:
+        """Group text indices into batches within the input count and token limits."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        
+        for index, text in enumerate(texts):
+            tokens = self._count_tokens(text)
+            if current and (len(current) >= self.max_batch_size or current_tokens + tokens > self.max_batch_tokens):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(index)
+            current_tokens += tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a single batch, retrying it with exponential backoff on transient errors."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with provider_semaphore("embeddings", settings.EMBEDDING_MAX_CONCURRENCY):
+                    response = await self.client.embeddings.create(
+                        model=settings.EMBEDDING_MODEL,
+                        input=texts
+                    )
+                # The API may return items out of order; index maps them back to the input
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            except Exception as e:
+                if attempt == self.max_retries or not is_transient(e):
+                    logger.error(f"Failed to generate embeddings for batch of {len(texts)} texts: {e}")
+                    raise
+                delay = 2 ** attempt
+                logger.warning(f"Embedding batch of {len(texts)} texts failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+    
+    def _count_tokens(self, text: str) -> int:
+        if self.tokenizer is None:
+            try:
+                self.tokenizer = tiktoken.encoding_for_model(settings.EMBEDDING_MODEL)
+            except KeyError:
+                self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        return len(self.tokenizer.encode(text, disallowed_special=()))
@@ -1,12 +1,16 @@
 """
 OpenAI client service for AI model integration.
 """
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from typing import List, Dict, Any, Optional, AsyncIterator
+import logging
+from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
 
 from app.API.Src.core.config import settings
 from app.API.Src.core.ExternalApiHelper.model.ai_response import AiResponse
+from app.API.Src.core.ExternalApiHelper.concurrency import provider_semaphore
+
+logger = logging.getLogger(__name__)
 
 
 class OpenAIClient:
@@ -14,11 +18,14 @@ class OpenAIClient:
     OpenAI client service for handling AI model interactions.
     """
 
-    def __init__(self):
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
         """
         Initialize OpenAI client.
+
+        Args:
+            client: Shared AsyncOpenAI client; a new one is created if omitted
         """
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = client or AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
     async def completion(
         self,
@@ -47,10 +54,11 @@ class OpenAIClient:
                 messages.append({"role": "system", "content": system_prompt})
             messages.append({"role": "user", "content": user_prompt})
 
-            chat_completion: ChatCompletion = self.client.chat.completions.create(
-                messages=messages,
-                model=model
-            )
+            async with provider_semaphore("openai", settings.OPENAI_MAX_CONCURRENCY):
+                chat_completion: ChatCompletion = await self.client.chat.completions.create(
+                    messages=messages,
+                    model=model
+                )
 
             # Map OpenAI response to AiResponse
             finish_reason = chat_completion.choices[0].finish_reason if chat_completion.choices else "unknown"
@@ -64,5 +72,47 @@ class OpenAIClient:
             return AiResponse(finishReason=finish_reason, answer=answer, metadata=metadata)
 
         except Exception as error:
-            print(f"Error in OpenAI completion: {error}")
+            logger.error(f"Error in OpenAI completion: {error}")
+            raise error
+
+
+    async def stream_completion(
+        self,
+        system_prompt: Optional[str],
+        user_prompt: str,
+        model: str = "gpt-4"
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion using OpenAI API.
+
+        Args:
+            system_prompt: Optional system prompt to set context
+            user_prompt: User's prompt/question
+            model: Model to use for completion
+
+        Yields:
+            str: Text deltas as the model generates them
+
+        Raises:
+            Exception: If API call fails
+        """
+        try:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": user_prompt})
+
+            # The concurrency slot is held until the stream is fully consumed
+            async with provider_semaphore("openai", settings.OPENAI_MAX_CONCURRENCY):
+                stream = await self.client.chat.completions.create(
+                    messages=messages,
+                    model=model,
+                    stream=True
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+
+        except Exception as error:
+            logger.error(f"Error in OpenAI streaming completion: {error}")
             raise error
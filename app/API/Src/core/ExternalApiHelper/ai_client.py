@@ -1,15 +1,27 @@
-from typing import Optional
-from app.API.Src.core.ExternalApiHelper.OpenAI.openai_client import OpenAIClient
-from app.API.Src.core.ExternalApiHelper.Gemini.gemini_client import GeminiClient
+from typing import Optional, AsyncIterator
+from app.API.Src.core.ExternalApiHelper.client_registry import ClientRegistry, client_registry
 from app.API.Src.core.ExternalApiHelper.model.ai_response import AiResponse
 
 
-async def completion(system_prompt: Optional[str], user_prompt: str, ai_model: str) -> AiResponse:
+async def completion(system_prompt: Optional[str], user_prompt: str, ai_model: str, clients: Optional[ClientRegistry] = None) -> AiResponse:
+    clients = clients or client_registry
     if ai_model == "gpt-4":
-        client = OpenAIClient()
+        client = clients.get_openai_client()
         return await client.completion(system_prompt=system_prompt, user_prompt=user_prompt, model="gpt-4")
     elif ai_model in ["gemini-2.5-flash", "gemini-pro", "gemini-1.5-pro", "gemini-1.5-flash"]:
-        client = GeminiClient()
+        client = clients.get_gemini_client()
         return await client.completion(system_prompt=system_prompt, user_prompt=user_prompt, model=ai_model)
     else:
         raise ValueError(f"Unsupported AI model: {ai_model}")
+
+
+def stream_completion(system_prompt: Optional[str], user_prompt: str, ai_model: str, clients: Optional[ClientRegistry] = None) -> AsyncIterator[str]:
+    clients = clients or client_registry
+    if ai_model == "gpt-4":
+        client = clients.get_openai_client()
+        return client.stream_completion(system_prompt=system_prompt, user_prompt=user_prompt, model="gpt-4")
+    elif ai_model in ["gemini-2.5-flash", "gemini-pro", "gemini-1.5-pro", "gemini-1.5-flash"]:
+        client = clients.get_gemini_client()
+        return client.stream_completion(system_prompt=system_prompt, user_prompt=user_prompt, model=ai_model)
+    else:
+        raise ValueError(f"Unsupported AI model: {ai_model}")
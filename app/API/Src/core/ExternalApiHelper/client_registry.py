@@ -0,0 +1,116 @@
+"""
+Process-wide registry of external service clients.
+"""
+from typing import Optional
+import logging
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.API.Src.core.config import settings
+from app.API.Src.core.ExternalApiHelper.OpenAI.openai_client import OpenAIClient
+from app.API.Src.core.ExternalApiHelper.OpenAI.embedding_generator import EmbeddingGenerator
+from app.API.Src.core.ExternalApiHelper.OpenAI.embedding_cache import EmbeddingCache
+from app.API.Src.core.ExternalApiHelper.Gemini.gemini_client import GeminiClient
+from app.API.Src.core.database.vector_store import VectorStore, create_vector_store
+from app.API.Src.Tools.Technical_anwer.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class ClientRegistry:
+    """
+    Holds provider clients created once at application startup.
+
+    The OpenAI completion and embedding clients share one keep-alive HTTP
+    connection pool, so chat turns and uploads reuse open connections instead
+    of paying connection setup and TLS handshakes on every request.
+    """
+
+    def __init__(self):
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._openai_client: Optional[OpenAIClient] = None
+        self._gemini_client: Optional[GeminiClient] = None
+        self._embedding_generator: Optional[EmbeddingGenerator] = None
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        self._response_cache: Optional[ResponseCache] = None
+        self._qdrant_repository: Optional[VectorStore] = None
+
+    async def connect(self) -> None:
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_POOL_SIZE,
+                max_keepalive_connections=settings.OPENAI_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(settings.OPENAI_TIMEOUT, connect=settings.OPENAI_CONNECT_TIMEOUT)
+        )
+        openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=self._http_client)
+
+        self._openai_client = OpenAIClient(client=openai_client)
+        if settings.EMBEDDING_CACHE_SIZE > 0:
+            self._embedding_cache = EmbeddingCache(
+                max_size=settings.EMBEDDING_CACHE_SIZE,
+                ttl=settings.EMBEDDING_CACHE_TTL,
+                disk_path=settings.EMBEDDING_CACHE_PATH or None
+            )
+        self._embedding_generator = EmbeddingGenerator(client=openai_client, cache=self._embedding_cache)
+        self._gemini_client = GeminiClient()
+        if settings.RESPONSE_CACHE_ENABLED:
+            self._response_cache = ResponseCache(
+                max_size=settings.RESPONSE_CACHE_SIZE,
+                ttl=settings.RESPONSE_CACHE_TTL,
+                similarity_threshold=settings.RESPONSE_CACHE_SIMILARITY
+            )
+        self._qdrant_repository = create_vector_store()
+        logger.info(f"Client registry initialized (OpenAI pool size: {settings.OPENAI_POOL_SIZE})")
+
+    async def disconnect(self) -> None:
+        if self._http_client:
+            await self._http_client.aclose()
+            self._http_client = None
+        self._openai_client = None
+        self._gemini_client = None
+        self._embedding_generator = None
+        if self._embedding_cache:
+            self._embedding_cache.close()
+            self._embedding_cache = None
+        self._response_cache = None
+        self._qdrant_repository = None
+        logger.info("Client registry closed")
+
+    def get_openai_client(self) -> OpenAIClient:
+        return self._require(self._openai_client)
+
+    def get_gemini_client(self) -> GeminiClient:
+        return self._require(self._gemini_client)
+
+    def get_embedding_generator(self) -> EmbeddingGenerator:
+        return self._require(self._embedding_generator)
+
+    def get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Embedding cache, or None when disabled by EMBEDDING_CACHE_SIZE=0."""
+        self._require(self._embedding_generator)
+        return self._embedding_cache
+
+    def get_response_cache(self) -> Optional[ResponseCache]:
+        """Chat answer cache, or None when disabled or before connect()."""
+        return self._response_cache
+
+    def get_qdrant_repository(self) -> VectorStore:
+        """Vector store of documents: Qdrant, or the in-process index with VECTOR_STORE_BACKEND=numpy."""
+        return self._require(self._qdrant_repository)
+
+    @staticmethod
+    def _require(client):
+        if client is None:
+            raise RuntimeError("Client registry not initialized. Call connect() first.")
+        return client
+
+
+client_registry = ClientRegistry()
+
+
+def get_client_registry() -> ClientRegistry:
+    """FastAPI dependency returning the process-wide client registry."""
+    return client_registry
@@ -0,0 +1,32 @@
+"""
+Process-wide concurrency limits for external AI providers.
+"""
+import asyncio
+import weakref
+from typing import Dict, Tuple
+
+# Event loop -> {(provider, limit): semaphore}; a semaphore only works in the loop it was first used in
+_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def provider_semaphore(provider: str, limit: int) -> asyncio.Semaphore:
+    """
+    Get the semaphore limiting concurrent requests to a provider.
+
+    Semaphores are created lazily for the running event loop, so clients used
+    from several loops (tests, worker threads) each get their own, and they
+    are dropped with their loop.
+
+    Args:
+        provider: Provider name, e.g. "openai", "gemini" or "embeddings"
+        limit: Maximum number of concurrent requests; a different limit gets its own semaphore
+
+    Returns:
+        asyncio.Semaphore shared by all clients of the provider in the running loop
+    """
+    loop_semaphores: Dict[Tuple[str, int], asyncio.Semaphore] = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = loop_semaphores.get((provider, limit))
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(limit)
+        loop_semaphores[(provider, limit)] = semaphore
+    return semaphore
@@ -7,6 +7,33 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     GEMINI_API_KEY: str
     EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    EMBEDDING_BATCH_SIZE: int = 2048  # Max inputs per embeddings request
+    EMBEDDING_BATCH_TOKENS: int = 300000  # Max total tokens per embeddings request
+    EMBEDDING_MAX_RETRIES: int = 3
+    
+    # Embedding cache: in-memory LRU bounds, and optional SQLite file for the persistent tier
+    EMBEDDING_CACHE_SIZE: int = 10000  # Max vectors kept in memory (0 disables the cache)
+    EMBEDDING_CACHE_TTL: float = 86400.0  # Seconds a vector stays in the memory tier
+    EMBEDDING_CACHE_PATH: str = ""  # e.g. ./cache/embeddings.sqlite3; empty disables the persistent tier
+    
+    # Chat answer cache (opt-in)
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_SIZE: int = 1000
+    RESPONSE_CACHE_TTL: float = 3600.0  # Seconds
+    RESPONSE_CACHE_SIMILARITY: float = 0.0  # Min prompt embedding cosine similarity for a fuzzy hit; 0 = exact prompts only
+    
+    # Max concurrent in-flight requests per AI provider
+    OPENAI_MAX_CONCURRENCY: int = 16
+    GEMINI_MAX_CONCURRENCY: int = 16
+    EMBEDDING_MAX_CONCURRENCY: int = 8
+    
+    # Provider connection pools and timeouts (seconds)
+    OPENAI_POOL_SIZE: int = 20
+    OPENAI_KEEPALIVE_CONNECTIONS: int = 10
+    OPENAI_KEEPALIVE_EXPIRY: float = 30.0
+    OPENAI_TIMEOUT: float = 60.0
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    GEMINI_TIMEOUT: float = 60.0
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
     
@@ -22,16 +49,73 @@ class Settings(BaseSettings):
     
     # Document storage
     CORPUS_PATH: str = Field(default="./Corpus", env="CORPUS_PATH")
+    UPLOAD_READ_SIZE: int = 1048576  # Bytes of an upload read and written to Corpus per step
     
     # Qdrant configuration
     QDRANT_HOST: str = "qdrant"
     QDRANT_PORT: int = 6333
     QDRANT_GRPC_PORT: int = 6334
+    QDRANT_PREFER_GRPC: bool = True  # gRPC transport (binary vectors) instead of REST/JSON
+    QDRANT_TIMEOUT: int = 10  # Seconds per request
+    QDRANT_HEALTH_CHECK_TIMEOUT: float = 2.0  # Seconds
     VECTOR_SIZE: int = 1536  # OpenAI embedding size
+    QDRANT_UPSERT_BATCH_SIZE: int = 256  # Max points per upsert request
+    
+    # Qdrant collection storage and index; applied when the collection is created, or by
+    # python -m app.API.Src.core.database.Qdrant.migrations.apply_collection_config
+    QDRANT_QUANTIZATION: str = "none"  # none, scalar (int8, 4x smaller) or product
+    QDRANT_SCALAR_QUANTILE: float = 0.99
+    QDRANT_PRODUCT_COMPRESSION: str = "x16"  # x4, x8, x16, x32 or x64
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True  # Keep quantized vectors in RAM, originals may be on disk
+    QDRANT_QUANTIZATION_RESCORE: bool = True  # Rescore quantized results with the original vectors
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = 2.0  # Candidates fetched per result before rescoring
+    QDRANT_VECTORS_ON_DISK: bool = False  # Memory-map original vectors instead of keeping them in RAM
+    QDRANT_PAYLOAD_ON_DISK: bool = False
+    QDRANT_HNSW_M: int = 16  # Links per node; more improves recall and costs memory
+    QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    QDRANT_HNSW_ON_DISK: bool = False
+    QDRANT_SEARCH_EF: int = 0  # Search-time ef; 0 uses the Qdrant default
+    
+    # Vector store: "qdrant", or "numpy" for an in-process index (tests, CI, small single-process deployments)
+    VECTOR_STORE_BACKEND: str = "qdrant"
+    NUMPY_INDEX_PATH: str = ""  # Directory the numpy index is persisted in, rewritten on every write; empty keeps it in memory only
+    
+    # Retrieval
+    RETRIEVAL_MODE: str = "dense"  # dense, lexical or hybrid
+    HYBRID_CANDIDATES: int = 20  # Results taken from each of dense and lexical search before fusion
+    RRF_K: int = 60  # Reciprocal rank fusion constant
+    RERANK_ENABLED: bool = False  # Rescore over-fetched candidates on CPU before building the prompt
+    RERANK_CANDIDATES: int = 20  # Candidates retrieved for the rerank stage
+    RERANK_WEIGHT: float = 0.5  # Share of the lexical overlap score; the rest is the retrieval rank
     
     # Document processing
     DOCUMENT_TOKEN_LIMIT: int = Field(default=500, env="DOCUMENT_TOKEN_LIMIT")
     
+    # Background ingestion of uploaded documents (queue in the ingestion_jobs table)
+    INGESTION_WORKERS: int = 2  # Jobs processed concurrently per API process
+    INGESTION_BATCH_SIZE: int = 64  # Chunks embedded and stored per step; progress is reported per step
+    INGESTION_READ_SIZE: int = 65536  # Characters of a file read and split per step
+    INGESTION_POLL_INTERVAL: float = 2.0  # Seconds between queue checks of an idle worker
+    INGESTION_MAX_ATTEMPTS: int = 3  # Attempts before a job is marked failed
+    INGESTION_STALE_AFTER: float = 300.0  # Seconds without progress before a running job is taken over
+    
+    # Bulk import of directories and archives (POST /documents/imports or
+    # python -m app.API.Src.Document.ingestion.bulk_import)
+    BULK_IMPORT_PROCESSES: int = 0  # Splitting processes; 0 uses one per CPU
+    BULK_IMPORT_ROOT: str = "./Corpus"  # Directories imported through the API must be inside it
+    BULK_IMPORT_MAX_FILES: int = 100000  # .md files an archive may contain
+    BULK_IMPORT_MAX_EXTRACTED_BYTES: int = 1073741824  # Total uncompressed size of the .md files of an archive
+    
+    # Deduplication of chunks at ingestion: copies are linked to a canonical chunk and not embedded
+    DEDUP_ENABLED: bool = True
+    DEDUP_NEAR_THRESHOLD: float = 0.9  # Estimated Jaccard similarity of the shingles of near-duplicates; 1.0 links exact copies only
+    
+    # Prompt context assembly (tokens)
+    CONTEXT_TOKEN_BUDGET: int = 6000  # Budget of models without their own entry in MODEL_CONTEXT_BUDGETS
+    CONTEXT_HISTORY_SHARE: float = 0.25  # Share of the budget kept for chat history
+    CONTEXT_RECENT_MESSAGES: int = 4  # Newest messages kept verbatim
+    CONTEXT_COMPRESSED_MESSAGE_TOKENS: int = 64  # Older messages are truncated to this length
+    
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
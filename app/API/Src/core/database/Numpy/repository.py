@@ -0,0 +1,264 @@
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+import json
+import logging
+import os
+
+import numpy as np
+
+from app.API.Src.core.config import settings
+from app.API.Src.core.database.vector_store import VectorStore
+from app.API.Src.core.database.Qdrant.models import VectorDocument, SearchResult, VectorSearchQuery
+
+logger = logging.getLogger(__name__)
+
+
+class NumpyRepository(VectorStore):
+    """
+    In-process vector store with exact cosine search.
+
+    Vectors are normalized on insert and kept as rows of one contiguous
+    float32 matrix, so a search is a single matrix-vector product followed
+    by a partial sort. Meant for tests, CI and small single-process
+    deployments, and as an exact baseline for Qdrant. A filtered search
+    evaluates the filter in a Python loop over every payload, so it costs
+    far more per point than an unfiltered one.
+
+    With a path, the collection is saved after every write (matrix as .npy,
+    IDs and payloads as .json) and memory-mapped when opened, so startup does
+    not read the whole matrix; it is copied into memory on the first write.
+    Every save rewrites both files, so the I/O of filling an index grows with
+    the square of its size: persistence is for small indexes only, use Qdrant
+    for large corpora or bulk imports.
+    """
+
+    def __init__(self, collection_name: str = "documents", path: Optional[str] = None):
+        self.collection_name = collection_name
+        self.vector_size = settings.VECTOR_SIZE
+        self.path = Path(path) if path else None
+        self._vectors = np.empty((0, self.vector_size), dtype=np.float32)
+        self._count = 0
+        self._ids: List[str] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+
+    @property
+    def _matrix_path(self) -> Optional[Path]:
+        return self.path / f"{self.collection_name}.npy" if self.path else None
+
+    @property
+    def _points_path(self) -> Optional[Path]:
+        return self.path / f"{self.collection_name}.json" if self.path else None
+
+    async def create_collection(self) -> bool:
+        try:
+            if self.path and self._matrix_path.exists():
+                self._load()
+                logger.info(f"Opened collection '{self.collection_name}' with {self._count} points from {self.path}")
+            else:
+                self._vectors = np.empty((0, self.vector_size), dtype=np.float32)
+                logger.info(f"Created collection '{self.collection_name}'")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to create collection: {e}")
+            return False
+
+    async def upsert_document(self, document: VectorDocument, vector: List[float]) -> bool:
+        return await self.upsert_documents([document], [vector])
+
+    async def upsert_documents(
+        self,
+        documents: List[VectorDocument],
+        vectors: List[List[float]],
+        batch_size: Optional[int] = None
+    ) -> bool:
+        """
+        Upsert many documents; batch_size is accepted for interface compatibility.
+
+        Returns:
+            True if every point was written
+        """
+        try:
+            matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), self.vector_size)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1, norms)
+
+            self._reserve(self._count + len(documents))
+            for document, row in zip(documents, matrix):
+                position = self._positions.get(document.id)
+                if position is None:
+                    position = self._count
+                    self._count += 1
+                    self._ids.append(document.id)
+                    self._payloads.append({})
+                    self._positions[document.id] = position
+                self._vectors[position] = row
+                self._payloads[position] = {"summary": document.summary, **document.metadata}
+
+            self._save()
+            logger.info(f"Upserted {len(documents)} documents")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to upsert documents: {e}")
+            return False
+
+    async def update_payloads(self, payloads: Dict[str, Dict[str, Any]]) -> bool:
+        try:
+            for document_id, payload in payloads.items():
+                position = self._positions.get(str(document_id))
+                if position is not None:
+                    self._payloads[position] = {**self._payloads[position], **payload}
+
+            self._save()
+            logger.info(f"Updated the payload of {len(payloads)} documents")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to update payloads: {e}")
+            return False
+
+    async def search_similar(self, query: VectorSearchQuery) -> List[SearchResult]:
+        try:
+            if self._count == 0 or query.limit <= 0:
+                return []
+
+            vector = np.asarray(query.query_vector, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            scores = self._vectors[:self._count] @ (vector / norm if norm else vector)
+
+            candidates = np.arange(self._count)
+            if query.filter_conditions:
+                candidates = np.array(
+                    [i for i in candidates if self._matches(self._payloads[i], query.filter_conditions)],
+                    dtype=np.int64
+                )
+            if query.score_threshold is not None and len(candidates):
+                candidates = candidates[scores[candidates] >= query.score_threshold]
+            if not len(candidates):
+                return []
+
+            # Partial sort: only the top `limit` candidates are ordered
+            if len(candidates) > query.limit:
+                top = np.argpartition(-scores[candidates], query.limit - 1)[:query.limit]
+                candidates = candidates[top]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+            return [
+                SearchResult(
+                    id=self._ids[i],
+                    content=self._payloads[i].get("summary", ""),
+                    file_path="",
+                    score=float(scores[i]),
+                    metadata={k: v for k, v in self._payloads[i].items() if k != "summary"}
+                )
+                for i in candidates
+            ]
+
+        except Exception as e:
+            logger.error(f"Failed to search documents: {e}")
+            return []
+
+    async def delete_document(self, document_id: str) -> bool:
+        return await self.delete_documents([document_id])
+
+    async def delete_documents(self, document_ids: List[str]) -> bool:
+        try:
+            self._make_writable()
+            for document_id in document_ids:
+                position = self._positions.pop(str(document_id), None)
+                if position is None:
+                    continue
+                # Move the last point into the freed row to keep the matrix contiguous
+                last = self._count - 1
+                if position != last:
+                    self._vectors[position] = self._vectors[last]
+                    self._ids[position] = self._ids[last]
+                    self._payloads[position] = self._payloads[last]
+                    self._positions[self._ids[position]] = position
+                self._ids.pop()
+                self._payloads.pop()
+                self._count -= 1
+
+            self._save()
+            logger.info(f"Deleted {len(document_ids)} documents")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            return False
+
+    async def get_collection_info(self) -> dict:
+        return {
+            "name": self.collection_name,
+            "vector_size": self.vector_size,
+            "vectors_count": self._count,
+            "indexed_vectors_count": self._count,
+            "points_count": self._count
+        }
+
+    def _reserve(self, size: int) -> None:
+        """Grow the matrix geometrically so appends are amortized O(1)."""
+        self._make_writable()
+        if size <= len(self._vectors):
+            return
+        vectors = np.empty((max(size, 2 * len(self._vectors), 64), self.vector_size), dtype=np.float32)
+        vectors[:self._count] = self._vectors[:self._count]
+        self._vectors = vectors
+
+    def _make_writable(self) -> None:
+        if isinstance(self._vectors, np.memmap) or not self._vectors.flags.writeable:
+            self._vectors = np.array(self._vectors[:self._count], dtype=np.float32)
+
+    def _load(self) -> None:
+        self._vectors = np.load(self._matrix_path, mmap_mode="r")
+        points = json.loads(self._points_path.read_text(encoding="utf-8"))
+        self._ids = points["ids"]
+        self._payloads = points["payloads"]
+        self._count = len(self._ids)
+        self._positions = {document_id: i for i, document_id in enumerate(self._ids)}
+        if self._vectors.shape != (self._count, self.vector_size):
+            raise ValueError(f"Index shape {self._vectors.shape} does not match {self._count} points of size {self.vector_size}")
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Write to temporary files and rename, so a crash never leaves a half-written index
+        matrix_tmp = self._matrix_path.with_suffix(".npy.tmp")
+        with open(matrix_tmp, "wb") as file:
+            np.save(file, self._vectors[:self._count])
+        points_tmp = self._points_path.with_suffix(".json.tmp")
+        points_tmp.write_text(json.dumps({"ids": self._ids, "payloads": self._payloads}), encoding="utf-8")
+        os.replace(matrix_tmp, self._matrix_path)
+        os.replace(points_tmp, self._points_path)
+
+    @staticmethod
+    def _matches(payload: Dict[str, Any], conditions: Dict[str, Any]) -> bool:
+        """
+        Evaluate a Qdrant-style filter (must / should / must_not lists of
+        {"key": ..., "match": {"value": ...} or {"any": [...]}} or
+        {"key": ..., "range": {"gte": ..., "lte": ...}}) on a payload.
+        """
+        def condition_matches(condition: Dict[str, Any]) -> bool:
+            value = payload.get(condition["key"])
+            if "range" in condition:
+                bounds = condition["range"]
+                return value is not None \
+                    and (bounds.get("gte") is None or value >= bounds["gte"]) \
+                    and (bounds.get("lte") is None or value <= bounds["lte"])
+            match = condition.get("match", {})
+            if "value" in match:
+                return value == match["value"] or (isinstance(value, list) and match["value"] in value)
+            if "any" in match:
+                values = value if isinstance(value, list) else [value]
+                return any(item in match["any"] for item in values)
+            raise ValueError(f"Unsupported filter condition: {condition}")
+
+        if not all(condition_matches(condition) for condition in conditions.get("must", [])):
+            return False
+        if any(condition_matches(condition) for condition in conditions.get("must_not", [])):
+            return False
+        should = conditions.get("should", [])
+        return not should or any(condition_matches(condition) for condition in should)
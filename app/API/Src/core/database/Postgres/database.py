@@ -27,6 +27,8 @@ async def init_db():
     from app.API.Src.Chat.models.chat_history import ChatHistory  # Import to register model
     from app.API.Src.Chat.models.message import Message  # Import to register model
     from app.API.Src.Document.models.document import Base as DocumentBase
+    from app.API.Src.Document.models.ingestion_job import IngestionJob  # Import to register model
+    from app.API.Src.Document.models.document_band import DocumentBand  # Import to register model
     from app.API.Src.User.models.user import Base as UserBase
     async with engine.begin() as conn:
         await conn.run_sync(ChatBase.metadata.create_all)
@@ -0,0 +1,104 @@
+"""
+Keyset (cursor) pagination helpers for listing endpoints.
+
+Pages are ordered by (created_at, id) descending. The cursor encodes the
+position of the last row of a page, so fetching the next page is an index
+range scan no matter how deep it is, unlike OFFSET which reads and discards
+every skipped row.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+TOTAL_MODES = ("exact", "estimated", "none")
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encode a row position as an opaque cursor string."""
+    payload = json.dumps({"created_at": created_at.isoformat(), "id": str(row_id)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["created_at"]), UUID(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def paginate(query: Select, model: Any, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Select:
+    """
+    Order a query by (created_at, id) descending and restrict it to one page.
+
+    One extra row is fetched so that next_page can tell whether more rows exist.
+
+    Args:
+        query: Select of the model
+        model: Mapped class with created_at and id columns
+        limit: Page size
+        cursor: Cursor of the previous page (optional)
+        offset: Legacy offset, only applied when no cursor is given
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        return query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return query.offset(offset)
+
+
+def next_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched by paginate and build the cursor of the next page."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+async def count_total(
+    session: AsyncSession,
+    model: Any,
+    filters: Sequence[Any] = (),
+    total_mode: str = "exact"
+) -> Optional[int]:
+    """
+    Count rows of a model according to the requested total mode.
+
+    Args:
+        session: Database session
+        model: Mapped class to count
+        filters: Optional WHERE criteria
+        total_mode: "exact" runs count(*), "estimated" reads the planner row
+            estimate from pg_class (exact when filters are given), "none" skips counting
+
+    Returns:
+        Row count, or None when counting was skipped
+    """
+    if total_mode == "none":
+        return None
+
+    if total_mode == "estimated" and not filters and session.bind.dialect.name == "postgresql":
+        result = await session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+            {"table": model.__tablename__}
+        )
+        estimate = result.scalar()
+        # reltuples is -1 (or 0) until the table has been analyzed
+        if estimate is not None and estimate > 0:
+            return estimate
+
+    result = await session.execute(select(func.count(model.id)).where(*filters))
+    return result.scalar()
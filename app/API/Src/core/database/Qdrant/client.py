@@ -1,33 +1,101 @@
-from qdrant_client import QdrantClient
-from qdrant_client.http import models
-from typing import Optional
+from qdrant_client import AsyncQdrantClient
+from typing import Awaitable, Callable, Optional, TypeVar
+import asyncio
 import logging
 
 from app.API.Src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 class QdrantDatabase:
+    """
+    Async Qdrant client over gRPC (QDRANT_PREFER_GRPC) or REST.
+
+    gRPC sends vectors as packed protobuf floats instead of JSON text, about
+    5x fewer bytes for a 1536-dim vector. Operations go through run(), which
+    checks the connection when an operation fails, recreates the client if
+    Qdrant stopped answering, and retries once.
+    """
+
     def __init__(self):
-        self.client: Optional[QdrantClient] = None
-        
+        self.client: Optional[AsyncQdrantClient] = None
+        self._reconnect_lock = asyncio.Lock()
+
     async def connect(self) -> None:
         try:
-            self.client = QdrantClient(url=settings.QDRANT_URL)
-            logger.info(f"Connected to Qdrant at {settings.QDRANT_URL}")
+            self.client = self._create_client()
+            transport = "gRPC" if settings.QDRANT_PREFER_GRPC else "REST"
+            logger.info(f"Connected to Qdrant at {settings.QDRANT_HOST} over {transport}")
         except Exception as e:
             logger.error(f"Failed to connect to Qdrant: {e}")
             raise
-    
+
     async def disconnect(self) -> None:
         if self.client:
-            self.client.close()
+            await self.client.close()
             self.client = None
             logger.info("Disconnected from Qdrant")
-    
-    def get_client(self) -> QdrantClient:
+
+    def get_client(self) -> AsyncQdrantClient:
         if not self.client:
             raise RuntimeError("Qdrant client not initialized. Call connect() first.")
         return self.client
 
+    async def health_check(self) -> bool:
+        """Return whether Qdrant answers a lightweight request within QDRANT_HEALTH_CHECK_TIMEOUT."""
+        if not self.client:
+            return False
+        try:
+            await asyncio.wait_for(self.client.get_collections(), timeout=settings.QDRANT_HEALTH_CHECK_TIMEOUT)
+            return True
+        except Exception as e:
+            logger.warning(f"Qdrant health check failed: {e}")
+            return False
+
+    async def reconnect(self) -> None:
+        """Replace the client with a new one, dropping its channel or connection pool."""
+        old_client = self.client
+        self.client = self._create_client()
+        if old_client:
+            try:
+                await old_client.close()
+            except Exception as e:
+                logger.warning(f"Error closing previous Qdrant client: {e}")
+        logger.info("Reconnected to Qdrant")
+
+    async def run(self, operation: Callable[[AsyncQdrantClient], Awaitable[T]]) -> T:
+        """
+        Run an operation with the client, reconnecting once if the connection is broken.
+
+        Args:
+            operation: Coroutine function taking the client
+
+        Returns:
+            Result of the operation
+        """
+        client = self.get_client()
+        try:
+            return await operation(client)
+        except Exception:
+            # Errors from a healthy server (bad request, missing collection) are not retried
+            if await self.health_check():
+                raise
+            async with self._reconnect_lock:
+                # Another request may have reconnected while this one waited
+                if self.client is client:
+                    await self.reconnect()
+            return await operation(self.get_client())
+
+    @staticmethod
+    def _create_client() -> AsyncQdrantClient:
+        return AsyncQdrantClient(
+            host=settings.QDRANT_HOST,
+            port=settings.QDRANT_PORT,
+            grpc_port=settings.QDRANT_GRPC_PORT,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            timeout=settings.QDRANT_TIMEOUT
+        )
+
 qdrant_db = QdrantDatabase()
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Migration applying the QDRANT_QUANTIZATION, QDRANT_*_ON_DISK and QDRANT_HNSW_*
+settings to an existing Qdrant collection.
+
+New collections get these settings when they are created; collections created
+before them keep their configuration until this is run. Qdrant builds the
+quantized vectors and the new HNSW index in the background, the collection
+stays searchable meanwhile and the points are not re-uploaded.
+
+Usage:
+    python -m app.API.Src.core.database.Qdrant.migrations.apply_collection_config
+    python -m app.API.Src.core.database.Qdrant.migrations.apply_collection_config --collection documents --wait
+"""
+
+import argparse
+import asyncio
+import sys
+
+from qdrant_client.http import models
+
+from app.API.Src.core.config import settings
+from app.API.Src.core.database.Qdrant.client import qdrant_db
+from app.API.Src.core.database.Qdrant.repository import QdrantRepository
+
+
+async def wait_until_optimized(collection_name: str, poll_interval: float = 2.0) -> None:
+    while True:
+        info = await qdrant_db.run(lambda client: client.get_collection(collection_name))
+        print(f"status={info.status.value} indexed_vectors={info.indexed_vectors_count} points={info.points_count}")
+        if info.status == models.CollectionStatus.GREEN:
+            return
+        await asyncio.sleep(poll_interval)
+
+
+async def main(args: argparse.Namespace) -> int:
+    await qdrant_db.connect()
+    try:
+        repository = QdrantRepository(args.collection)
+        if not await qdrant_db.run(lambda client: client.collection_exists(args.collection)):
+            print(f"Collection '{args.collection}' does not exist; it is created with the current settings on startup")
+            return 1
+
+        print(f"Applying quantization={settings.QDRANT_QUANTIZATION}, vectors_on_disk={settings.QDRANT_VECTORS_ON_DISK}, "
+              f"payload_on_disk={settings.QDRANT_PAYLOAD_ON_DISK}, hnsw m={settings.QDRANT_HNSW_M} "
+              f"ef_construct={settings.QDRANT_HNSW_EF_CONSTRUCT} on_disk={settings.QDRANT_HNSW_ON_DISK}")
+        if not await repository.update_collection_config():
+            return 1
+        if args.wait:
+            await wait_until_optimized(args.collection)
+        return 0
+    finally:
+        await qdrant_db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply the Qdrant storage and index settings to an existing collection")
+    parser.add_argument("--collection", default="documents")
+    parser.add_argument("--wait", action="store_true", help="Wait until Qdrant has rebuilt the collection")
+    sys.exit(asyncio.run(main(parser.parse_args())))
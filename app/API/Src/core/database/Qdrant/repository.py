@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from qdrant_client.http import models
 from qdrant_client.http.models import Distance, VectorParams
 import logging
@@ -6,50 +6,162 @@ import logging
 from .client import qdrant_db
 from .models import VectorDocument, SearchResult, VectorSearchQuery
 from app.API.Src.core.config import settings
+from app.API.Src.core.database.vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
 
-class QdrantRepository:
+QUANTIZATION_TYPES = ("none", "scalar", "product")
+
+# Payload fields written by DocumentRepository and used by SearchFilters
+PAYLOAD_INDEXES = {
+    "source": models.PayloadSchemaType.KEYWORD,
+    "user_id": models.PayloadSchemaType.KEYWORD,
+    "headers": models.PayloadSchemaType.KEYWORD,
+    "tokens": models.PayloadSchemaType.INTEGER,
+}
+
+
+class QdrantRepository(VectorStore):
+    """
+    Qdrant collection of document vectors.
+    
+    Storage and index settings come from Settings: QDRANT_QUANTIZATION
+    (scalar int8 or product quantization), QDRANT_VECTORS_ON_DISK,
+    QDRANT_PAYLOAD_ON_DISK and the QDRANT_HNSW_* parameters. They are used
+    when the collection is created; update_collection_config() applies them
+    to an existing collection.
+    
+    The payload fields in PAYLOAD_INDEXES are indexed, so filtered searches
+    select the matching points through the index while traversing HNSW
+    instead of filtering the nearest neighbours of the whole corpus.
+    """
+    
     def __init__(self, collection_name: str = "documents"):
         self.collection_name = collection_name
         self.vector_size = settings.VECTOR_SIZE
     
     async def create_collection(self) -> bool:
         try:
-            client = qdrant_db.get_client()
-            
             # Check if collection exists
-            collections = client.get_collections()
-            if any(col.name == self.collection_name for col in collections.collections):
+            if await qdrant_db.run(lambda client: client.collection_exists(self.collection_name)):
                 logger.info(f"Collection '{self.collection_name}' already exists")
-                return True
+            else:
+                await qdrant_db.run(lambda client: client.create_collection(
+                    collection_name=self.collection_name,
+                    **self.collection_config()
+                ))
+                logger.info(f"Created collection '{self.collection_name}' (quantization: {settings.QDRANT_QUANTIZATION})")
             
-            # Create collection
-            client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=self.vector_size,
-                    distance=Distance.COSINE
-                )
-            )
-            logger.info(f"Created collection '{self.collection_name}'")
+            # Collections created before an index was added get it too
+            await self.create_payload_indexes()
             return True
             
         except Exception as e:
             logger.error(f"Failed to create collection: {e}")
             return False
     
-    async def upsert_document(self, document: VectorDocument, vector: List[float]) -> bool:
+    async def update_collection_config(self) -> bool:
+        """
+        Apply the current storage and index settings to an existing collection.
+        
+        Qdrant rebuilds the quantized vectors and HNSW index in the background;
+        the collection stays searchable meanwhile. The vector size and distance
+        cannot change this way.
+        
+        Returns:
+            True if the update was accepted
+        """
         try:
-            client = qdrant_db.get_client()
+            await qdrant_db.run(lambda client: client.update_collection(
+                collection_name=self.collection_name,
+                vectors_config={"": models.VectorParamsDiff(on_disk=settings.QDRANT_VECTORS_ON_DISK)},
+                hnsw_config=self.hnsw_config(),
+                quantization_config=self.quantization_config() or models.Disabled.DISABLED,
+                collection_params=models.CollectionParamsDiff(on_disk_payload=settings.QDRANT_PAYLOAD_ON_DISK)
+            ))
+            logger.info(f"Updated configuration of collection '{self.collection_name}'")
+            return True
             
+        except Exception as e:
+            logger.error(f"Failed to update collection configuration: {e}")
+            return False
+    
+    async def create_payload_indexes(self) -> None:
+        """Create the PAYLOAD_INDEXES; existing indexes are left as they are."""
+        info = await qdrant_db.run(lambda client: client.get_collection(self.collection_name))
+        for field_name, schema in PAYLOAD_INDEXES.items():
+            if field_name in (info.payload_schema or {}):
+                continue
+            await qdrant_db.run(lambda client: client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=schema
+            ))
+            logger.info(f"Created payload index on '{field_name}' in collection '{self.collection_name}'")
+    
+    def collection_config(self) -> Dict[str, Any]:
+        """Keyword arguments of create_collection built from Settings."""
+        return {
+            "vectors_config": VectorParams(
+                size=self.vector_size,
+                distance=Distance.COSINE,
+                on_disk=settings.QDRANT_VECTORS_ON_DISK
+            ),
+            "hnsw_config": self.hnsw_config(),
+            "quantization_config": self.quantization_config(),
+            "on_disk_payload": settings.QDRANT_PAYLOAD_ON_DISK
+        }
+    
+    @staticmethod
+    def hnsw_config() -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(
+            m=settings.QDRANT_HNSW_M,
+            ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT,
+            on_disk=settings.QDRANT_HNSW_ON_DISK
+        )
+    
+    @staticmethod
+    def quantization_config() -> Optional[Union[models.ScalarQuantization, models.ProductQuantization]]:
+        """Quantization selected by QDRANT_QUANTIZATION, None for "none"."""
+        quantization = settings.QDRANT_QUANTIZATION
+        if quantization == "scalar":
+            return models.ScalarQuantization(scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=settings.QDRANT_SCALAR_QUANTILE,
+                always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM
+            ))
+        if quantization == "product":
+            return models.ProductQuantization(product=models.ProductQuantizationConfig(
+                compression=models.CompressionRatio(settings.QDRANT_PRODUCT_COMPRESSION),
+                always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM
+            ))
+        if quantization == "none":
+            return None
+        raise ValueError(f"Unknown quantization '{quantization}', expected one of {', '.join(QUANTIZATION_TYPES)}")
+    
+    @staticmethod
+    def search_params() -> Optional[models.SearchParams]:
+        """Search-time HNSW ef and rescoring of quantized results, or None for Qdrant defaults."""
+        quantization = None
+        if settings.QDRANT_QUANTIZATION != "none":
+            # Rank candidates by the quantized vectors, then rescore the best ones with the originals
+            quantization = models.QuantizationSearchParams(
+                rescore=settings.QDRANT_QUANTIZATION_RESCORE,
+                oversampling=settings.QDRANT_QUANTIZATION_OVERSAMPLING
+            )
+        if not settings.QDRANT_SEARCH_EF and quantization is None:
+            return None
+        return models.SearchParams(hnsw_ef=settings.QDRANT_SEARCH_EF or None, quantization=quantization)
+    
+    async def upsert_document(self, document: VectorDocument, vector: List[float]) -> bool:
+        try:
             payload = {
                 "summary": document.summary,
                 **document.metadata
             }
             
-            client.upsert(
+            await qdrant_db.run(lambda client: client.upsert(
                 collection_name=self.collection_name,
                 points=[
                     models.PointStruct(
@@ -58,7 +170,7 @@ class QdrantRepository:
                         payload=payload
                     )
                 ]
-            )
+            ))
             logger.info(f"Upserted document {document.id}")
             return True
             
@@ -66,21 +178,73 @@ class QdrantRepository:
             logger.error(f"Failed to upsert document: {e}")
             return False
     
-    async def search_similar(self, query: VectorSearchQuery) -> List[SearchResult]:
+    async def upsert_documents(
+        self,
+        documents: List[VectorDocument],
+        vectors: List[List[float]],
+        batch_size: Optional[int] = None
+    ) -> bool:
+        """
+        Upsert many documents with one request per batch of points.
+        
+        Returns:
+            True if every batch was written, False on the first failed batch
+        """
+        batch_size = batch_size or settings.QDRANT_UPSERT_BATCH_SIZE
         try:
-            client = qdrant_db.get_client()
+            points = [
+                models.PointStruct(
+                    id=document.id,
+                    vector=vector,
+                    payload={"summary": document.summary, **document.metadata}
+                )
+                for document, vector in zip(documents, vectors)
+            ]
+            for start in range(0, len(points), batch_size):
+                batch = points[start:start + batch_size]
+                await qdrant_db.run(lambda client: client.upsert(
+                    collection_name=self.collection_name,
+                    points=batch
+                ))
+            logger.info(f"Upserted {len(points)} documents")
+            return True
             
-            search_result = client.search(
+        except Exception as e:
+            logger.error(f"Failed to upsert documents: {e}")
+            return False
+    
+    async def update_payloads(self, payloads: Dict[str, Dict[str, Any]]) -> bool:
+        """Set payload fields of many points with one request."""
+        try:
+            operations = [
+                models.SetPayloadOperation(set_payload=models.SetPayload(payload=payload, points=[document_id]))
+                for document_id, payload in payloads.items()
+            ]
+            await qdrant_db.run(lambda client: client.batch_update_points(
+                collection_name=self.collection_name,
+                update_operations=operations
+            ))
+            logger.info(f"Updated the payload of {len(operations)} documents")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to update payloads: {e}")
+            return False
+    
+    async def search_similar(self, query: VectorSearchQuery) -> List[SearchResult]:
+        try:
+            response = await qdrant_db.run(lambda client: client.query_points(
                 collection_name=self.collection_name,
-                query_vector=query.query_vector,
+                query=query.query_vector,
                 limit=query.limit,
                 score_threshold=query.score_threshold,
                 query_filter=models.Filter(**query.filter_conditions) if query.filter_conditions else None,
+                search_params=self.search_params(),
                 with_payload=True
-            )
+            ))
             
             results = []
-            for point in search_result:
+            for point in response.points:
                 result = SearchResult(
                     id=str(point.id),
                     content=point.payload.get("summary", ""),
@@ -99,14 +263,12 @@ class QdrantRepository:
     
     async def delete_document(self, document_id: str) -> bool:
         try:
-            client = qdrant_db.get_client()
-            
-            client.delete(
+            await qdrant_db.run(lambda client: client.delete(
                 collection_name=self.collection_name,
                 points_selector=models.PointIdsList(
                     points=[document_id]
                 )
-            )
+            ))
             logger.info(f"Deleted document {document_id}")
             return True
             
@@ -114,13 +276,27 @@ class QdrantRepository:
             logger.error(f"Failed to delete document: {e}")
             return False
     
+    async def delete_documents(self, document_ids: List[str]) -> bool:
+        try:
+            await qdrant_db.run(lambda client: client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.PointIdsList(
+                    points=document_ids
+                )
+            ))
+            logger.info(f"Deleted {len(document_ids)} documents")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            return False
+    
     async def get_collection_info(self) -> dict:
         try:
-            client = qdrant_db.get_client()
-            info = client.get_collection(self.collection_name)
+            info = await qdrant_db.run(lambda client: client.get_collection(self.collection_name))
             return {
                 "name": info.config.params.vectors.size,
-                "vectors_count": info.vectors_count,
+                "vectors_count": info.points_count,  # One vector per point
                 "indexed_vectors_count": info.indexed_vectors_count,
                 "points_count": info.points_count
             }
@@ -0,0 +1,77 @@
+"""
+Interface of the vector stores holding document embeddings.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from app.API.Src.core.config import settings
+from app.API.Src.core.database.Qdrant.models import VectorDocument, SearchResult, VectorSearchQuery
+
+VECTOR_STORE_BACKENDS = ("qdrant", "numpy")
+
+
+class VectorStore(ABC):
+    """
+    Storage and similarity search of document vectors.
+
+    Write methods report failure by returning False instead of raising, as
+    callers such as DocumentRepository decide how to recover.
+    """
+
+    @abstractmethod
+    async def create_collection(self) -> bool:
+        """Create the collection, or open it if it already exists."""
+
+    @abstractmethod
+    async def upsert_document(self, document: VectorDocument, vector: List[float]) -> bool:
+        """Insert or replace one point."""
+
+    @abstractmethod
+    async def upsert_documents(
+        self,
+        documents: List[VectorDocument],
+        vectors: List[List[float]],
+        batch_size: Optional[int] = None
+    ) -> bool:
+        """Insert or replace many points."""
+
+    @abstractmethod
+    async def update_payloads(self, payloads: Dict[str, Dict[str, Any]]) -> bool:
+        """Set payload fields of existing points by ID, keeping their vectors and other fields."""
+
+    @abstractmethod
+    async def search_similar(self, query: VectorSearchQuery) -> List[SearchResult]:
+        """Find the points most similar to the query vector, best first; empty on failure."""
+
+    @abstractmethod
+    async def delete_document(self, document_id: str) -> bool:
+        """Delete one point."""
+
+    @abstractmethod
+    async def delete_documents(self, document_ids: List[str]) -> bool:
+        """Delete many points."""
+
+    @abstractmethod
+    async def get_collection_info(self) -> dict:
+        """Size and point counts of the collection; empty on failure."""
+
+
+def create_vector_store(backend: Optional[str] = None, collection_name: str = "documents") -> VectorStore:
+    """
+    Create the vector store selected by settings.VECTOR_STORE_BACKEND.
+
+    Args:
+        backend: "qdrant" (Qdrant service) or "numpy" (in-process index); defaults to the setting
+        collection_name: Name of the collection
+
+    Returns:
+        Vector store of the backend
+    """
+    backend = backend or settings.VECTOR_STORE_BACKEND
+    if backend == "qdrant":
+        from app.API.Src.core.database.Qdrant.repository import QdrantRepository
+        return QdrantRepository(collection_name)
+    if backend == "numpy":
+        from app.API.Src.core.database.Numpy.repository import NumpyRepository
+        return NumpyRepository(collection_name, path=settings.NUMPY_INDEX_PATH or None)
+    raise ValueError(f"Unknown vector store backend '{backend}', expected one of {', '.join(VECTOR_STORE_BACKENDS)}")
@@ -0,0 +1,93 @@
+"""
+Load test for POST /chat against a running API.
+
+Sends chat requests at increasing concurrency levels and reports throughput
+and latency, together with /health latency measured while the chat requests
+are in flight. With non-blocking provider clients, throughput grows with
+concurrency (up to the provider concurrency limits) and /health stays fast.
+
+Usage:
+    python -m app.API.benchmarks.chat_load_test --url http://localhost:8008 \\
+        --user-id <uuid> --model gpt-4 --concurrency 1 2 4 8 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+
+import httpx
+
+
+def percentile(values: List[float], percent: int) -> float:
+    """Return the given percentile of the values (0 for an empty list)."""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def send_chat(client: httpx.AsyncClient, args: argparse.Namespace) -> Tuple[float, bool]:
+    started = time.perf_counter()
+    response = await client.post(
+        "/chat",
+        json={"user_id": args.user_id, "prompt": args.prompt, "model": args.model},
+    )
+    return time.perf_counter() - started, response.status_code == 200
+
+
+async def probe_health(client: httpx.AsyncClient, stop: asyncio.Event, latencies: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.1)
+
+
+async def run_level(args: argparse.Namespace, concurrency: int) -> None:
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        health_latencies: List[float] = []
+        stop = asyncio.Event()
+
+        async def bounded_chat() -> Tuple[float, bool]:
+            async with semaphore:
+                return await send_chat(client, args)
+
+        health_task = asyncio.create_task(probe_health(client, stop, health_latencies))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(bounded_chat() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await health_task
+
+    latencies = [latency for latency, _ in results]
+    errors = sum(1 for _, ok in results if not ok)
+    print(
+        f"{concurrency:>11} {args.requests:>8} {errors:>6} {elapsed:>8.2f} "
+        f"{args.requests / elapsed:>7.2f} {percentile(latencies, 50) * 1000:>9.0f} "
+        f"{percentile(latencies, 95) * 1000:>9.0f} {percentile(health_latencies, 95) * 1000:>11.1f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"{'concurrency':>11} {'requests':>8} {'errors':>6} {'seconds':>8} {'req/s':>7} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'health p95':>11}")
+    for concurrency in args.concurrency:
+        await run_level(args, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test POST /chat")
+    parser.add_argument("--url", default="http://localhost:8008", help="API base URL")
+    parser.add_argument("--user-id", required=True, help="Existing user UUID")
+    parser.add_argument("--model", default="gpt-4", help="AI model for the chat requests")
+    parser.add_argument("--prompt", default="Summarize the uploaded documents in one sentence.")
+    parser.add_argument("--requests", type=int, default=32, help="Requests per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--timeout", type=float, default=120.0, help="Request timeout in seconds")
+    asyncio.run(main(parser.parse_args()))
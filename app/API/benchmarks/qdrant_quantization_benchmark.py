@@ -0,0 +1,260 @@
+"""
+Recall vs memory of the Qdrant quantization and on-disk storage options.
+
+Builds clustered synthetic 1536-dim vectors (or loads --vectors, an .npy
+matrix of real embeddings) and exact top-k ground truth, then reports for
+each configuration the recall@k and the estimated RAM of the vectors and
+HNSW graph, following Qdrant's storage layout: original float32 vectors
+(memory-mapped when on disk, so only the page cache holds them), quantized
+vectors (kept in RAM with always_ram) and HNSW links.
+
+Offline, scalar int8 and product quantization are simulated with NumPy,
+with and without rescoring the oversampled candidates by the original
+vectors. Unless --offline, each configuration is also built in a temporary
+Qdrant collection through QdrantRepository.collection_config() and
+searched with QdrantRepository.search_params(), reporting its recall and
+search latency p50/p95.
+
+Usage:
+    python -m app.API.benchmarks.qdrant_quantization_benchmark --offline
+    python -m app.API.benchmarks.qdrant_quantization_benchmark --points 20000 --queries 200
+    python -m app.API.benchmarks.qdrant_quantization_benchmark --vectors embeddings.npy --offline
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from qdrant_client.http import models
+
+from app.API.Src.core.config import settings
+from app.API.Src.core.database.Qdrant.client import qdrant_db
+from app.API.Src.core.database.Qdrant.repository import QdrantRepository
+
+COLLECTION = "quantization_benchmark"
+CODEBOOK_SIZE = 256
+
+
+class Config(NamedTuple):
+    name: str
+    quantization: str = "none"
+    compression: str = "x16"
+    vectors_on_disk: bool = False
+    always_ram: bool = True
+
+
+CONFIGS = [
+    Config("float32 in RAM"),
+    Config("float32 on disk", vectors_on_disk=True),
+    Config("scalar int8", "scalar"),
+    Config("scalar int8, originals on disk", "scalar", vectors_on_disk=True),
+    Config("product x16", "product", "x16"),
+    Config("product x32, originals on disk", "product", "x32", vectors_on_disk=True),
+]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def make_dataset(points: int, queries: int, size: int, clusters: int, seed: int):
+    """Gaussian clusters around random centers, like topics of an embedded corpus."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, size)).astype(np.float32)
+
+    def sample(count: int) -> np.ndarray:
+        labels = rng.integers(0, clusters, count)
+        return normalize(centers[labels] + 0.9 * rng.standard_normal((count, size)).astype(np.float32))
+
+    return sample(points), sample(queries)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores per row, best first."""
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(row) & set(expected)) / len(expected) for row, expected in zip(found, truth)]))
+
+
+def estimate_memory(points: int, size: int, config: Config, m: int) -> Dict[str, float]:
+    """Estimated RAM and disk in MB of a collection's vectors and HNSW graph."""
+    originals = points * size * 4
+    if config.quantization == "scalar":
+        quantized = points * size
+    elif config.quantization == "product":
+        quantized = originals // int(config.compression[1:])
+    else:
+        quantized = 0
+    # Layer 0 holds up to 2 * m links of 4 bytes per point, upper layers add little
+    graph = points * 2 * m * 4
+    ram = graph + (0 if config.vectors_on_disk else originals) + (quantized if config.always_ram else 0)
+    return {"ram": ram / 2 ** 20, "disk": (originals + quantized + graph) / 2 ** 20}
+
+
+def scalar_scores(vectors: np.ndarray, queries: np.ndarray, quantile: float) -> np.ndarray:
+    """Scores against int8 codes of the vectors, clipped to the given quantile range."""
+    low, high = np.quantile(vectors, [1 - quantile, quantile])
+    step = (high - low) / 255
+    codes = np.round((np.clip(vectors, low, high) - low) / step).astype(np.uint8)
+    return queries @ (codes.astype(np.float32) * step + low).T
+
+
+def product_scores(vectors: np.ndarray, queries: np.ndarray, compression: int, seed: int,
+                   train_size: int = 2048, iterations: int = 6) -> np.ndarray:
+    """Scores against product quantization codes, one byte per subvector of compression / 4 floats."""
+    rng = np.random.default_rng(seed)
+    sub_size = max(1, compression // 4)
+    subspaces = vectors.shape[1] // sub_size
+    train = vectors[rng.choice(len(vectors), min(train_size, len(vectors)), replace=False)]
+    scores = np.zeros((len(queries), len(vectors)), dtype=np.float32)
+
+    for s in range(subspaces):
+        columns = slice(s * sub_size, (s + 1) * sub_size)
+        samples = train[:, columns]
+        codebook = samples[rng.choice(len(samples), CODEBOOK_SIZE, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = nearest(samples, codebook)
+            sums = np.stack([np.bincount(assignment, samples[:, d], CODEBOOK_SIZE) for d in range(sub_size)], axis=1)
+            counts = np.bincount(assignment, minlength=CODEBOOK_SIZE)
+            # Empty clusters keep their previous centroid
+            filled = counts > 0
+            codebook[filled] = sums[filled] / counts[filled, None]
+        codes = nearest(vectors[:, columns], codebook)
+        # Asymmetric distance: the query is exact, each vector is its centroid
+        scores += (queries[:, columns] @ codebook.T)[:, codes]
+    return scores
+
+
+def nearest(samples: np.ndarray, codebook: np.ndarray) -> np.ndarray:
+    distances = (samples ** 2).sum(axis=1, keepdims=True) - 2 * samples @ codebook.T + (codebook ** 2).sum(axis=1)
+    return distances.argmin(axis=1)
+
+
+def rescore(approximate: np.ndarray, vectors: np.ndarray, queries: np.ndarray, k: int, oversampling: float) -> np.ndarray:
+    """Top k after rescoring the top k * oversampling approximate results with the original vectors."""
+    candidates = top_k(approximate, min(len(vectors), int(k * oversampling)))
+    exact = np.einsum("qd,qcd->qc", queries, vectors[candidates])
+    return np.take_along_axis(candidates, top_k(exact, k), axis=1)
+
+
+def offline_report(vectors: np.ndarray, queries: np.ndarray, truth: np.ndarray, args: argparse.Namespace) -> None:
+    points, size = vectors.shape
+    print(f"Simulated quantization ({points} points, {size}-dim, {len(queries)} queries, "
+          f"recall@{args.k}, oversampling {args.oversampling})")
+    print(f"{'configuration':<32} {'RAM MB':>8} {'disk MB':>8} {'recall':>8} {'rescored':>9} {'build s':>8}")
+
+    for config in CONFIGS:
+        memory = estimate_memory(points, size, config, args.hnsw_m)
+        started = time.perf_counter()
+        if config.quantization == "scalar":
+            approximate = scalar_scores(vectors, queries, settings.QDRANT_SCALAR_QUANTILE)
+        elif config.quantization == "product":
+            approximate = product_scores(vectors, queries, int(config.compression[1:]), args.seed)
+        else:
+            approximate = queries @ vectors.T
+        build_seconds = time.perf_counter() - started
+
+        plain = recall(top_k(approximate, args.k), truth)
+        rescored = recall(rescore(approximate, vectors, queries, args.k, args.oversampling), truth) \
+            if config.quantization != "none" else plain
+        print(f"{config.name:<32} {memory['ram']:>8.1f} {memory['disk']:>8.1f} {plain:>8.3f} "
+              f"{rescored:>9.3f} {build_seconds:>8.2f}")
+    print()
+
+
+def apply_config(config: Config, args: argparse.Namespace) -> None:
+    settings.QDRANT_QUANTIZATION = config.quantization
+    settings.QDRANT_PRODUCT_COMPRESSION = config.compression
+    settings.QDRANT_VECTORS_ON_DISK = config.vectors_on_disk
+    settings.QDRANT_QUANTIZATION_ALWAYS_RAM = config.always_ram
+    settings.QDRANT_QUANTIZATION_OVERSAMPLING = args.oversampling
+    settings.QDRANT_HNSW_M = args.hnsw_m
+    settings.QDRANT_SEARCH_EF = args.search_ef
+
+
+async def wait_until_indexed() -> None:
+    while True:
+        info = await qdrant_db.run(lambda client: client.get_collection(COLLECTION))
+        if info.status == models.CollectionStatus.GREEN:
+            return
+        await asyncio.sleep(0.5)
+
+
+async def live_report(vectors: np.ndarray, queries: np.ndarray, truth: np.ndarray, args: argparse.Namespace) -> None:
+    settings.QDRANT_HOST = args.host
+    await qdrant_db.connect()
+    repository = QdrantRepository(COLLECTION)
+    repository.vector_size = vectors.shape[1]
+    ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
+    positions = {point_id: position for position, point_id in enumerate(ids)}
+
+    print(f"Qdrant at {args.host} (hnsw m={args.hnsw_m}, search ef={args.search_ef or 'default'})")
+    print(f"{'configuration':<32} {'recall':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    try:
+        for config in CONFIGS:
+            apply_config(config, args)
+            await qdrant_db.run(lambda client: client.delete_collection(COLLECTION))
+            await qdrant_db.run(lambda client: client.create_collection(COLLECTION, **repository.collection_config()))
+            for start in range(0, len(vectors), args.batch_size):
+                batch = models.Batch(ids=ids[start:start + args.batch_size],
+                                     vectors=vectors[start:start + args.batch_size].tolist())
+                await qdrant_db.run(lambda client: client.upsert(COLLECTION, points=batch, wait=True))
+            await wait_until_indexed()
+
+            found: List[List[int]] = []
+            latencies: List[float] = []
+            for query in queries.tolist():
+                started = time.perf_counter()
+                response = await qdrant_db.run(lambda client: client.query_points(
+                    COLLECTION, query=query, limit=args.k, search_params=repository.search_params()
+                ))
+                latencies.append((time.perf_counter() - started) * 1000)
+                found.append([positions[str(point.id)] for point in response.points])
+
+            p50, p95 = np.percentile(latencies, [50, 95])
+            print(f"{config.name:<32} {recall(np.array(found), truth):>8.3f} {p50:>8.2f} {p95:>8.2f}")
+    finally:
+        await qdrant_db.run(lambda client: client.delete_collection(COLLECTION))
+        await qdrant_db.disconnect()
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.vectors:
+        vectors = normalize(np.load(args.vectors))
+        rng = np.random.default_rng(args.seed)
+        queries = vectors[rng.choice(len(vectors), args.queries, replace=False)]
+        vectors = vectors[:args.points] if args.points else vectors
+    else:
+        vectors, queries = make_dataset(args.points, args.queries, args.size, args.clusters, args.seed)
+    truth = top_k(queries @ vectors.T, args.k)
+
+    offline_report(vectors, queries, truth, args)
+    if not args.offline:
+        await live_report(vectors, queries, truth, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark recall vs memory of Qdrant quantization options")
+    parser.add_argument("--host", default=settings.QDRANT_HOST)
+    parser.add_argument("--vectors", help=".npy matrix of embeddings to use instead of synthetic vectors")
+    parser.add_argument("--size", type=int, default=settings.VECTOR_SIZE, help="Synthetic vector size")
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10, help="Cutoff for recall@k")
+    parser.add_argument("--oversampling", type=float, default=settings.QDRANT_QUANTIZATION_OVERSAMPLING)
+    parser.add_argument("--hnsw-m", type=int, default=settings.QDRANT_HNSW_M)
+    parser.add_argument("--search-ef", type=int, default=settings.QDRANT_SEARCH_EF, help="0 uses the Qdrant default")
+    parser.add_argument("--batch-size", type=int, default=settings.QDRANT_UPSERT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--offline", action="store_true", help="Only simulate quantization, without a Qdrant server")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,152 @@
+"""
+Benchmark of the Qdrant REST and gRPC transports with 1536-dim vectors.
+
+Measures the request size and encoding time of upsert batches and search
+queries for both wire formats (JSON vs protobuf; no server needed), then,
+unless --offline, upserts and searches a temporary collection with an
+AsyncQdrantClient over each transport and reports upsert batch latency,
+sequential search p50/p95/p99 and concurrent search throughput.
+
+Usage:
+    python -m app.API.benchmarks.qdrant_transport_benchmark --offline
+    python -m app.API.benchmarks.qdrant_transport_benchmark --host qdrant --points 10000 --searches 500
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from typing import List
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.conversions.conversion import RestToGrpc
+from qdrant_client.http import models
+
+from app.API.Src.core.config import settings
+
+COLLECTION = "transport_benchmark"
+
+
+def random_vector(size: int) -> List[float]:
+    return [random.uniform(-1.0, 1.0) for _ in range(size)]
+
+
+def make_points(count: int, size: int) -> List[models.PointStruct]:
+    return [
+        models.PointStruct(id=str(uuid.uuid4()), vector=random_vector(size), payload={"summary": "x" * 50})
+        for _ in range(count)
+    ]
+
+
+def best_time(function, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def serialization_report(size: int, batch_size: int) -> None:
+    points = make_points(batch_size, size)
+    query = random_vector(size)
+
+    # Both include the client's conversion from its models, as on a real request
+    def json_batch() -> bytes:
+        return json.dumps({"points": [point.model_dump(mode="json") for point in points]}).encode()
+
+    def protobuf_batch() -> bytes:
+        return b"".join(RestToGrpc.convert_point_struct(point).SerializeToString() for point in points)
+
+    json_query = json.dumps({"query": query, "limit": 5}).encode()
+    protobuf_query = RestToGrpc.convert_point_struct(
+        models.PointStruct(id=1, vector=query)
+    ).vectors.SerializeToString()
+
+    print(f"Serialization ({size}-dim vectors)")
+    print(f"{'request':<24} {'JSON bytes':>12} {'proto bytes':>12} {'ratio':>6} {'JSON ms':>9} {'proto ms':>9}")
+    json_bytes, protobuf_bytes = len(json_batch()), len(protobuf_batch())
+    print(f"{f'upsert x{batch_size}':<24} {json_bytes:>12} {protobuf_bytes:>12} {json_bytes / protobuf_bytes:>6.1f} "
+          f"{best_time(json_batch) * 1000:>9.2f} {best_time(protobuf_batch) * 1000:>9.2f}")
+    print(f"{'search query vector':<24} {len(json_query):>12} {len(protobuf_query):>12} "
+          f"{len(json_query) / len(protobuf_query):>6.1f}")
+    print()
+
+
+async def transport_report(args: argparse.Namespace, prefer_grpc: bool) -> None:
+    client = AsyncQdrantClient(
+        host=args.host,
+        port=settings.QDRANT_PORT,
+        grpc_port=settings.QDRANT_GRPC_PORT,
+        prefer_grpc=prefer_grpc,
+        timeout=60
+    )
+    label = "gRPC" if prefer_grpc else "REST"
+    try:
+        if await client.collection_exists(COLLECTION):
+            await client.delete_collection(COLLECTION)
+        await client.create_collection(
+            COLLECTION,
+            vectors_config=models.VectorParams(size=args.size, distance=models.Distance.COSINE)
+        )
+
+        upsert_times: List[float] = []
+        for _ in range(0, args.points, args.batch_size):
+            batch = make_points(args.batch_size, args.size)
+            started = time.perf_counter()
+            await client.upsert(COLLECTION, points=batch, wait=True)
+            upsert_times.append((time.perf_counter() - started) * 1000)
+
+        queries = [random_vector(args.size) for _ in range(args.searches)]
+        search_times: List[float] = []
+        for query in queries:
+            started = time.perf_counter()
+            await client.query_points(COLLECTION, query=query, limit=5, with_payload=True)
+            search_times.append((time.perf_counter() - started) * 1000)
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def search(query: List[float]) -> None:
+            async with semaphore:
+                await client.query_points(COLLECTION, query=query, limit=5, with_payload=True)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(search(query) for query in queries))
+        throughput = len(queries) / (time.perf_counter() - started)
+
+        print(f"{label:<6} {statistics.mean(upsert_times):>13.1f} {percentile(search_times, 0.5):>9.2f} "
+              f"{percentile(search_times, 0.95):>9.2f} {percentile(search_times, 0.99):>9.2f} {throughput:>12.0f}")
+    finally:
+        await client.delete_collection(COLLECTION)
+        await client.close()
+
+
+async def main(args: argparse.Namespace) -> None:
+    serialization_report(args.size, args.batch_size)
+    if args.offline:
+        return
+
+    print(f"Transports ({args.points} points, {args.searches} searches, concurrency {args.concurrency})")
+    print(f"{'':<6} {'upsert ms/batch':>13} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'searches/s':>12}")
+    for prefer_grpc in (False, True):
+        await transport_report(args, prefer_grpc)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Qdrant REST vs gRPC transports")
+    parser.add_argument("--host", default=settings.QDRANT_HOST)
+    parser.add_argument("--size", type=int, default=1536, help="Vector size")
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=settings.QDRANT_UPSERT_BATCH_SIZE)
+    parser.add_argument("--searches", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--offline", action="store_true", help="Only measure serialization, without a Qdrant server")
+    asyncio.run(main(parser.parse_args()))
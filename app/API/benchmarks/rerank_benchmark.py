@@ -0,0 +1,141 @@
+"""
+Quality/latency benchmark of the rerank stage on the documents in Corpus/.
+
+Splits the corpus with TextSplitter and uses every markdown header as a
+query whose relevant chunks are the ones under that header (header lines are
+removed from the chunk text). A hashed character-trigram similarity stands in
+for the first-stage vector search so the benchmark runs offline; its top
+candidates are then rescored by LexicalReranker.
+
+For each candidate pool size it reports recall@k and MRR@k of the first stage
+alone and with reranking, the average prompt tokens of the top-k documents,
+and the rerank latency per query.
+
+Usage:
+    python -m app.API.benchmarks.rerank_benchmark --corpus ./Corpus --top-k 3 5
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import re
+import statistics
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from app.API.Src.Document.documentSplitter.token_based_text_splitter import TextSplitter
+from app.API.Src.Document.models.document import Document
+from app.API.Src.RAG.reranker import LexicalReranker
+
+HEADER_LINE = re.compile(r"^#{1,6}\s+(.*)$", re.MULTILINE)
+TRIGRAM_BUCKETS = 4096
+
+
+def load_chunks(corpus_path: Path, limit: int) -> List[Document]:
+    """Split all markdown files of the corpus into chunks."""
+    splitter = TextSplitter()
+    chunks: List[Document] = []
+    for path in sorted(corpus_path.glob("*.md")):
+        for chunk in asyncio.run(splitter.split(path.read_text(encoding="utf-8"), limit)):
+            chunk.localisation = path.name
+            chunks.append(chunk)
+    return chunks
+
+
+def build_queries(chunks: List[Document]) -> Tuple[List[Document], Dict[str, Set[int]]]:
+    """Strip header lines from the chunks; return (indexed chunks, header query -> relevant chunk indexes)."""
+    indexed: List[Document] = []
+    queries: Dict[str, Set[int]] = {}
+    for chunk in chunks:
+        headers = [header.strip() for header in HEADER_LINE.findall(chunk.content) if header.strip()]
+        body = HEADER_LINE.sub("", chunk.content).strip()
+        if not body:
+            continue
+        indexed.append(Document(content=body, localisation=chunk.localisation, tokens=chunk.tokens))
+        for header in headers:
+            queries.setdefault(header, set()).add(len(indexed) - 1)
+    return indexed, queries
+
+
+def trigram_vector(text: str) -> Dict[int, float]:
+    """Unit-length bag of hashed character trigrams."""
+    text = f"  {text.lower()} "
+    counts = Counter(zlib.crc32(text[i:i + 3].encode("utf-8")) % TRIGRAM_BUCKETS for i in range(len(text) - 2))
+    norm = math.sqrt(sum(value * value for value in counts.values())) or 1.0
+    return {bucket: value / norm for bucket, value in counts.items()}
+
+
+def first_stage(query_vector: Dict[int, float], vectors: List[Dict[int, float]], count: int) -> List[int]:
+    """Indexes of the `count` chunks most similar to the query."""
+    scores = [sum(weight * vector.get(bucket, 0.0) for bucket, weight in query_vector.items()) for vector in vectors]
+    return sorted(range(len(vectors)), key=lambda index: scores[index], reverse=True)[:count]
+
+
+def recall_and_reciprocal_rank(ranking: List[int], relevant: Set[int], k: int) -> Tuple[float, float]:
+    top = ranking[:k]
+    recall = len(relevant.intersection(top)) / len(relevant)
+    reciprocal_rank = next((1.0 / rank for rank, index in enumerate(top, 1) if index in relevant), 0.0)
+    return recall, reciprocal_rank
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the rerank stage on the Corpus directory")
+    parser.add_argument("--corpus", type=Path, default=Path("Corpus"), help="Directory with .md files")
+    parser.add_argument("--limit", type=int, default=200, help="Token limit per chunk")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 20, 50], help="Candidate pool sizes")
+    parser.add_argument("--top-k", type=int, nargs="+", default=[3, 5], help="Result sizes")
+    parser.add_argument("--weight", type=float, default=0.5, help="LexicalReranker weight")
+    args = parser.parse_args()
+
+    # The splitter logs every chunk at INFO level
+    logging.basicConfig(level=logging.WARNING)
+
+    chunks, queries = build_queries(load_chunks(args.corpus, args.limit))
+    if not queries:
+        raise SystemExit(f"No headed .md files found in {args.corpus}")
+    vectors = [trigram_vector(chunk.content) for chunk in chunks]
+    reranker = LexicalReranker(weight=args.weight)
+    print(f"{len(chunks)} chunks, {len(queries)} queries, reranker weight {args.weight}")
+    print()
+    print(f"{'cands':>5} {'k':>3} {'recall':>7} {'+rerank':>7} {'mrr':>6} {'+rerank':>7} "
+          f"{'tokens':>7} {'+rerank':>7} {'p50 ms':>7} {'p95 ms':>7}")
+
+    for candidates in args.candidates:
+        rankings: List[Tuple[List[int], List[int], Set[int]]] = []
+        latencies: List[float] = []
+        for query, relevant in queries.items():
+            pool = first_stage(trigram_vector(query), vectors, candidates)
+            documents = [chunks[index] for index in pool]
+            index_of = {id(document): index for document, index in zip(documents, pool)}
+
+            started = time.perf_counter()
+            reranked = reranker.rerank(query, documents, len(documents))
+            latencies.append((time.perf_counter() - started) * 1000)
+
+            rankings.append((pool, [index_of[id(document)] for document in reranked], relevant))
+
+        for k in args.top_k:
+            base = [recall_and_reciprocal_rank(pool, relevant, k) for pool, _, relevant in rankings]
+            rerank = [recall_and_reciprocal_rank(order, relevant, k) for _, order, relevant in rankings]
+            base_tokens = statistics.mean(sum(chunks[i].tokens or 0 for i in pool[:k]) for pool, _, _ in rankings)
+            rerank_tokens = statistics.mean(sum(chunks[i].tokens or 0 for i in order[:k]) for _, order, _ in rankings)
+            print(
+                f"{candidates:>5} {k:>3} "
+                f"{statistics.mean(r for r, _ in base):>7.3f} {statistics.mean(r for r, _ in rerank):>7.3f} "
+                f"{statistics.mean(m for _, m in base):>6.3f} {statistics.mean(m for _, m in rerank):>7.3f} "
+                f"{base_tokens:>7.0f} {rerank_tokens:>7.0f} "
+                f"{percentile(latencies, 0.5):>7.2f} {percentile(latencies, 0.95):>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark of TextSplitter on the documents in Corpus/.
+
+Splits every corpus file and then the whole corpus concatenated 1x, 2x, 4x...
+times to show how split time grows with document size, and compares the
+peak memory (tracemalloc) of split() on the whole text with split_stream()
+fed in blocks, as the ingestion workers do.
+
+Usage:
+    python -m app.API.benchmarks.text_splitter_benchmark --corpus ./Corpus --limit 500
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import tracemalloc
+from pathlib import Path
+from typing import AsyncIterator, List, Tuple
+
+from app.API.Src.Document.documentSplitter.token_based_text_splitter import TextSplitter
+
+
+def load_corpus(corpus_path: Path) -> List[Tuple[str, str]]:
+    """Load all markdown files from the corpus directory as (name, text) pairs."""
+    return [
+        (path.name, path.read_text(encoding="utf-8"))
+        for path in sorted(corpus_path.glob("*.md"))
+    ]
+
+
+def time_split(splitter: TextSplitter, text: str, limit: int, repeat: int) -> Tuple[float, int]:
+    """Return the best split time in seconds out of `repeat` runs and the number of chunks."""
+    best = float("inf")
+    chunks = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        documents = asyncio.run(splitter.split(text, limit))
+        best = min(best, time.perf_counter() - started)
+        chunks = len(documents)
+    return best, chunks
+
+
+async def iterate_blocks(text: str, block_size: int) -> AsyncIterator[str]:
+    for start in range(0, len(text), block_size):
+        yield text[start:start + block_size]
+
+
+async def count_streamed(splitter: TextSplitter, text: str, limit: int, block_size: int) -> int:
+    return sum([1 async for _ in splitter.split_stream(iterate_blocks(text, block_size), limit)])
+
+
+def peak_memory(function) -> Tuple[int, int]:
+    """Return the chunk count of function() and the peak memory in bytes allocated while it ran."""
+    tracemalloc.start()
+    try:
+        chunks = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return chunks, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TextSplitter on the Corpus directory")
+    parser.add_argument("--corpus", type=Path, default=Path("Corpus"), help="Directory with .md files")
+    parser.add_argument("--limit", type=int, default=500, help="Token limit per chunk")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--max-scale", type=int, default=16, help="Largest corpus concatenation factor")
+    parser.add_argument("--block-size", type=int, default=65536, help="Characters per block fed to split_stream")
+    args = parser.parse_args()
+
+    # The splitter logs every chunk at INFO level, which would dominate the timings
+    logging.basicConfig(level=logging.WARNING)
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        raise SystemExit(f"No .md files found in {args.corpus}")
+
+    splitter = TextSplitter()
+    splitter._initialize_tokenizer()
+
+    print(f"Per file (limit={args.limit} tokens)")
+    print(f"{'file':<60} {'chars':>9} {'tokens':>9} {'chunks':>7} {'ms':>9}")
+    for name, text in corpus:
+        seconds, chunks = time_split(splitter, text, args.limit, args.repeat)
+        tokens = len(splitter.tokenizer.encode(text))
+        print(f"{name[:60]:<60} {len(text):>9} {tokens:>9} {chunks:>7} {seconds * 1000:>9.1f}")
+
+    print()
+    print("Scaling (whole corpus concatenated)")
+    print(f"{'scale':>6} {'chars':>10} {'chunks':>7} {'ms':>10} {'us/char':>8}")
+    full_text = "\n".join(text for _, text in corpus)
+    scale = 1
+    while scale <= args.max_scale:
+        text = full_text * scale
+        seconds, chunks = time_split(splitter, text, args.limit, args.repeat)
+        print(f"{scale:>6} {len(text):>10} {chunks:>7} {seconds * 1000:>10.1f} {seconds * 1e6 / len(text):>8.2f}")
+        scale *= 2
+
+    # The text itself is allocated before tracing starts, as a file on disk would not be in memory
+    print()
+    print(f"Peak memory (split vs split_stream in {args.block_size}-char blocks)")
+    print(f"{'scale':>6} {'chars':>10} {'chunks':>7} {'split MB':>9} {'stream MB':>10}")
+    scale = 1
+    while scale <= args.max_scale:
+        text = full_text * scale
+        chunks, split_peak = peak_memory(lambda: len(asyncio.run(splitter.split(text, args.limit))))
+        _, stream_peak = peak_memory(
+            lambda: asyncio.run(count_streamed(splitter, text, args.limit, args.block_size))
+        )
+        print(f"{scale:>6} {len(text):>10} {chunks:>7} {split_peak / 2**20:>9.1f} {stream_peak / 2**20:>10.1f}")
+        scale *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,10 @@ from app.API.Src.User.user_router import router as user_router
 from app.API.Src.RAG.rag_router import router as rag_router
 from app.API.Src.core.database.Postgres.database import init_db
 from app.API.Src.core.database.Qdrant.client import qdrant_db
-from app.API.Src.core.database.Qdrant.repository import QdrantRepository
+from app.API.Src.core.ExternalApiHelper.client_registry import client_registry
+from app.API.Src.Document.ingestion.worker_pool import ingestion_workers
+from app.API.Src.Document.ingestion.bulk_import import bulk_imports
+from app.API.Src.core.config import settings
 
 app = FastAPI()
 
@@ -28,11 +31,16 @@ app.include_router(rag_router)
 @app.on_event("startup")
 async def startup_event():
     await init_db()
-    await qdrant_db.connect()
+    if settings.VECTOR_STORE_BACKEND == "qdrant":
+        await qdrant_db.connect()
+    await client_registry.connect()
     
     # Initialize document collection
-    qdrant_repo = QdrantRepository()
+    qdrant_repo = client_registry.get_qdrant_repository()
     await qdrant_repo.create_collection()
+    
+    # Process queued uploads, including those left over from before a restart
+    await ingestion_workers.start()
 
 @app.get("/")
 def read_root():
@@ -40,8 +48,16 @@ def read_root():
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await ingestion_workers.stop()
+    await bulk_imports.stop()
+    await client_registry.disconnect()
     await qdrant_db.disconnect()
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.utcnow()}
+    health = {"status": "healthy", "timestamp": datetime.utcnow()}
+    if settings.VECTOR_STORE_BACKEND == "qdrant":
+        health["qdrant"] = "ok" if await qdrant_db.health_check() else "unavailable"
+        if health["qdrant"] != "ok":
+            health["status"] = "degraded"
+    return health
@@ -0,0 +1,88 @@
+import pytest
+import pytest_asyncio
+import tiktoken
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.API.Src.core.database.Numpy.repository import NumpyRepository
+from app.API.Src.Document.documentSplitter import token_based_text_splitter
+from app.API.Src.Document.models.document import Base
+from app.API.Src.Document.repository.document_repository import DocumentRepository
+
+
+class FakeEmbedder:
+    """Embeds a text as [1, len(text)], recording the texts; fails the call number fail_on_call if set."""
+
+    def __init__(self):
+        self.calls = 0
+        self.texts = []
+        self.fail_on_call = None
+
+    async def generate_embedding(self, text):
+        return [1.0, 0.0]
+
+    async def generate_embeddings(self, texts):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("embeddings API unavailable")
+        self.texts.extend(texts)
+        return [[1.0, float(len(text))] for text in texts]
+
+
+class FakeClients:
+    """Client registry with the fake embedder and an in-memory vector store."""
+
+    def __init__(self, embedder: FakeEmbedder):
+        self.embedder = embedder
+        self.store = NumpyRepository()
+        self.store.vector_size = 2
+
+    def get_embedding_generator(self):
+        return self.embedder
+
+    def get_qdrant_repository(self):
+        return self.store
+
+    def get_response_cache(self):
+        return None
+
+    def repository(self, session) -> DocumentRepository:
+        return DocumentRepository(session, embedding_generator=self.embedder, qdrant_repo=self.store)
+
+
+@pytest.fixture
+def byte_tokenizer() -> tiktoken.Encoding:
+    """One token per byte - available offline, unlike the OpenAI encodings."""
+    return tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"""\S+|\s+""",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={}
+    )
+
+
+@pytest.fixture
+def split_by_bytes(monkeypatch, byte_tokenizer) -> None:
+    """Make the text splitter count bytes instead of loading a model's tokenizer."""
+    monkeypatch.setattr(token_based_text_splitter, "get_tokenizer", lambda model_name: byte_tokenizer)
+
+
+@pytest_asyncio.fixture
+async def session_factory() -> async_sessionmaker:
+    """Sessions of an in-memory SQLite database with the tables created."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def embedder() -> FakeEmbedder:
+    return FakeEmbedder()
+
+
+@pytest_asyncio.fixture
+async def clients(embedder) -> FakeClients:
+    clients = FakeClients(embedder)
+    await clients.store.create_collection()
+    return clients
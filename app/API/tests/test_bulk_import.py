@@ -0,0 +1,169 @@
+import asyncio
+import io
+import tarfile
+import uuid
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+from app.API.Src.core.config import settings
+from app.API.Src.Document.documentSplitter.token_based_text_splitter import TextSplitter
+from app.API.Src.Document.ingestion.bulk_import import BulkImportService, extract_archive
+from app.API.Src.Document.models.document import Document
+from app.API.Src.Document.models.ingestion_job import IngestionJob
+from app.API.Src.Document.repository.ingestion_job_repository import IngestionJobRepository
+
+
+def write_corpus(directory, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "DOCUMENT_TOKEN_LIMIT", 120)
+    monkeypatch.setattr(settings, "INGESTION_BATCH_SIZE", 3)
+    for i in range(6):
+        path = directory / f"team_{i % 2}" / f"note_{i}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(f"## Topic {i}.{j}\nDetails of topic {j} in note {i}.\n\n" for j in range(i + 1)))
+    (directory / "image.png").write_bytes(b"\x89PNG")
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_resumes_with_files_of_a_failed_batch(tmp_path, monkeypatch, split_by_bytes, session_factory, clients):
+    # Arrange
+    write_corpus(tmp_path, monkeypatch)
+    # Every chunk is embedded; the small chunks of the test files repeat
+    monkeypatch.setattr(settings, "DEDUP_ENABLED", False)
+    clients.embedder.fail_on_call = 2
+    service = BulkImportService(session_factory, clients, processes=2, executor=ThreadPoolExecutor(2))
+    import_id = await service.create_import(tmp_path)
+
+    # Act
+    first = await service.run(import_id)
+    async with session_factory() as session:
+        after_failure = await IngestionJobRepository(session).import_summary(import_id)
+        # The upload workers leave bulk import files to their import
+        unclaimed = await IngestionJobRepository(session).claim_next()
+    resumed = await service.run(import_id)
+    again = await service.run(import_id)
+
+    # Assert
+    assert first.files_total == 6 and first.files_failed > 0
+    assert first.files_done + first.files_failed == 6
+    assert after_failure["files"]["failed"] == first.files_failed
+    assert unclaimed is None
+    assert resumed.files_total == first.files_failed and resumed.files_failed == 0
+    assert again.files_total == 0
+    async with session_factory() as session:
+        summary = await IngestionJobRepository(session).import_summary(import_id)
+        documents = (await session.scalars(select(Document))).all()
+    splitter = TextSplitter()
+    expected = {
+        f"team_{i % 2}/note_{i}.md": len(await splitter.split((tmp_path / f"team_{i % 2}" / f"note_{i}.md").read_text(), 120))
+        for i in range(6)
+    }
+    assert summary["files"]["done"] == 6 and summary["chunks"] == sum(expected.values())
+    assert Counter(document.source for document in documents) == expected
+    assert (await clients.store.get_collection_info())["points_count"] == len(documents)
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_deletes_parts_left_by_an_interrupted_run(tmp_path, monkeypatch, split_by_bytes, session_factory, clients):
+    # Arrange
+    write_corpus(tmp_path, monkeypatch)
+    monkeypatch.setattr(settings, "INGESTION_STALE_AFTER", 60.0)
+    service = BulkImportService(session_factory, clients, processes=1, executor=ThreadPoolExecutor(1))
+    import_id = await service.create_import(tmp_path)
+    leftover = Document(id=uuid.uuid4(), localisation="note_0_part_001.md", source="team_0/note_0.md", content="partial")
+    async with session_factory() as session:
+        session.add(leftover)
+        job = (await session.scalars(select(IngestionJob).where(IngestionJob.source == "team_0/note_0.md"))).one()
+        job.status = "running"
+        job.attempts = 1
+        job.heartbeat_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        job.document_ids = [str(leftover.id)]
+        await session.commit()
+
+    # Act
+    progress = await service.run(import_id)
+
+    # Assert
+    assert progress.files_done == 6
+    async with session_factory() as session:
+        assert await session.get(Document, leftover.id) is None
+        job = await IngestionJobRepository(session).get_job(job.id)
+    assert job.status == "done" and job.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_files_waiting_longer_than_the_stale_timeout_are_not_taken_over(
+    tmp_path, monkeypatch, split_by_bytes, session_factory, clients
+):
+    # Arrange
+    write_corpus(tmp_path, monkeypatch)
+    monkeypatch.setattr(settings, "INGESTION_STALE_AFTER", 0.3)
+    taken_over = []
+    generate_embeddings = clients.embedder.generate_embeddings
+
+    async def slow_generate_embeddings(texts):
+        if clients.embedder.calls == 0:
+            # The first batch outlasts the stale timeout while the other files wait
+            await asyncio.sleep(1.0)
+            async with session_factory() as session:
+                taken_over.extend(await IngestionJobRepository(session).claim_import(import_id))
+        return await generate_embeddings(texts)
+
+    monkeypatch.setattr(clients.embedder, "generate_embeddings", slow_generate_embeddings)
+    service = BulkImportService(session_factory, clients, processes=1, executor=ThreadPoolExecutor(1))
+    import_id = await service.create_import(tmp_path)
+
+    # Act
+    progress = await service.run(import_id)
+
+    # Assert
+    assert taken_over == []
+    assert progress.files_done == 6
+
+
+def test_extract_archive_keeps_markdown_files_inside_the_target(tmp_path):
+    # Arrange
+    archive_path = tmp_path / "export.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("docs/guide.md", "# Guide")
+        archive.writestr("docs/logo.png", b"\x89PNG")
+        archive.writestr("../escape.md", "# Outside")
+    target = tmp_path / "import"
+
+    # Act
+    extracted = extract_archive(archive_path, target)
+
+    # Assert
+    assert extracted == 1
+    assert (target / "docs" / "guide.md").read_text() == "# Guide"
+    assert not (tmp_path / "escape.md").exists()
+    assert not (target / "docs" / "logo.png").exists()
+
+
+def test_extract_archive_refuses_archives_over_the_size_limits(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_EXTRACTED_BYTES", 10000)
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_FILES", 2)
+    large = tmp_path / "large.zip"
+    with zipfile.ZipFile(large, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        # Compresses to a few hundred bytes
+        archive.writestr("notes.md", "#" * 100000)
+    many = tmp_path / "many.tar"
+    with tarfile.open(many, "w") as archive:
+        for i in range(3):
+            data = f"# Note {i}".encode()
+            member = tarfile.TarInfo(f"note_{i}.md")
+            member.size = len(data)
+            archive.addfile(member, io.BytesIO(data))
+    target = tmp_path / "import"
+
+    # Act
+    with pytest.raises(ValueError, match="100000 bytes"):
+        extract_archive(large, target)
+    with pytest.raises(ValueError, match="3 .md files"):
+        extract_archive(many, target)
+
+    # Assert
+    assert not target.exists()
@@ -0,0 +1,70 @@
+import json
+import pytest
+import uuid
+import httpx
+from unittest.mock import patch, MagicMock
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.API.main import app
+from app.API.Src.core.database.Postgres.database import get_db_session
+from app.API.Src.core.ExternalApiHelper.client_registry import get_client_registry
+from app.API.Src.Chat.models.base import Base
+from app.API.Src.Chat.models.message import Message
+from app.API.Src.Tools.Technical_anwer.technical_answer_provider import TechnicalAnswerProvider
+
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_forwards_tokens_and_saves_messages_at_the_end():
+    # Arrange
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_db_session():
+        async with session_factory() as session:
+            yield session
+
+    async def fake_chunks():
+        for chunk in ["Hel", "lo", " world"]:
+            yield chunk
+
+    async def fake_stream(self, **kwargs):
+        return {"rag_info": {"documents_used": 0}, "timings_ms": {"retrieval": 1.0}}, fake_chunks()
+
+    app.dependency_overrides[get_db_session] = override_db_session
+    app.dependency_overrides[get_client_registry] = lambda: MagicMock()
+    user_id = uuid.uuid4()
+
+    # Act
+    try:
+        with patch.object(TechnicalAnswerProvider, "__init__", lambda self, db, clients=None: None), \
+                patch.object(TechnicalAnswerProvider, "stream_answer_with_chat_context", fake_stream):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.post("/chat/stream", json={"user_id": str(user_id), "prompt": "Hi", "model": "gpt-4"})
+    finally:
+        app.dependency_overrides.clear()
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["start", "context", "token", "token", "token", "done"]
+    chat_id = events[0][1]["chat_id"]
+    assert "".join(data["text"] for name, data in events if name == "token") == "Hello world"
+    assert events[-1][1]["metadata"]["chat_id"] == chat_id
+    assert {"retrieval", "first_token", "completion", "total"} <= set(events[-1][1]["metadata"]["timings_ms"])
+    async with session_factory() as session:
+        messages = (await session.execute(select(Message).order_by(Message.created_at))).scalars().all()
+    assert [(message.author, message.message) for message in messages] == [("user", "Hi"), ("agent", "Hello world")]
+    assert {str(message.chat_id) for message in messages} == {chat_id}
+    await engine.dispose()
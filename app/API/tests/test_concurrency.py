@@ -0,0 +1,24 @@
+import asyncio
+import pytest
+from app.API.Src.core.ExternalApiHelper.concurrency import provider_semaphore
+
+
+async def acquire_all(provider: str, limit: int) -> int:
+    """Number of requests let through at once."""
+    semaphore = provider_semaphore(provider, limit)
+    acquired = 0
+    while not semaphore.locked():
+        await semaphore.acquire()
+        acquired += 1
+    return acquired
+
+
+def test_provider_semaphore_is_created_per_event_loop_with_its_limit():
+    # Act
+    first = asyncio.run(acquire_all("test-provider", 2))
+    # A new loop, as in a test or a worker thread; the semaphore of the first one is exhausted
+    second = asyncio.run(acquire_all("test-provider", 2))
+    changed = asyncio.run(acquire_all("test-provider", 3))
+
+    # Assert
+    assert (first, second, changed) == (2, 2, 3)
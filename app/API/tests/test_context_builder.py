@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+from app.API.Src.Document.models.document import Document
+from app.API.Src.RAG.context_builder import ContextBuilder, TRUNCATION_MARK
+
+
+def make_document(name: str, length: int):
+    return Document(content="x" * length, localisation=name)
+
+
+def make_messages(count: int, length: int):
+    return [
+        SimpleNamespace(author="user" if i % 2 == 0 else "agent", message=f"m{i}:" + "y" * length)
+        for i in range(count)
+    ]
+
+
+def test_build_fills_budget_with_best_documents_that_fit(byte_tokenizer):
+    # Arrange
+    builder = ContextBuilder(budget=500, tokenizer=byte_tokenizer)
+    documents = [make_document("best", 300), make_document("too_long", 300), make_document("short", 100)]
+
+    # Act
+    context = builder.build(documents, [])
+
+    # Assert
+    assert [document.localisation for document in context.documents] == ["best", "short"]
+    assert context.documents_dropped == 1
+    assert "Document 2 (short)" in context.document_context
+    assert context.total_tokens == len(context.document_context.encode()) <= 500
+
+
+def test_build_keeps_recent_messages_and_compresses_or_drops_older_ones(byte_tokenizer):
+    # Arrange
+    builder = ContextBuilder(budget=1000, tokenizer=byte_tokenizer)
+    builder.history_reserve = 600
+    builder.recent_messages = 2
+    builder.compressed_message_tokens = 20
+    messages = make_messages(30, 100)
+
+    # Act
+    context = builder.build([make_document("doc", 300)], messages)
+    usage = context.get_token_usage()
+
+    # Assert
+    lines = context.conversation_context.strip().split("\n")[1:]
+    assert lines[-2:] == ["User: m28:" + "y" * 100, "Assistant: m29:" + "y" * 100]
+    assert all(line.endswith(TRUNCATION_MARK) for line in lines[:-2])
+    assert usage["messages_used"] == 2
+    assert usage["messages_compressed"] == len(lines) - 2 > 0
+    assert usage["messages_dropped"] == 30 - len(lines) > 0
+    assert usage["total"] <= usage["budget"]
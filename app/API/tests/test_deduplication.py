@@ -0,0 +1,111 @@
+import uuid
+import pytest
+from sqlalchemy import select
+from app.API.Src.Document.ingestion.deduplication import ChunkDeduplicator
+from app.API.Src.Document.models.document import Document
+from app.API.Src.RAG.model.search_filters import SearchFilters
+
+ARTICLE = (
+    "Chunking strategy decides how a document is cut into pieces before embedding. "
+    "Fixed size chunks are simple and predictable, but they cut sentences and tables in half. "
+    "Splitting on markdown headers keeps sections together and stores the header path with every chunk, "
+    "so a retrieved chunk can be cited with its section. An overlap of a few sentences between chunks "
+    "keeps the context of a sentence that falls on a boundary. Chunks that are too small lose their meaning, "
+    "chunks that are too large dilute the embedding and waste prompt tokens."
+)
+UNRELATED = (
+    "Rate limits of the embeddings API are handled with a semaphore per provider and exponential backoff. "
+    "Requests are batched up to the provider limit, and failed batches are retried before the job fails."
+)
+
+
+async def ingest(session, clients, chunks):
+    """Link, embed and store chunks the way the ingestion services do."""
+    repository = clients.repository(session)
+    deduplicator = ChunkDeduplicator(repository)
+    canonical = await deduplicator.link(chunks)
+    embeddings = await clients.embedder.generate_embeddings([chunk.content for chunk in canonical])
+    saved = await repository.save_documents(chunks, embeddings)
+    return saved, deduplicator
+
+
+def chunk(content, source, user_id=None, header="Chunking"):
+    return Document(content=content, source=source, user_id=user_id, headers={"h2": [header]}, localisation=f"{source}_part_001.md")
+
+
+@pytest.mark.asyncio
+async def test_copies_are_linked_to_the_canonical_chunk_instead_of_embedded(session_factory, clients):
+    # Arrange
+    owner = uuid.uuid4()
+    async with session_factory() as session:
+        (original,), _ = await ingest(session, clients, [chunk(ARTICLE, "a.md")])
+    clients.embedder.texts = []
+    near_copy = ARTICLE.replace("boundary", "boundarys")
+
+    # Act
+    async with session_factory() as session:
+        saved, deduplicator = await ingest(session, clients, [
+            chunk(ARTICLE, "b.md"),
+            chunk(near_copy, "c.md"),
+            chunk(UNRELATED, "d.md"),
+            chunk(UNRELATED, "e.md"),
+            chunk(ARTICLE, "f.md", user_id=owner),
+        ])
+
+    # Assert
+    assert [document.canonical_id for document in saved] == [original.id, original.id, None, saved[2].id, None]
+    assert clients.embedder.texts == [UNRELATED, ARTICLE]
+    assert (deduplicator.exact, deduplicator.near) == (2, 1)
+    assert (await clients.store.get_collection_info())["points_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_retrieval_collapses_copies_and_filters_find_them_through_their_canonical_chunk(session_factory, clients):
+    # Arrange
+    async with session_factory() as session:
+        (original, copy), _ = await ingest(session, clients, [
+            chunk(ARTICLE, "a.md"),
+            chunk(ARTICLE, "b.md", header="Strategy"),
+        ])
+        repository = clients.repository(session)
+
+        # Act
+        scores = await repository.search_document_scores_by_vector(
+            "chunking", 5, filters=SearchFilters(sources=["b.md"], headers=["Strategy"])
+        )
+        documents = await repository.get_scored_documents({copy.id: 0.9, original.id: 0.8})
+
+    # Assert
+    assert list(scores) == [original.id]
+    assert [document.id for document in documents] == [copy.id]
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_canonical_chunk_promotes_one_of_its_copies(session_factory, clients):
+    # Arrange
+    async with session_factory() as session:
+        (original, *copies), _ = await ingest(session, clients, [
+            chunk(ARTICLE, "a.md"),
+            chunk(ARTICLE, "b.md"),
+            chunk(ARTICLE.replace("boundary", "boundarys"), "c.md"),
+        ])
+    clients.embedder.texts = []
+
+    # Act
+    async with session_factory() as session:
+        deleted = await clients.repository(session).delete_documents([original.id])
+    async with session_factory() as session:
+        remaining = (await session.scalars(select(Document).where(Document.id.in_([copy.id for copy in copies])))).all()
+        (later,), _ = await ingest(session, clients, [chunk(ARTICLE, "d.md")])
+        scores = await clients.repository(session).search_document_scores_by_vector(
+            "chunking", 5, filters=SearchFilters(sources=["c.md"])
+        )
+
+    # Assert
+    promoted = [document for document in remaining if document.canonical_id is None]
+    assert deleted == 1 and len(promoted) == 1
+    assert [document.canonical_id for document in remaining if document is not promoted[0]] == [promoted[0].id]
+    assert clients.embedder.texts == [promoted[0].content]
+    assert later.canonical_id == promoted[0].id
+    assert list(scores) == [promoted[0].id]
+    assert (await clients.store.get_collection_info())["points_count"] == 1
@@ -0,0 +1,136 @@
+import httpx
+import openai
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from app.API.Src.core.ExternalApiHelper.OpenAI.embedding_generator import EmbeddingGenerator
+from app.API.Src.core.ExternalApiHelper.OpenAI.embedding_cache import EmbeddingCache
+
+
+def fake_response(texts):
+    # Return items in reverse order to check that results are mapped back by index
+    data = [SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(texts)]
+    return SimpleNamespace(data=list(reversed(data)))
+
+
+def api_error(error_type, status_code: int) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    return error_type("API error", response=httpx.Response(status_code, request=request), body=None)
+
+
+def make_generator(tokenizer, batch_size: int, batch_tokens: int, cache: EmbeddingCache = None) -> EmbeddingGenerator:
+    generator = EmbeddingGenerator(cache=cache)
+    generator.tokenizer = tokenizer
+    generator.max_batch_size = batch_size
+    generator.max_batch_tokens = batch_tokens
+    generator.max_retries = 2
+    return generator
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_packs_requests_and_keeps_order(byte_tokenizer):
+    # Arrange
+    generator = make_generator(byte_tokenizer, batch_size=3, batch_tokens=10)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee", "f", "gg"]
+    calls = []
+    
+    def create(model, input):
+        calls.append(list(input))
+        return fake_response(input)
+    
+    generator.client.embeddings.create = AsyncMock(side_effect=create)
+    
+    # Act
+    embeddings = await generator.generate_embeddings(texts)
+    
+    # Assert
+    assert embeddings == [[float(len(text))] for text in texts]
+    assert sorted(calls) == sorted([["a", "bb", "ccc"], ["dddd", "eeeee", "f"], ["gg"]])
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_retries_only_failed_batch(byte_tokenizer):
+    # Arrange
+    generator = make_generator(byte_tokenizer, batch_size=2, batch_tokens=100)
+    texts = ["one", "two", "three", "four"]
+    calls = []
+    
+    def create(model, input):
+        calls.append(list(input))
+        if input == ["three", "four"] and calls.count(["three", "four"]) == 1:
+            raise api_error(openai.RateLimitError, 429)
+        return fake_response(input)
+    
+    generator.client.embeddings.create = AsyncMock(side_effect=create)
+    
+    # Act
+    with patch("asyncio.sleep", new=AsyncMock()):
+        embeddings = await generator.generate_embeddings(texts)
+    
+    # Assert
+    assert embeddings == [[3.0], [3.0], [5.0], [4.0]]
+    assert sorted(calls) == sorted([["one", "two"], ["three", "four"], ["three", "four"]])
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_does_not_retry_invalid_requests(byte_tokenizer):
+    # Arrange
+    generator = make_generator(byte_tokenizer, batch_size=2, batch_tokens=100)
+    generator.client.embeddings.create = AsyncMock(side_effect=api_error(openai.BadRequestError, 400))
+    
+    # Act
+    with patch("asyncio.sleep", new=AsyncMock()) as sleep:
+        with pytest.raises(openai.BadRequestError):
+            await generator.generate_embeddings(["one"])
+    
+    # Assert
+    assert generator.client.embeddings.create.await_count == 1
+    assert generator.client.max_retries == 0
+    sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_skips_cached_and_repeated_texts(tmp_path, byte_tokenizer):
+    # Arrange
+    disk_path = str(tmp_path / "embeddings.sqlite3")
+    generator = make_generator(byte_tokenizer, batch_size=10, batch_tokens=100, cache=EmbeddingCache(disk_path=disk_path))
+    calls = []
+    
+    def create(model, input):
+        calls.append(list(input))
+        return fake_response(input)
+    
+    generator.client.embeddings.create = AsyncMock(side_effect=create)
+    await generator.generate_embeddings(["cached", "also cached"])
+    generator.cache.close()
+    # A new process only has the persistent tier
+    generator.cache = EmbeddingCache(disk_path=disk_path)
+    
+    # Act
+    embeddings = await generator.generate_embeddings(["new", "cached", "new", "also cached"])
+    query_embedding = await generator.generate_embedding("new")
+    
+    # Assert
+    assert embeddings == [[3.0], [6.0], [3.0], [11.0]]
+    assert query_embedding == [3.0]
+    assert calls == [["cached", "also cached"], ["new"]]
+    stats = generator.cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 2, 1)
+    generator.cache.close()
+
+
+@pytest.mark.asyncio
+async def test_embedding_cache_evicts_least_recently_used_and_expired_entries():
+    # Arrange
+    cache = EmbeddingCache(max_size=2, ttl=60.0)
+    await cache.set_many("model", {"a": [1.0], "b": [2.0]})
+    await cache.get_many("model", ["a"])
+    
+    # Act
+    await cache.set_many("model", {"c": [3.0]})
+    with patch("time.monotonic", return_value=float("inf")):
+        expired = await cache.get_many("model", ["c"])
+    
+    # Assert
+    assert await cache.get_many("model", ["a", "b"]) == {"a": [1.0]}
+    assert expired == {}
@@ -0,0 +1,96 @@
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.API.Src.RAG.naive_rag import NaiveRAGService
+from app.API.Src.RAG.rank_fusion import reciprocal_rank_fusion
+
+
+def make_service(vector_scores=None, text_scores=None) -> NaiveRAGService:
+    service = NaiveRAGService.__new__(NaiveRAGService)
+    service.reranker = None
+    service.document_repository = MagicMock(
+        search_document_scores_by_vector=AsyncMock(return_value=vector_scores or {}),
+        search_document_scores_by_text=AsyncMock(return_value=text_scores or {})
+    )
+    return service
+
+
+def test_reciprocal_rank_fusion_favours_documents_ranked_by_both():
+    # Arrange
+    a, b, c, d = (uuid.uuid4() for _ in range(4))
+    dense = {a: 0.91, b: 0.90, c: 0.89}
+    lexical = {c: 12.0, d: 3.0}
+
+    # Act
+    fused = reciprocal_rank_fusion([dense, lexical], k=60)
+
+    # Assert
+    assert list(fused) == [c, a, b, d]
+    assert fused[c] == pytest.approx(1 / 63 + 1 / 61)
+
+
+def test_reciprocal_rank_fusion_limits_results():
+    # Arrange
+    ids = [uuid.uuid4() for _ in range(5)]
+
+    # Act
+    fused = reciprocal_rank_fusion([{document_id: 1.0 for document_id in ids}], limit=2)
+
+    # Assert
+    assert list(fused) == ids[:2]
+
+
+@pytest.mark.asyncio
+async def test_lexical_mode_skips_vector_search():
+    # Arrange
+    document_id = uuid.uuid4()
+    service = make_service(text_scores={document_id: 0.5})
+
+    # Act
+    dense_scores = await service.search_scores("ERR-4021", 5, mode="lexical")
+    scores = await service.rank_scores("ERR-4021", dense_scores, 5, mode="lexical")
+
+    # Assert
+    assert scores == {document_id: 0.5}
+    service.document_repository.search_document_scores_by_vector.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_fuses_dense_and_lexical_candidates(monkeypatch):
+    # Arrange
+    monkeypatch.setattr("app.API.Src.RAG.naive_rag.settings.HYBRID_CANDIDATES", 10)
+    semantic, exact = uuid.uuid4(), uuid.uuid4()
+    service = make_service(vector_scores={semantic: 0.9, exact: 0.7}, text_scores={exact: 2.0})
+
+    # Act
+    dense_scores = await service.search_scores("ERR-4021", 1, mode="hybrid")
+    scores = await service.rank_scores("ERR-4021", dense_scores, 1, mode="hybrid")
+
+    # Assert
+    assert list(scores) == [exact]
+    service.document_repository.search_document_scores_by_vector.assert_awaited_once_with(
+        prompt="ERR-4021", count=10, score_threshold=None, filters=None
+    )
+    service.document_repository.search_document_scores_by_text.assert_awaited_once_with(
+        prompt="ERR-4021", count=10, filters=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_falls_back_to_dense_results_when_text_search_fails():
+    # Arrange
+    document_id = uuid.uuid4()
+    service = make_service()
+    service.document_repository.search_document_scores_by_text.side_effect = RuntimeError("no index")
+
+    # Act
+    scores = await service.rank_scores("question", {document_id: 0.8}, 5, mode="hybrid")
+
+    # Assert
+    assert list(scores) == [document_id]
+
+
+def test_resolve_mode_rejects_unknown_mode():
+    # Act / Assert
+    with pytest.raises(ValueError):
+        NaiveRAGService.resolve_mode("sparse")
@@ -0,0 +1,201 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+from app.API.Src.core.config import settings
+from app.API.Src.core.database.Qdrant.models import VectorSearchQuery
+from app.API.Src.Document.documentSplitter.token_based_text_splitter import TextSplitter
+from app.API.Src.Document.ingestion.chunk_diff import ChunkDiff
+from app.API.Src.Document.ingestion.worker_pool import IngestionWorkerPool
+from app.API.Src.Document.models.document import Document, content_hash
+from app.API.Src.Document.models.ingestion_job import IngestionJob
+from app.API.Src.Document.repository.ingestion_job_repository import IngestionJobRepository
+
+
+def guide(steps) -> str:
+    return "".join(f"## Step {i}\n{text}\n\n" for i, text in enumerate(steps))
+
+
+async def upload(session_factory, path, text) -> uuid.UUID:
+    path.write_text(text)
+    async with session_factory() as session:
+        job = await IngestionJobRepository(session).enqueue(str(path), "guide.md")
+    return job.id
+
+
+@pytest.mark.asyncio
+async def test_reupload_embeds_only_changed_chunks_and_removes_vanished_ones(
+    tmp_path, monkeypatch, split_by_bytes, session_factory, clients
+):
+    # Arrange
+    monkeypatch.setattr(settings, "DOCUMENT_TOKEN_LIMIT", 120)
+    monkeypatch.setattr(settings, "CORPUS_PATH", str(tmp_path))
+    # Every new chunk is embedded; the small chunks of the test file repeat
+    monkeypatch.setattr(settings, "DEDUP_ENABLED", False)
+    steps = [f"Run the command number {i} and check the output." for i in range(12)]
+    edited = steps[:5] + ["Run the new command and compare both outputs."] + steps[6:10]
+    pool = IngestionWorkerPool(session_factory, clients)
+    await upload(session_factory, tmp_path / "guide_20260101_120000.md", guide(steps))
+    await pool.process_next()
+    async with session_factory() as session:
+        before = (await session.scalars(select(Document))).all()
+    clients.embedder.texts = []
+
+    # Act
+    job_id = await upload(session_factory, tmp_path / "guide_20260102_120000.md", guide(edited))
+    await pool.process_next()
+
+    # Assert
+    splitter = TextSplitter()
+    new_version = [chunk.content for chunk in await splitter.split(guide(edited), 120)]
+    async with session_factory() as session:
+        job = await IngestionJobRepository(session).get_job(job_id)
+        documents = (await session.scalars(select(Document).order_by(Document.localisation))).all()
+    assert job.status == "done"
+    assert sorted(clients.embedder.texts) == sorted(
+        content for content in new_version if content not in {document.content for document in before}
+    )
+    assert 0 < len(clients.embedder.texts) < len(new_version)
+    assert [document.content for document in documents] == new_version
+    assert all(document.localisation.startswith("guide_20260102_120000_part_") for document in documents)
+    assert job.document_ids == [str(document.id) for document in documents]
+    kept = [document for document in documents if document.id in {document.id for document in before}]
+    assert len(kept) == len(documents) - len(clients.embedder.texts)
+    assert all(document.content_hash == content_hash(document.content) for document in documents)
+    assert (await clients.store.get_collection_info())["points_count"] == len(documents)
+    assert not (tmp_path / "guide_20260101_120000.md").exists()
+    assert (tmp_path / "guide_20260102_120000.md").exists()
+
+
+@pytest.mark.asyncio
+async def test_reupload_with_deduplication_embeds_an_edited_chunk_once(
+    tmp_path, monkeypatch, split_by_bytes, session_factory, clients
+):
+    # Arrange
+    monkeypatch.setattr(settings, "DOCUMENT_TOKEN_LIMIT", 1200)
+    monkeypatch.setattr(settings, "CORPUS_PATH", str(tmp_path))
+    vocabulary = [f"{letter}{vowel}{end}" for letter in "bdfgklmnprst" for vowel in "aeiou" for end in "xyz"]
+    paragraphs = [random.Random(i).choices(vocabulary, k=200) for i in range(4)]
+    steps = [" ".join(words) for words in paragraphs]
+    # One word of a paragraph edited: the new chunk is a near-duplicate of the chunk it replaces,
+    # linked to it and promoted when the previous version is deleted
+    edited = list(steps)
+    edited[2] = " ".join(paragraphs[2][:100] + ["qqq"] + paragraphs[2][101:])
+    pool = IngestionWorkerPool(session_factory, clients)
+    await upload(session_factory, tmp_path / "guide_20260101_120000.md", guide(steps))
+    await pool.process_next()
+    clients.embedder.texts = []
+
+    # Act
+    await upload(session_factory, tmp_path / "guide_20260102_120000.md", guide(edited))
+    await pool.process_next()
+
+    # Assert
+    async with session_factory() as session:
+        documents = (await session.scalars(select(Document).order_by(Document.localisation))).all()
+    changed = [document for document in documents if "qqq" in document.content]
+    assert len(changed) == 1 and changed[0].canonical_id is None
+    assert clients.embedder.texts == [changed[0].content]
+    assert all(document.canonical_id is None for document in documents)
+    points = await clients.store.search_similar(VectorSearchQuery(query_vector=[1.0, 0.0], limit=10))
+    assert sorted(point.id for point in points) == sorted(str(document.id) for document in documents)
+
+
+def test_chunk_diff_matches_content_and_headers_in_order():
+    # Arrange
+    stored = [
+        Document(id=uuid.uuid4(), content="intro", content_hash=content_hash("intro"), headers={}, localisation="a_part_001.md"),
+        Document(id=uuid.uuid4(), content="same", content_hash=content_hash("same"), headers={"h2": ["A"]}, localisation="a_part_002.md"),
+        Document(id=uuid.uuid4(), content="same", content_hash=content_hash("same"), headers={"h2": ["B"]}, localisation="a_part_003.md"),
+        Document(id=uuid.uuid4(), content="gone", content_hash=content_hash("gone"), headers={}, localisation="a_part_004.md"),
+    ]
+    diff = ChunkDiff(stored)
+
+    # Act
+    matches = [
+        diff.match(Document(content="same", headers={"h2": ["B"]}), "b_part_001.md"),
+        diff.match(Document(content="same", headers={"h2": ["C"]}), "b_part_002.md"),
+        diff.match(Document(content="intro", headers={}), "b_part_003.md"),
+    ]
+
+    # Assert
+    assert [match.id if match else None for match in matches] == [stored[2].id, None, stored[0].id]
+    assert diff.renamed == {stored[2].id: "b_part_001.md", stored[0].id: "b_part_003.md"}
+    assert diff.vanished_ids() == [stored[1].id, stored[3].id]
+    assert str(diff) == "2 unchanged, 1 new, 2 removed"
+
+
+@pytest.mark.asyncio
+async def test_insertion_near_the_start_keeps_the_chunks_of_later_sections(byte_tokenizer):
+    # Arrange
+    splitter = TextSplitter()
+    splitter.tokenizer = byte_tokenizer
+    sections = [
+        f"## Section {i}\n\n" + "".join(f"Sentence {j} of section {i} explains a step.\n" for j in range(3 + 4 * i))
+        for i in range(8)
+    ]
+    text = "# Guide\n\n" + "\n".join(sections)
+    edited = text.replace("Sentence 1 of section 0", "A new first remark. Sentence 1 of section 0", 1)
+    stored = await splitter.split(text, limit=300)
+    for index, document in enumerate(stored):
+        document.id = uuid.uuid4()
+        document.content_hash = content_hash(document.content)
+        document.localisation = f"guide_part_{index + 1:03d}.md"
+    diff = ChunkDiff(stored)
+
+    # Act
+    new_version = await splitter.split(edited, limit=300)
+    kept = [diff.match(chunk, f"guide_part_{index + 1:03d}.md") for index, chunk in enumerate(new_version)]
+
+    # Assert
+    later = [index for index, chunk in enumerate(new_version) if chunk.headers.get("h2", [""])[-1] != "Section 0"]
+    assert len(later) > 10
+    assert all(kept[index] is not None for index in later)
+    assert len(diff.vanished_ids()) == len(new_version) - len(later)
+
+
+@pytest.mark.asyncio
+async def test_claim_next_waits_for_the_running_job_of_the_same_file(monkeypatch, session_factory):
+    # Arrange
+    monkeypatch.setattr(settings, "INGESTION_STALE_AFTER", 60.0)
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        session.add_all([
+            IngestionJob(id=uuid.uuid4(), status="running", file_path="a1.md", source="a.md",
+                         created_at=now - timedelta(hours=2), heartbeat_at=now),
+            IngestionJob(id=uuid.uuid4(), status="queued", file_path="a2.md", source="a.md",
+                         created_at=now - timedelta(hours=1)),
+            IngestionJob(id=uuid.uuid4(), status="queued", file_path="b.md", source="b.md",
+                         created_at=now),
+        ])
+        await session.commit()
+
+        # Act
+        jobs = IngestionJobRepository(session)
+        claimed = [await jobs.claim_next(), await jobs.claim_next()]
+
+    # Assert
+    assert claimed[0].file_path == "b.md"
+    assert claimed[1] is None
+
+
+@pytest.mark.asyncio
+async def test_claim_import_leaves_files_with_an_upload_running_queued(monkeypatch, session_factory):
+    # Arrange
+    monkeypatch.setattr(settings, "INGESTION_STALE_AFTER", 60.0)
+    now = datetime.now(timezone.utc)
+    import_id = uuid.uuid4()
+    async with session_factory() as session:
+        session.add(IngestionJob(id=uuid.uuid4(), status="running", file_path="a1.md", source="a.md", heartbeat_at=now))
+        await session.commit()
+        jobs = IngestionJobRepository(session)
+        await jobs.enqueue_import(import_id, [("import/a.md", "a.md"), ("import/b.md", "b.md")])
+
+        # Act
+        claimed = await jobs.claim_import(import_id)
+        summary = await jobs.import_summary(import_id)
+
+    # Assert
+    assert [job.source for job in claimed] == ["b.md"]
+    assert summary["files"]["queued"] == 1
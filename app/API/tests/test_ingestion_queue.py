@@ -0,0 +1,202 @@
+import asyncio
+import io
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import select
+from app.API.Src.core.config import settings
+from app.API.Src.Document.controller.upload_document import UploadDocumentController
+from app.API.Src.Document.ingestion.document_ingestion import DocumentIngestionService
+from app.API.Src.Document.ingestion.worker_pool import IngestionWorkerPool
+from app.API.Src.Document.models.document import Document
+from app.API.Src.Document.models.ingestion_job import IngestionJob
+from app.API.Src.Document.repository.ingestion_job_repository import IngestionJobRepository
+
+
+async def queue_file(session_factory, tmp_path, monkeypatch) -> uuid.UUID:
+    monkeypatch.setattr(settings, "DOCUMENT_TOKEN_LIMIT", 120)
+    monkeypatch.setattr(settings, "INGESTION_BATCH_SIZE", 2)
+    file_path = tmp_path / "guide_20260101_120000.md"
+    file_path.write_text("".join(f"## Step {i}\nRun the command number {i} and check the output.\n\n" for i in range(12)))
+    async with session_factory() as session:
+        job = await IngestionJobRepository(session).enqueue(str(file_path), "guide.md")
+    return job.id
+
+
+@pytest.mark.asyncio
+async def test_claim_next_takes_oldest_queued_job_and_stale_running_jobs(monkeypatch, session_factory):
+    # Arrange
+    now = datetime.now(timezone.utc)
+    monkeypatch.setattr(settings, "INGESTION_STALE_AFTER", 60.0)
+    async with session_factory() as session:
+        session.add_all([
+            IngestionJob(id=uuid.uuid4(), status="running", file_path="a.md", source="alive.md",
+                         created_at=now - timedelta(hours=3), heartbeat_at=now),
+            IngestionJob(id=uuid.uuid4(), status="running", file_path="b.md", source="dead.md", attempts=1,
+                         created_at=now - timedelta(hours=2), heartbeat_at=now - timedelta(minutes=5)),
+            IngestionJob(id=uuid.uuid4(), status="queued", file_path="c.md", source="new.md",
+                         created_at=now - timedelta(hours=1)),
+            IngestionJob(id=uuid.uuid4(), status="done", file_path="d.md", source="done.md",
+                         created_at=now - timedelta(hours=4)),
+        ])
+        await session.commit()
+
+        # Act
+        jobs = IngestionJobRepository(session)
+        claimed = [await jobs.claim_next(), await jobs.claim_next(), await jobs.claim_next()]
+
+    # Assert
+    assert [job.source for job in claimed[:2]] == ["dead.md", "new.md"]
+    assert [job.attempts for job in claimed[:2]] == [2, 1]
+    assert claimed[2] is None
+
+
+@pytest.mark.asyncio
+async def test_worker_ingests_file_in_batches_and_reports_progress(tmp_path, monkeypatch, split_by_bytes, session_factory, clients):
+    # Arrange
+    job_id = await queue_file(session_factory, tmp_path, monkeypatch)
+    # Every chunk is embedded; the small chunks of the test file repeat
+    monkeypatch.setattr(settings, "DEDUP_ENABLED", False)
+    pool = IngestionWorkerPool(session_factory, clients)
+
+    # Act
+    processed = await pool.process_next()
+    idle = await pool.process_next()
+
+    # Assert
+    async with session_factory() as session:
+        job = await IngestionJobRepository(session).get_job(job_id)
+        documents = (await session.scalars(select(Document).order_by(Document.localisation))).all()
+    assert (processed, idle) == (True, False)
+    assert job.status == "done"
+    assert job.chunks_done == job.chunks_total == len(documents) > 2
+    assert clients.embedder.calls == -(-len(documents) // 2)
+    assert set(job.timings) == {"read", "split", "deduplication", "embedding", "storage", "total"}
+    assert documents[0].localisation == "guide_20260101_120000_part_001.md"
+    assert {document.source for document in documents} == {"guide.md"}
+    assert (await clients.store.get_collection_info())["points_count"] == len(documents)
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_removes_stored_parts_and_retries_until_max_attempts(
+    tmp_path, monkeypatch, split_by_bytes, session_factory, clients
+):
+    # Arrange
+    job_id = await queue_file(session_factory, tmp_path, monkeypatch)
+    monkeypatch.setattr(settings, "INGESTION_MAX_ATTEMPTS", 2)
+    clients.embedder.fail_on_call = 2
+    pool = IngestionWorkerPool(session_factory, clients)
+
+    # Act
+    await pool.process_next()
+    async with session_factory() as session:
+        after_first = await IngestionJobRepository(session).get_job(job_id)
+    clients.embedder.calls = 0
+    await pool.process_next()
+
+    # Assert
+    async with session_factory() as session:
+        job = await IngestionJobRepository(session).get_job(job_id)
+        documents = (await session.scalars(select(Document))).all()
+    assert after_first.status == "queued"
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert "embeddings API unavailable" in job.error
+    assert documents == []
+    assert (await clients.store.get_collection_info())["points_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_takeover_of_an_interrupted_job_removes_the_parts_it_stored(
+    tmp_path, monkeypatch, split_by_bytes, session_factory, clients
+):
+    # Arrange
+    job_id = await queue_file(session_factory, tmp_path, monkeypatch)
+    monkeypatch.setattr(settings, "DEDUP_ENABLED", False)
+    monkeypatch.setattr(settings, "INGESTION_STALE_AFTER", 60.0)
+    generate_embeddings = clients.embedder.generate_embeddings
+
+    async def cancelled_on_third_batch(texts):
+        # The worker is cancelled, e.g. in a restart, so the attempt cannot clean up
+        if clients.embedder.calls == 2:
+            raise asyncio.CancelledError()
+        return await generate_embeddings(texts)
+
+    monkeypatch.setattr(clients.embedder, "generate_embeddings", cancelled_on_third_batch)
+    pool = IngestionWorkerPool(session_factory, clients)
+    with pytest.raises(asyncio.CancelledError):
+        await pool.process_next()
+    async with session_factory() as session:
+        job = await IngestionJobRepository(session).get_job(job_id)
+        job.heartbeat_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        await session.commit()
+        interrupted = (await session.scalars(select(Document))).all()
+    monkeypatch.setattr(clients.embedder, "generate_embeddings", generate_embeddings)
+
+    # Act
+    await pool.process_next()
+
+    # Assert
+    async with session_factory() as session:
+        job = await IngestionJobRepository(session).get_job(job_id)
+        documents = (await session.scalars(select(Document))).all()
+    assert len(interrupted) == 4
+    assert job.status == "done"
+    assert job.attempts == 2
+    assert len(documents) == job.chunks_total
+    assert not {document.id for document in interrupted} & {document.id for document in documents}
+    assert (await clients.store.get_collection_info())["points_count"] == len(documents)
+
+
+@pytest.mark.asyncio
+async def test_job_storing_no_batch_for_longer_than_the_stale_timeout_is_not_taken_over(
+    tmp_path, monkeypatch, split_by_bytes, session_factory, clients
+):
+    # Arrange
+    await queue_file(session_factory, tmp_path, monkeypatch)
+    pool = IngestionWorkerPool(session_factory, clients)
+    await pool.process_next()
+    # The same file again: every chunk is kept, so no batch is stored
+    job_id = await queue_file(session_factory, tmp_path, monkeypatch)
+    monkeypatch.setattr(settings, "INGESTION_STALE_AFTER", 0.3)
+    taken_over = []
+    read_blocks = DocumentIngestionService._read_blocks
+
+    async def slow_read_blocks(file_path, timings):
+        async for block in read_blocks(file_path, timings):
+            yield block
+        await asyncio.sleep(1.0)
+        async with session_factory() as session:
+            taken_over.append(await IngestionJobRepository(session).claim_next())
+
+    monkeypatch.setattr(DocumentIngestionService, "_read_blocks", staticmethod(slow_read_blocks))
+
+    # Act
+    await pool.process_next()
+
+    # Assert
+    async with session_factory() as session:
+        job = await IngestionJobRepository(session).get_job(job_id)
+    assert taken_over == [None]
+    assert job.status == "done"
+    assert job.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_is_spooled_in_blocks_and_rejected_when_not_utf8(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "UPLOAD_READ_SIZE", 3)
+    text = "# Zażółć gęślą jaźń\n"
+    valid = UploadFile(file=io.BytesIO(text.encode("utf-8")), filename="notes.md")
+    invalid = UploadFile(file=io.BytesIO(b"# Notes\n\xff\xfe"), filename="broken.md")
+
+    # Act
+    await UploadDocumentController._spool_upload(valid, tmp_path / "notes.md")
+    with pytest.raises(HTTPException) as error:
+        await UploadDocumentController._spool_upload(invalid, tmp_path / "broken.md")
+
+    # Assert
+    assert (tmp_path / "notes.md").read_text(encoding="utf-8") == text
+    assert error.value.status_code == 400
+    assert not (tmp_path / "broken.md").exists()
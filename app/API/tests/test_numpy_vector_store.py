@@ -0,0 +1,96 @@
+import pytest
+from app.API.Src.core.database.Numpy.repository import NumpyRepository
+from app.API.Src.core.database.Qdrant.models import VectorDocument, VectorSearchQuery
+from app.API.Src.core.database.Qdrant.repository import QdrantRepository
+from app.API.Src.core.database.vector_store import VectorStore, create_vector_store
+
+
+async def make_store(path=None) -> NumpyRepository:
+    store = NumpyRepository(path=path)
+    store.vector_size = 3
+    await store.create_collection()
+    await store.upsert_documents(
+        [
+            VectorDocument.from_document("a", "about apples", lang="en"),
+            VectorDocument.from_document("b", "about bananas", lang="pl"),
+            VectorDocument.from_document("c", "about cherries", lang="en"),
+        ],
+        [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.7, 0.7, 0.0]]
+    )
+    return store
+
+
+def test_backends_implement_vector_store():
+    # Act / Assert
+    assert isinstance(create_vector_store("numpy"), VectorStore)
+    assert issubclass(QdrantRepository, VectorStore)
+    with pytest.raises(ValueError):
+        create_vector_store("faiss")
+
+
+@pytest.mark.asyncio
+async def test_search_returns_cosine_ranking_with_payload():
+    # Arrange
+    store = await make_store()
+
+    # Act
+    results = await store.search_similar(VectorSearchQuery(query_vector=[2.0, 0.2, 0.0], limit=2))
+
+    # Assert
+    assert [result.id for result in results] == ["a", "c"]
+    assert results[0].score == pytest.approx(0.995, abs=1e-3)
+    assert results[0].content == "about apples"
+    assert results[0].metadata == {"lang": "en"}
+
+
+@pytest.mark.asyncio
+async def test_search_applies_score_threshold_and_filter():
+    # Arrange
+    store = await make_store()
+    query_filter = {"must": [{"key": "lang", "match": {"value": "en"}}]}
+
+    # Act
+    thresholded = await store.search_similar(
+        VectorSearchQuery(query_vector=[0.0, 1.0, 0.0], limit=3, score_threshold=0.5)
+    )
+    filtered = await store.search_similar(
+        VectorSearchQuery(query_vector=[0.0, 1.0, 0.0], limit=3, filter_conditions=query_filter)
+    )
+
+    # Assert
+    assert [result.id for result in thresholded] == ["b", "c"]
+    assert [result.id for result in filtered] == ["c", "a"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_replaces_and_delete_keeps_remaining_points():
+    # Arrange
+    store = await make_store()
+
+    # Act
+    await store.upsert_document(VectorDocument.from_document("a", "apples moved"), [0.0, 0.0, 1.0])
+    await store.delete_documents(["b", "missing"])
+    results = await store.search_similar(VectorSearchQuery(query_vector=[0.0, 0.0, 1.0], limit=5))
+
+    # Assert
+    assert [result.id for result in results] == ["a", "c"]
+    assert results[0].content == "apples moved"
+    assert (await store.get_collection_info())["points_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_index_is_persisted_and_reopened(tmp_path):
+    # Arrange
+    store = await make_store(path=str(tmp_path))
+    await store.delete_document("b")
+
+    # Act
+    reopened = NumpyRepository(path=str(tmp_path))
+    reopened.vector_size = 3
+    await reopened.create_collection()
+    results = await reopened.search_similar(VectorSearchQuery(query_vector=[1.0, 0.0, 0.0], limit=5))
+    await reopened.upsert_document(VectorDocument.from_document("d", "about dates"), [0.0, 1.0, 0.0])
+
+    # Assert
+    assert [result.id for result in results] == ["a", "c"]
+    assert (await reopened.get_collection_info())["points_count"] == 3
@@ -0,0 +1,59 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.API.Src.Chat.models.base import Base
+from app.API.Src.Chat.models.chat_history import ChatHistory
+from app.API.Src.Chat.repository.chat_repository import ChatRepository
+from app.API.Src.core.database.Postgres.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    # Arrange
+    created_at = datetime(2024, 5, 1, 12, 30)
+    row_id = uuid.uuid4()
+
+    # Act
+    cursor = encode_cursor(created_at, row_id)
+
+    # Assert
+    assert decode_cursor(cursor) == (created_at, row_id)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_chat_pages_follow_cursor_without_gaps():
+    # Arrange
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    start = datetime(2024, 1, 1)
+    async with session_factory() as session:
+        # Two chats per timestamp so that the id tie-breaker is exercised
+        for i in range(7):
+            session.add(ChatHistory(id=uuid.uuid4(), user_id=uuid.uuid4(), created_at=start + timedelta(minutes=i // 2)))
+        await session.commit()
+
+    # Act
+    seen = []
+    cursor = None
+    async with session_factory() as session:
+        repository = ChatRepository(session)
+        while True:
+            chats, total, cursor = await repository.get_chats_with_messages_paginated(
+                limit=3, cursor=cursor, message_limit=0, total_mode="none"
+            )
+            seen.extend(chats)
+            if cursor is None:
+                break
+    await engine.dispose()
+
+    # Assert
+    assert total is None
+    assert len(seen) == 7
+    assert len({chat.id for chat in seen}) == 7
+    assert all(chat.messages == [] for chat in seen)
+    keys = [(chat.created_at, chat.id) for chat in seen]
+    assert keys == sorted(keys, reverse=True)
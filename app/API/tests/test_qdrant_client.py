@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.API.Src.core.database.Qdrant.client import QdrantDatabase
+
+
+def make_client(healthy: bool = True) -> MagicMock:
+    client = MagicMock()
+    client.get_collections = AsyncMock(side_effect=None if healthy else ConnectionError("unavailable"))
+    client.close = AsyncMock()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_run_reconnects_and_retries_when_qdrant_stopped_answering():
+    # Arrange
+    broken, fresh = make_client(healthy=False), make_client()
+    database = QdrantDatabase()
+    database.client = broken
+    operation = AsyncMock(side_effect=[ConnectionError("connection reset"), "result"])
+
+    # Act
+    with patch.object(QdrantDatabase, "_create_client", return_value=fresh):
+        result = await database.run(operation)
+
+    # Assert
+    assert result == "result"
+    assert operation.await_args_list[1].args == (fresh,)
+    assert database.client is fresh
+    broken.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_run_raises_errors_of_a_healthy_server_without_reconnecting():
+    # Arrange
+    client = make_client()
+    database = QdrantDatabase()
+    database.client = client
+    operation = AsyncMock(side_effect=ValueError("collection not found"))
+
+    # Act / Assert
+    with patch.object(QdrantDatabase, "_create_client") as create_client:
+        with pytest.raises(ValueError):
+            await database.run(operation)
+    create_client.assert_not_called()
+    assert operation.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_health_check_reports_unreachable_server():
+    # Arrange
+    database = QdrantDatabase()
+    database.client = make_client(healthy=False)
+
+    # Act / Assert
+    assert await database.health_check() is False
+    assert await QdrantDatabase().health_check() is False
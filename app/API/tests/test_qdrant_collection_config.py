@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from qdrant_client.http import models
+from app.API.Src.core.config import settings
+from app.API.Src.core.database.Qdrant.repository import QdrantRepository
+
+
+def run_with(client: MagicMock):
+    async def run(operation):
+        return await operation(client)
+    return run
+
+
+def test_defaults_use_full_precision_vectors_and_qdrant_search_defaults(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "QDRANT_QUANTIZATION", "none")
+    monkeypatch.setattr(settings, "QDRANT_SEARCH_EF", 0)
+
+    # Act
+    config = QdrantRepository().collection_config()
+
+    # Assert
+    assert config["quantization_config"] is None
+    assert config["vectors_config"].on_disk is False
+    assert QdrantRepository.search_params() is None
+
+
+def test_quantization_settings_build_configs_and_rescoring_search(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "QDRANT_QUANTIZATION", "product")
+    monkeypatch.setattr(settings, "QDRANT_PRODUCT_COMPRESSION", "x32")
+    monkeypatch.setattr(settings, "QDRANT_QUANTIZATION_OVERSAMPLING", 3.0)
+    monkeypatch.setattr(settings, "QDRANT_SEARCH_EF", 128)
+
+    # Act
+    product = QdrantRepository.quantization_config()
+    params = QdrantRepository.search_params()
+    monkeypatch.setattr(settings, "QDRANT_QUANTIZATION", "scalar")
+    scalar = QdrantRepository.quantization_config()
+
+    # Assert
+    assert product.product.compression == models.CompressionRatio.X32
+    assert scalar.scalar.type == models.ScalarType.INT8
+    assert params.hnsw_ef == 128
+    assert params.quantization.rescore is True
+    assert params.quantization.oversampling == 3.0
+    monkeypatch.setattr(settings, "QDRANT_QUANTIZATION", "binary")
+    with pytest.raises(ValueError):
+        QdrantRepository.quantization_config()
+
+
+@pytest.mark.asyncio
+async def test_update_collection_config_applies_settings_and_disables_quantization(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "QDRANT_QUANTIZATION", "none")
+    monkeypatch.setattr(settings, "QDRANT_VECTORS_ON_DISK", True)
+    monkeypatch.setattr(settings, "QDRANT_HNSW_M", 32)
+    client = MagicMock()
+    client.update_collection = AsyncMock(return_value=True)
+
+    # Act
+    with patch("app.API.Src.core.database.Qdrant.repository.qdrant_db.run", side_effect=run_with(client)):
+        updated = await QdrantRepository("documents").update_collection_config()
+
+    # Assert
+    assert updated is True
+    kwargs = client.update_collection.await_args.kwargs
+    assert kwargs["collection_name"] == "documents"
+    assert kwargs["vectors_config"][""].on_disk is True
+    assert kwargs["hnsw_config"].m == 32
+    assert kwargs["quantization_config"] == models.Disabled.DISABLED
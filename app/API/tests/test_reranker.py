@@ -0,0 +1,62 @@
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.API.Src.Document.models.document import Document
+from app.API.Src.RAG.naive_rag import NaiveRAGService
+from app.API.Src.RAG.reranker import LexicalReranker
+
+
+def make_documents(*contents):
+    return [Document(id=uuid.uuid4(), content=content, localisation=f"doc{i}.md") for i, content in enumerate(contents)]
+
+
+def test_rerank_promotes_candidates_sharing_query_terms():
+    # Arrange
+    documents = make_documents(
+        "General notes about the billing system",
+        "How to rotate API keys",
+        "Error ERR-4021 means the invoice export timed out"
+    )
+
+    # Act
+    reranked = LexicalReranker(weight=0.7).rerank("What does ERR-4021 mean?", documents, top_k=2)
+
+    # Assert
+    assert reranked[0] is documents[2]
+    assert len(reranked) == 2
+    assert reranked[0].rerank_score > reranked[1].rerank_score
+
+
+def test_rerank_with_zero_weight_keeps_retrieval_order():
+    # Arrange
+    documents = make_documents("alpha", "beta query", "gamma query query")
+
+    # Act
+    reranked = LexicalReranker(weight=0.0).rerank("query", documents, top_k=3)
+
+    # Assert
+    assert reranked == documents
+
+
+@pytest.mark.asyncio
+async def test_format_scored_context_reranks_over_fetched_candidates(monkeypatch):
+    # Arrange
+    monkeypatch.setattr("app.API.Src.RAG.naive_rag.settings.RERANK_ENABLED", True)
+    monkeypatch.setattr("app.API.Src.RAG.naive_rag.settings.RERANK_CANDIDATES", 3)
+    documents = make_documents("unrelated text", "more unrelated text", "reset the password from the profile page")
+    repository = MagicMock(
+        search_document_scores_by_vector=AsyncMock(return_value={document.id: 0.5 for document in documents}),
+        get_scored_documents=AsyncMock(return_value=documents)
+    )
+    service = NaiveRAGService(MagicMock(), MagicMock())
+    service.document_repository = repository
+    timings = {}
+
+    # Act
+    scores = await service.search_scores("reset password", 1, mode="dense")
+    rag_response = await service.format_scored_context("reset password", scores, 1, timings)
+
+    # Assert
+    assert repository.search_document_scores_by_vector.await_args.kwargs["count"] == 3
+    assert rag_response.documents == [documents[2]]
+    assert "rerank" in timings
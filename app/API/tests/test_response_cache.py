@@ -0,0 +1,162 @@
+import pytest
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.API.Src.core.ExternalApiHelper.model.ai_response import AiResponse
+from app.API.Src.RAG.model.rag_response import RAGResponse
+from app.API.Src.Tools.Technical_anwer.response_cache import ResponseCache
+from app.API.Src.Tools.Technical_anwer.technical_answer_provider import TechnicalAnswerProvider
+
+
+def make_response(answer: str) -> AiResponse:
+    return AiResponse(finishReason="stop", answer=answer, metadata={"usage": {"total_tokens": 10}})
+
+
+def test_get_hits_normalized_prompt_with_same_context():
+    # Arrange
+    cache = ResponseCache()
+    cache.set("gpt-4", "How do I reset my password?", "ctx", ["doc-1"], make_response("Use the link"))
+
+    # Act
+    hit = cache.get("gpt-4", "  how do I   reset my password ", "ctx")
+    other_context = cache.get("gpt-4", "How do I reset my password?", "other-ctx")
+    other_model = cache.get("gemini-pro", "How do I reset my password?", "ctx")
+
+    # Assert
+    assert hit.answer == "Use the link"
+    assert other_context is None
+    assert other_model is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_get_returns_copy_of_cached_answer():
+    # Arrange
+    cache = ResponseCache()
+    cache.set("gpt-4", "Question", "ctx", [], make_response("Answer"))
+
+    # Act
+    cache.get("gpt-4", "Question", "ctx").metadata["timings_ms"] = {"total": 1}
+
+    # Assert
+    assert "timings_ms" not in cache.get("gpt-4", "Question", "ctx").metadata
+
+
+def test_get_matches_similar_prompt_above_threshold():
+    # Arrange
+    cache = ResponseCache(similarity_threshold=0.95)
+    cache.set("gpt-4", "Reset password", "ctx", [], make_response("Use the link"), embedding=[1.0, 0.0])
+
+    # Act
+    similar = cache.get("gpt-4", "Password reset", "ctx", embedding=[0.99, 0.05])
+    unrelated = cache.get("gpt-4", "Delete account", "ctx", embedding=[0.0, 1.0])
+
+    # Assert
+    assert similar.answer == "Use the link"
+    assert unrelated is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_set_evicts_least_recently_used_beyond_max_size():
+    # Arrange
+    cache = ResponseCache(max_size=2)
+    cache.set("gpt-4", "first", "ctx", [], make_response("1"))
+    cache.set("gpt-4", "second", "ctx", [], make_response("2"))
+    cache.get("gpt-4", "first", "ctx")
+
+    # Act
+    cache.set("gpt-4", "third", "ctx", [], make_response("3"))
+
+    # Assert
+    assert cache.get("gpt-4", "first", "ctx") is not None
+    assert cache.get("gpt-4", "second", "ctx") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_get_drops_expired_answers():
+    # Arrange
+    cache = ResponseCache(ttl=60)
+    with patch("app.API.Src.Tools.Technical_anwer.response_cache.time.monotonic", return_value=1000.0):
+        cache.set("gpt-4", "Question", "ctx", [], make_response("Answer"))
+
+    # Act
+    with patch("app.API.Src.Tools.Technical_anwer.response_cache.time.monotonic", return_value=1061.0):
+        result = cache.get("gpt-4", "Question", "ctx")
+
+    # Assert
+    assert result is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_documents_drops_answers_citing_them():
+    # Arrange
+    cache = ResponseCache()
+    changed = uuid.uuid4()
+    cache.set("gpt-4", "first", "ctx", [str(changed)], make_response("1"))
+    cache.set("gpt-4", "second", "ctx", [str(uuid.uuid4())], make_response("2"))
+
+    # Act
+    dropped = cache.invalidate_documents([changed])
+
+    # Assert
+    assert dropped == 1
+    assert cache.get("gpt-4", "first", "ctx") is None
+    assert cache.get("gpt-4", "second", "ctx") is not None
+
+
+@pytest.mark.asyncio
+async def test_generate_answer_reuses_cached_answer_for_same_context():
+    # Arrange
+    document_id = uuid.uuid4()
+
+    async def prepare_chat_prompts(user_prompt, chat_id, ai_model, rag_count, conversation_limit, filters):
+        rag_info = {"document_ids": [str(document_id)]}
+        return "System with documents", user_prompt, {"rag_info": rag_info, "timings_ms": {}}
+
+    provider = TechnicalAnswerProvider.__new__(TechnicalAnswerProvider)
+    provider.clients = SimpleNamespace()
+    provider.response_cache = ResponseCache()
+    provider.prepare_chat_prompts = prepare_chat_prompts
+    completion = AsyncMock(return_value=make_response("Generated"))
+
+    # Act
+    with patch("app.API.Src.Tools.Technical_anwer.technical_answer_provider.completion", completion):
+        first = await provider.generate_answer_with_chat_context("Question?", ai_model="gpt-4")
+        second = await provider.generate_answer_with_chat_context("question", ai_model="gpt-4")
+
+    # Assert
+    assert completion.await_count == 1
+    assert (first.answer, second.answer) == ("Generated", "Generated")
+    assert first.metadata["response_cache"] == "miss"
+    assert second.metadata["response_cache"] == "hit"
+    assert provider.response_cache.invalidate_documents([document_id]) == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_answer_caches_full_answer_and_replays_it():
+    # Arrange
+    async def prepare_chat_prompts(user_prompt, chat_id, ai_model, rag_count, conversation_limit, filters):
+        return "System", user_prompt, {"rag_info": {"document_ids": []}, "timings_ms": {}}
+
+    async def chunks():
+        for chunk in ["Hel", "lo"]:
+            yield chunk
+
+    provider = TechnicalAnswerProvider.__new__(TechnicalAnswerProvider)
+    provider.clients = SimpleNamespace()
+    provider.response_cache = ResponseCache()
+    provider.prepare_chat_prompts = prepare_chat_prompts
+    stream_completion = MagicMock(return_value=chunks())
+
+    # Act
+    with patch("app.API.Src.Tools.Technical_anwer.technical_answer_provider.stream_completion", stream_completion):
+        _, first = await provider.stream_answer_with_chat_context("Question", ai_model="gpt-4")
+        first_chunks = [chunk async for chunk in first]
+        metadata, second = await provider.stream_answer_with_chat_context("Question", ai_model="gpt-4")
+        second_chunks = [chunk async for chunk in second]
+
+    # Assert
+    assert first_chunks == ["Hel", "lo"]
+    assert second_chunks == ["Hello"]
+    assert metadata["response_cache"] == "hit"
+    assert stream_completion.call_count == 1
@@ -0,0 +1,88 @@
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import select, func
+from app.API.Src.Document.models.document import Document
+from app.API.Src.Document.repository.document_repository import DocumentRepository
+
+
+def make_documents(count: int):
+    return [
+        Document(content=f"Part {i} content", metadata={"tokens": 3, "headers": {"h1": "Title"}}, localisation=f"file_part_{i:03d}.md")
+        for i in range(count)
+    ]
+
+
+def make_qdrant_repo(upsert_ok: bool) -> MagicMock:
+    qdrant_repo = MagicMock()
+    qdrant_repo.upsert_documents = AsyncMock(return_value=upsert_ok)
+    qdrant_repo.delete_documents = AsyncMock(return_value=True)
+    return qdrant_repo
+
+
+async def count_documents(session_factory) -> int:
+    async with session_factory() as session:
+        return (await session.execute(select(func.count(Document.id)))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_save_documents_inserts_all_parts_in_one_transaction(session_factory):
+    # Arrange
+    qdrant_repo = make_qdrant_repo(upsert_ok=True)
+    documents = make_documents(5)
+    embeddings = [[float(i)] for i in range(5)]
+
+    # Act
+    async with session_factory() as session:
+        repository = DocumentRepository(session, embedding_generator=MagicMock(), qdrant_repo=qdrant_repo)
+        saved = await repository.save_documents(documents, embeddings)
+
+    # Assert
+    assert [document.localisation for document in saved] == [f"file_part_{i:03d}.md" for i in range(5)]
+    assert all(document.id is not None and document.created_at is not None for document in saved)
+    assert saved[0].headers == {"h1": "Title"}
+    assert await count_documents(session_factory) == 5
+    vector_docs, vectors = qdrant_repo.upsert_documents.call_args.args
+    assert [vector_doc.id for vector_doc in vector_docs] == [str(document.id) for document in saved]
+    assert vectors == embeddings
+    qdrant_repo.delete_documents.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_save_documents_compensates_when_vector_write_fails(session_factory):
+    # Arrange
+    qdrant_repo = make_qdrant_repo(upsert_ok=False)
+    documents = make_documents(3)
+
+    # Act
+    async with session_factory() as session:
+        repository = DocumentRepository(session, embedding_generator=MagicMock(), qdrant_repo=qdrant_repo)
+        with pytest.raises(RuntimeError):
+            await repository.save_documents(documents, [[0.0]] * 3)
+
+    # Assert
+    assert await count_documents(session_factory) == 0
+    deleted_ids = qdrant_repo.delete_documents.call_args.args[0]
+    assert len(deleted_ids) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_scored_documents_keeps_score_order_and_skips_missing_ids(session_factory):
+    # Arrange
+    documents = make_documents(3)
+    for document in documents:
+        document.id = uuid.uuid4()
+    async with session_factory() as session:
+        session.add_all(documents)
+        await session.commit()
+    # Score order of the vector search, with a point whose row was deleted
+    scores = {documents[2].id: 0.9, uuid.uuid4(): 0.8, documents[0].id: 0.7}
+
+    # Act
+    async with session_factory() as session:
+        repository = DocumentRepository(session, embedding_generator=MagicMock(), qdrant_repo=make_qdrant_repo(upsert_ok=True))
+        scored = await repository.get_scored_documents(scores)
+
+    # Assert
+    assert [document.id for document in scored] == [documents[2].id, documents[0].id]
+    assert [document.score for document in scored] == [0.9, 0.7]
@@ -0,0 +1,100 @@
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.API.Src.core.database.Numpy.repository import NumpyRepository
+from app.API.Src.core.database.Qdrant.models import VectorSearchQuery
+from app.API.Src.core.database.Qdrant.repository import QdrantRepository
+from app.API.Src.Document.models.document import Base, Document
+from app.API.Src.Document.repository.document_repository import DocumentRepository
+from app.API.Src.RAG.model.search_filters import SearchFilters
+
+OWNER = uuid.uuid4()
+
+
+def make_documents():
+    return [
+        Document(id=uuid.uuid4(), localisation="a_part_001.md", source="install.md", user_id=OWNER,
+                 content="Install with pip", tokens=40, headers={"h1": ["Install"], "h2": ["Linux"]}),
+        Document(id=uuid.uuid4(), localisation="a_part_002.md", source="install.md", user_id=OWNER,
+                 content="Install on Windows", tokens=400, headers={"h1": ["Install"], "h2": ["Windows"]}),
+        Document(id=uuid.uuid4(), localisation="b_part_001.md", source="faq.md", user_id=None,
+                 content="Frequent questions", tokens=60, headers={"h1": ["FAQ"]}),
+    ]
+
+
+def test_empty_filters_do_not_restrict_the_search():
+    # Act / Assert
+    assert SearchFilters().is_empty()
+    assert SearchFilters().to_vector_filter() is None
+    assert not SearchFilters(max_tokens=100).is_empty()
+
+
+@pytest.mark.asyncio
+async def test_vector_search_is_scoped_by_payload_of_saved_documents():
+    # Arrange
+    documents = make_documents()
+    store = NumpyRepository()
+    store.vector_size = 2
+    await store.create_collection()
+    await store.upsert_documents(
+        [DocumentRepository._to_vector_document(document) for document in documents],
+        [[1.0, 0.0], [0.9, 0.1], [1.0, 0.05]]
+    )
+    filters = SearchFilters(sources=["install.md"], user_id=OWNER, headers=["Linux", "FAQ"], max_tokens=100)
+
+    # Act
+    results = await store.search_similar(
+        VectorSearchQuery(query_vector=[1.0, 0.0], limit=3, filter_conditions=filters.to_vector_filter())
+    )
+
+    # Assert
+    assert [result.id for result in results] == [str(documents[0].id)]
+    assert results[0].metadata["headers"] == ["Install", "Linux"]
+
+
+@pytest.mark.asyncio
+async def test_sql_filter_clauses_match_the_same_documents():
+    # Arrange
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    documents = make_documents()
+    async with async_sessionmaker(engine)() as session:
+        session.add_all(documents)
+        await session.commit()
+
+        # Act
+        by_header = await session.scalars(
+            select(Document.localisation).where(*DocumentRepository._filter_clauses(SearchFilters(headers=["Windows", "FAQ"])))
+        )
+        by_owner = await session.scalars(
+            select(Document.localisation).where(*DocumentRepository._filter_clauses(SearchFilters(user_id=OWNER, min_tokens=100)))
+        )
+
+        # Assert
+        assert sorted(by_header) == ["a_part_002.md", "b_part_001.md"]
+        assert list(by_owner) == ["a_part_002.md"]
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_create_collection_adds_missing_payload_indexes_to_existing_collection():
+    # Arrange
+    client = MagicMock()
+    client.collection_exists = AsyncMock(return_value=True)
+    client.get_collection = AsyncMock(return_value=MagicMock(payload_schema={"source": MagicMock()}))
+    client.create_payload_index = AsyncMock()
+
+    async def run(operation):
+        return await operation(client)
+
+    # Act
+    with patch("app.API.Src.core.database.Qdrant.repository.qdrant_db.run", side_effect=run):
+        created = await QdrantRepository().create_collection()
+
+    # Assert
+    assert created is True
+    indexed = [call.kwargs["field_name"] for call in client.create_payload_index.await_args_list]
+    assert indexed == ["user_id", "headers", "tokens"]
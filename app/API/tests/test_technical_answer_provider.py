@@ -0,0 +1,44 @@
+import asyncio
+import time
+import uuid
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.API.Src.RAG.model.rag_response import RAGResponse
+from app.API.Src.Tools.Technical_anwer.technical_answer_provider import TechnicalAnswerProvider
+
+
+@pytest.mark.asyncio
+async def test_prepare_chat_prompts_overlaps_vector_search_and_history(byte_tokenizer):
+    # Arrange
+    async def search_scores(user_prompt, count, filters=None):
+        await asyncio.sleep(0.2)
+        return {uuid.uuid4(): 0.9}
+
+    async def get_recent_messages(chat_id, limit):
+        await asyncio.sleep(0.2)
+        return [SimpleNamespace(author="user", message="Earlier question")]
+
+    async def rank_scores(user_prompt, scores, count, filters=None):
+        return scores
+
+    async def format_scored_context(user_prompt, scores, count, timings):
+        return RAGResponse.create_success_response(query=user_prompt, documents=[], context="Doc context")
+
+    provider = TechnicalAnswerProvider.__new__(TechnicalAnswerProvider)
+    provider.rag_service = MagicMock(
+        search_scores=search_scores, rank_scores=rank_scores, format_scored_context=format_scored_context
+    )
+    provider.message_repository = MagicMock(get_recent_messages=get_recent_messages)
+
+    # Act
+    start = time.perf_counter()
+    with patch("app.API.Src.RAG.context_builder.get_tokenizer", return_value=byte_tokenizer):
+        system_prompt, prompt, metadata = await provider.prepare_chat_prompts("Question?", uuid.uuid4(), "gpt-4")
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert elapsed < 0.35
+    assert set(metadata["timings_ms"]) == {"retrieval", "history", "ranking", "hydration"}
+    assert "Earlier question" in system_prompt + prompt
+    assert metadata["context_tokens"]["messages_used"] == 1
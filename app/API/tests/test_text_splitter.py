@@ -0,0 +1,111 @@
+import pytest
+from app.API.Src.Document.documentSplitter.token_based_text_splitter import TextSplitter, TokenOffsets
+
+
+def sample_text() -> str:
+    sections = []
+    for i in range(40):
+        sections.append(f"## Section {i}\n")
+        sections.append(f"Paragraph {i} describes chunking strategies for RAG systems.\n\n")
+    return "".join(sections)
+
+
+@pytest.mark.asyncio
+async def test_split_respects_limit_and_preserves_text(byte_tokenizer):
+    # Arrange
+    splitter = TextSplitter()
+    splitter.tokenizer = byte_tokenizer
+    text = sample_text()
+    limit = 400
+    
+    # Act
+    documents = await splitter.split(text, limit=limit)
+    
+    # Assert
+    assert len(documents) > 1
+    assert "".join(doc.content for doc in documents) == text
+    assert all(doc.tokens <= limit for doc in documents)
+    assert all(doc.content.endswith("\n") for doc in documents)
+
+
+def test_token_offsets_count_matches_encoding(byte_tokenizer):
+    # Arrange
+    tokenizer = byte_tokenizer
+    text = "Zażółć gęślą jaźń\nzwykły tekst\n"
+    
+    # Act
+    offsets = TokenOffsets.from_text(tokenizer, text)
+    
+    # Assert
+    assert len(offsets) == len(tokenizer.encode(text))
+    assert offsets.count(0, len(text)) == len(tokenizer.encode(text))
+    newline = text.index("\n") + 1
+    assert offsets.count(newline, len(text)) == len(tokenizer.encode(text[newline:]))
+
+
+@pytest.mark.asyncio
+async def test_split_stream_yields_documents_within_limit_as_blocks_arrive(byte_tokenizer):
+    # Arrange
+    splitter = TextSplitter()
+    splitter.tokenizer = byte_tokenizer
+    text = sample_text()
+    limit = 400
+    blocks_read = []
+
+    async def blocks():
+        for start in range(0, len(text), 97):
+            blocks_read.append(start)
+            yield text[start:start + 97]
+
+    # Act
+    documents = []
+    reads_before_document = []
+    async for document in splitter.split_stream(blocks(), limit=limit):
+        documents.append(document)
+        reads_before_document.append(len(blocks_read))
+
+    # Assert
+    assert len(documents) > 1
+    assert "".join(doc.content for doc in documents) == text
+    assert all(doc.tokens <= limit for doc in documents)
+    # The first document is final long before the end of the text
+    assert reads_before_document[0] < len(blocks_read) / 2
+    assert documents[-1].headers["h2"][-1] == "Section 39"
+
+
+@pytest.mark.asyncio
+async def test_split_stream_cuts_the_same_documents_as_split(byte_tokenizer):
+    # Arrange
+    splitter = TextSplitter()
+    splitter.tokenizer = byte_tokenizer
+    text = sample_text()
+    limit = 400
+
+    async def blocks():
+        for start in range(0, len(text), 211):
+            yield text[start:start + 211]
+
+    # Act
+    whole = await splitter.split(text, limit=limit)
+    streamed = [document async for document in splitter.split_stream(blocks(), limit=limit)]
+
+    # Assert
+    assert [(doc.content, doc.headers) for doc in streamed] == [(doc.content, doc.headers) for doc in whole]
+
+
+@pytest.mark.asyncio
+async def test_split_cuts_pinned_documents_of_uneven_token_density(byte_tokenizer):
+    # Arrange
+    splitter = TextSplitter()
+    splitter.tokenizer = byte_tokenizer
+    ascii_lines = [f"Line {i} of plain ASCII text about chunk boundaries.\n" for i in range(30)]
+    cjk_lines = [f"第{i}行：文本分块的边界与令牌密度。\n" for i in range(30)]
+    text = "".join(ascii_lines + cjk_lines)
+    
+    # Act
+    documents = await splitter.split(text, limit=400)
+    
+    # Assert
+    # Pinned: any change to where documents are cut re-embeds every re-uploaded file
+    assert [len(doc.content) for doc in documents] == [306, 308, 312, 312, 227, 157, 108, 114, 114, 114, 38]
+    assert "".join(doc.content for doc in documents) == text
@@ -29,6 +29,49 @@ export const chatApi = {
     return response.data;
   },
 
+  // POST /chat/stream - Same as /chat, calling onToken with each text chunk as it is generated
+  streamChat: async (chatRequest: ChatRequest, onToken: (text: string) => void): Promise<AiResponse> => {
+    const response = await fetch(`${API_BASE_URL}/chat/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(chatRequest),
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Chat stream failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let answer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) {
+        throw new Error('Chat stream ended before completion');
+      }
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const [eventLine, dataLine] = buffer.slice(0, boundary).split('\n');
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+
+        const event = eventLine.replace('event: ', '');
+        const data = JSON.parse(dataLine.replace('data: ', ''));
+        if (event === 'token') {
+          answer += data.text;
+          onToken(data.text);
+        } else if (event === 'done') {
+          return { finishReason: data.finishReason, answer, metadata: data.metadata };
+        } else if (event === 'error') {
+          throw new Error(data.detail);
+        }
+      }
+    }
+  },
+
   // GET /chats - Get list of chats
   getChats: async (limit: number = 100, offset: number = 0, userId?: string): Promise<ChatListResponse> => {
     const params = new URLSearchParams();
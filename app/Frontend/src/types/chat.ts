@@ -26,7 +26,8 @@ export interface ChatResponse {
 
 export interface ChatListResponse {
   chats: ChatResponse[];
-  total: number;
+  total: number | null;
+  next_cursor?: string | null;
   limit: number;
   offset?: number;
 }
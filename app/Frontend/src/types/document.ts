@@ -9,19 +9,22 @@ export interface DocumentResponse {
   document_metadata?: Record<string, any>;
   created_at: string;
   updated_at?: string;
+  score?: number | null;
 }
 
 export interface DocumentListResponse {
   documents: DocumentResponse[];
-  total: number;
+  total: number | null;
+  next_cursor?: string | null;
   limit: number;
 }
 
 export interface DocumentUploadResponse {
-  id: string;
+  id: string; // Ingestion job ID
   localisation: string;
   message: string;
   created_at: string;
+  status: string;
 }
 
 export interface SearchResult {
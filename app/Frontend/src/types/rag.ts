@@ -8,6 +8,7 @@ export interface RAGSearchResponse {
   context_length: number;
   has_context: boolean;
   document_sources: string[];
+  document_scores: (number | null)[];
   error: string | null;
 }
 
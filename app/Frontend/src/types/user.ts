@@ -11,7 +11,8 @@ export interface UserResponse {
 
 export interface UserListResponse {
   users: UserResponse[];
-  total: number;
+  total: number | null;
+  next_cursor?: string | null;
   limit: number;
 }
 